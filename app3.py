@@ -8,13 +8,43 @@
 #   pip install streamlit pulp pandas numpy
 #   streamlit run app3.py
 
+import os
+import time
+from collections import deque
+
+t_script = time.perf_counter()  # rerun latency is measured from here (cold start: includes the imports)
+
 import streamlit as st
 import pandas as pd
-from pulp import LpProblem, LpVariable, LpMinimize, lpSum, LpStatus, value
+
+from backends import AUTO, SolveOptions, available_backends, large_backend, solve_problem as solve_backend
+from app_text import T
+from catalog import ISSUE_DUP, ISSUE_INF, ISSUE_LBUB, ISSUE_MISSING_COL, ISSUE_NAN, catalog_fingerprint, coerce_numeric, find_issues, load_catalog
+from dense_solver import DENSE_MAX_N, STATUS_NOT_SOLVED
+from frontier import cost_ucs_frontier
+from history import DEFAULT_PATH as HISTORY_PATH, KIND_LP, KIND_MIP, KIND_ROBUST, PAGE_SIZE as HISTORY_PAGE, RunHistory, material_set_key
+from infeasibility import diagnose
+from incremental import IncrementalModel
+from mix_eval import evaluate_mixes, mix_matrix, mix_violations
+from metrics import prometheus_text, record_since, setup_logging, span, start_run, write_prometheus
+from lp_core import (
+    DEFAULT_TABLE,
+    MODE_CAP,
+    MODE_COST,
+    REQUIRED_COLS,
+    problem_from_df,
+)
+from mip import dosing_from_df, solve_mip
+from portfolio import METHOD_DECOMPOSED, METHOD_JOINT, STOCK_COL, projects_from_df, solve_portfolio, stock_from_df
+from result_cache import ResultCache
+from robust import DIST_NORMAL, DIST_UNIFORM, METHOD_BOX, METHOD_CHANCE, coef_sd, simulate, solve_robust
 
 # =========================
 # PAGE
 # =========================
+setup_logging()  # SOIL_LP_LOG_LEVEL=INFO streams every span as a JSON line to stderr
+run_metrics = start_run()  # per-rerun timing spans (see the debug panel at the bottom)
+record_since("imports", t_script)
 st.set_page_config(page_title="LP Optimizer – Soil Mix Design", layout="wide")
 st.title("LP Optimizer – Soil Mix Design (Soil + Additives)")
 
@@ -39,190 +69,16 @@ st.sidebar.markdown(
 # =========================
 # LANGUAGE
 # =========================
-LANG = st.sidebar.selectbox("Language / Bahasa / 語言", ["Bahasa Indonesia", "English", "繁體中文"], index=0)
-
-T = {
-    "Bahasa Indonesia": {
-        "caption": "Linear Programming (PuLP) + AI Suggestions (rule-based, offline).",
-        "mode_header": "Mode Optimasi",
-        "mode_pick": "Pilih mode",
-        "mode_cost": "Minimasi Biaya (UCS minimum)",
-        "mode_ucscap": "UCS Maksimum (Cap) + Minimasi Biaya",
-        "fixed_header": "Komposisi",
-        "soil_fixed": "Tanah (%) (fixed)",
-        "add_cap": "Batas Maks Aditif (%)",
-        "tech_header": "Batasan Teknis",
-        "target_ucs": "Target UCS (minimum) (mode biaya)",
-        "ucs_max": "Batas UCS (maksimum) (mode cap)",
-        "pi_max": "Batas PI (maksimum)",
-        "w_max": "Batas Water Content (maksimum)",
-        "base_header": "Nilai Dasar Tanah (Base)",
-        "base_ucs": "Base UCS",
-        "base_pi": "Base PI",
-        "base_w": "Base Water Content",
-        "data_title": "Tabel Data Aditif (Editable)",
-        "data_note": "Isi semua kolom numerik dengan angka murni (tanpa satuan di sel).",
-        "run_title": "Jalankan Optimasi",
-        "btn": "Optimize",
-        "ai_ok": "🤖 AI Suggestions (Auto-Interpretation)",
-        "ai_bad": "🤖 AI Suggestions (Why infeasible?)",
-        "ai_info": "Saran dihasilkan dari aturan (rule-based) berdasarkan margin constraint.",
-        "summary": "Ringkasan hasil",
-        "total_cost": "Total Cost (Aditif)",
-        "opt_comp": "Komposisi optimal aditif (%)",
-        "add_used": "Total aditif terpakai",
-        "soil_total": "Total tanah (approx.)",
-        "math_title": "Model Matematis (untuk slide)",
-        "footer": "Haidar Fadhila Rahma- M11316025- Management Sciece | National Yunlin University of Science and Technology",
-        "err_cols": "Kolom wajib hilang. Wajib ada: {cols}",
-        "err_nan": "Ada nilai non-angka (NaN) pada kolom numerik. Perbaiki tabel.",
-        "err_lbub": "Ada baris dengan LB > UB. Perbaiki bounds.",
-        "err_dup": "Nama material duplikat. Pastikan unik.",
-        "ai_margin_min": "**Margin:** UCS = **{u:.2f}** (hasil-target), PI = **{p:.2f}** (max-hasil), W = **{w:.2f}** (max-hasil).",
-        "ai_margin_cap": "**Margin:** UCS = **{u:.2f}** (UCSmax-hasil), PI = **{p:.2f}** (max-hasil), W = **{w:.2f}** (max-hasil).",
-        "ai_tightest": "✅ Constraint paling ketat: {c}",
-        "ai_tight_ucs": "UCS",
-        "ai_tight_pi": "PI",
-        "ai_tight_w": "Water Content",
-        "ai_dom": "📌 Aditif dominan: {a1}={v1:.2f}%, {a2}={v2:.2f}%.",
-        "ai_note_cap": "Catatan: Karena aditif dibatasi (≤ cap), solusi optimal bisa memakai aditif < cap untuk menekan biaya.",
-        "ai_suggest_ucs_min": "Saran: Jika infeasible, turunkan target UCS atau naikkan UB aditif yang kontribusi UCS tinggi.",
-        "ai_suggest_ucs_cap": "Saran: Jika melanggar cap UCS, turunkan koefisien UCS (atau kurangi aditif yang menaikkan UCS) / naikkan UCSmax.",
-        "ai_suggest_pi": "Saran: Perketat/longgarkan PI dengan mengatur aditif yang menurunkan PI (koefisien PI lebih negatif).",
-        "ai_suggest_w": "Saran: Perketat/longgarkan W dengan mengatur aditif yang menurunkan W (koefisien W lebih negatif).",
-        "ai_infeas_bounds": "❌ Infeasible karena bounds: ΣLB sudah terlalu besar atau constraint terlalu ketat.",
-        "ai_infeas_tech": "⚠️ Infeasible kemungkinan karena batasan teknis terlalu ketat (UCS/PI/W).",
-    },
-    "English": {
-        "caption": "Linear Programming (PuLP) + AI Suggestions (rule-based, offline).",
-        "mode_header": "Optimization Mode",
-        "mode_pick": "Choose mode",
-        "mode_cost": "Minimize Cost (UCS minimum)",
-        "mode_ucscap": "UCS Maximum (Cap) + Minimize Cost",
-        "fixed_header": "Composition",
-        "soil_fixed": "Soil (%) (fixed)",
-        "add_cap": "Max Additives (%)",
-        "tech_header": "Technical Constraints",
-        "target_ucs": "Target UCS (minimum) (cost mode)",
-        "ucs_max": "UCS limit (maximum) (cap mode)",
-        "pi_max": "PI limit (maximum)",
-        "w_max": "Water content limit (maximum)",
-        "base_header": "Soil Base Properties",
-        "base_ucs": "Base UCS",
-        "base_pi": "Base PI",
-        "base_w": "Base Water Content",
-        "data_title": "Additives Data Table (Editable)",
-        "data_note": "All numeric cells must be pure numbers (no units inside cells).",
-        "run_title": "Run Optimization",
-        "btn": "Optimize",
-        "ai_ok": "🤖 AI Suggestions (Auto-Interpretation)",
-        "ai_bad": "🤖 AI Suggestions (Why infeasible?)",
-        "ai_info": "Suggestions are generated by rule-based logic using constraint margins.",
-        "summary": "Results summary",
-        "total_cost": "Total Cost (Additives)",
-        "opt_comp": "Optimal additives composition (%)",
-        "add_used": "Total additives used",
-        "soil_total": "Total soil (approx.)",
-        "math_title": "Mathematical Model (for slides)",
-        "footer": "Haidar Fadhila Rahman- M11316025- Management Sciece | National Yunlin University of Science and Technology",
-        "err_cols": "Required columns missing. Must include: {cols}",
-        "err_nan": "There are non-numeric (NaN) values in numeric columns. Fix the table.",
-        "err_lbub": "Some rows have LB > UB. Fix bounds.",
-        "err_dup": "Duplicate material names. Make them unique.",
-        "ai_margin_min": "**Margins:** UCS = **{u:.2f}** (result-target), PI = **{p:.2f}** (max-result), W = **{w:.2f}** (max-result).",
-        "ai_margin_cap": "**Margins:** UCS = **{u:.2f}** (UCSmax-result), PI = **{p:.2f}** (max-result), W = **{w:.2f}** (max-result).",
-        "ai_tightest": "✅ Tightest constraint: {c}",
-        "ai_tight_ucs": "UCS",
-        "ai_tight_pi": "PI",
-        "ai_tight_w": "Water Content",
-        "ai_dom": "📌 Dominant additives: {a1}={v1:.2f}%, {a2}={v2:.2f}%.",
-        "ai_note_cap": "Note: since additives are constrained (≤ cap), the optimal solution may use < cap to reduce cost.",
-        "ai_suggest_ucs_min": "Suggestion: If infeasible, reduce UCS target or increase UB for high-UCS additives.",
-        "ai_suggest_ucs_cap": "Suggestion: If UCS cap is violated, reduce strength-raising additives or increase UCSmax.",
-        "ai_suggest_pi": "Suggestion: Adjust PI by increasing additives that reduce PI (more negative PI coefficients) or relax PI limit.",
-        "ai_suggest_w": "Suggestion: Adjust W by increasing additives that reduce W (more negative W coefficients) or relax W limit.",
-        "ai_infeas_bounds": "❌ Infeasible due to bounds: ΣLB too high or constraints too tight.",
-        "ai_infeas_tech": "⚠️ Infeasible likely due to tight technical constraints (UCS/PI/W).",
-    },
-    "繁體中文": {
-        "caption": "線性規劃（PuLP）＋ AI 建議（規則式、離線）",
-        "mode_header": "最佳化模式",
-        "mode_pick": "選擇模式",
-        "mode_cost": "最小化成本（UCS 下限）",
-        "mode_ucscap": "UCS 上限（Cap）＋最小化成本",
-        "fixed_header": "配比",
-        "soil_fixed": "土壤 (%)（固定）",
-        "add_cap": "添加劑上限 (%)",
-        "tech_header": "技術限制",
-        "target_ucs": "UCS 目標（下限）（成本模式）",
-        "ucs_max": "UCS 上限（cap 模式）",
-        "pi_max": "PI 上限",
-        "w_max": "含水量上限",
-        "base_header": "土壤基準值",
-        "base_ucs": "Base UCS",
-        "base_pi": "Base PI",
-        "base_w": "Base 含水量",
-        "data_title": "添加劑資料表（可編輯）",
-        "data_note": "數值欄位請填純數字（不要在儲存格內寫單位）。",
-        "run_title": "執行最佳化",
-        "btn": "Optimize",
-        "ai_ok": "🤖 AI 建議（自動解讀）",
-        "ai_bad": "🤖 AI 建議（為何不可行？）",
-        "ai_info": "建議由規則式邏輯根據約束裕度自動產生。",
-        "summary": "結果摘要",
-        "total_cost": "總成本（添加劑）",
-        "opt_comp": "最佳添加劑配比 (%)",
-        "add_used": "實際使用添加劑總量",
-        "soil_total": "土壤總量（約）",
-        "math_title": "數學模型（投影片用）",
-        "footer": "Haidar Fadhila Rahman- M11316025- Management Sciece | National Yunlin University of Science and Technology",
-        "err_cols": "缺少必要欄位：{cols}",
-        "err_nan": "數值欄位出現 NaN（非數字），請修正。",
-        "err_lbub": "有些列 LB > UB，請修正。",
-        "err_dup": "材料名稱重複，請確保唯一。",
-        "ai_margin_min": "**裕度：** UCS = **{u:.2f}**（結果-目標），PI = **{p:.2f}**（上限-結果），含水量 = **{w:.2f}**（上限-結果）。",
-        "ai_margin_cap": "**裕度：** UCS = **{u:.2f}**（UCSmax-結果），PI = **{p:.2f}**（上限-結果），含水量 = **{w:.2f}**（上限-結果）。",
-        "ai_tightest": "✅ 最緊約束：{c}",
-        "ai_tight_ucs": "UCS",
-        "ai_tight_pi": "PI",
-        "ai_tight_w": "含水量",
-        "ai_dom": "📌 主要添加劑：{a1}={v1:.2f}%，{a2}={v2:.2f}%。",
-        "ai_note_cap": "注意：因添加劑限制為「≤ 上限」，最佳解可能使用少於上限以降低成本。",
-        "ai_suggest_ucs_min": "建議：若不可行，降低 UCS 目標或提高高 UCS 添加劑的 UB。",
-        "ai_suggest_ucs_cap": "建議：若超過 UCS 上限，減少提高強度的添加劑或提高 UCSmax。",
-        "ai_suggest_pi": "建議：透過增加能降低 PI（PI 係數更負）的添加劑或放寬 PI 上限來調整。",
-        "ai_suggest_w": "建議：透過增加能降低含水量（W 係數更負）的添加劑或放寬含水量上限來調整。",
-        "ai_infeas_bounds": "❌ 因 bounds 不可行：ΣLB 太高或限制過嚴。",
-        "ai_infeas_tech": "⚠️ 可能因技術限制過嚴（UCS/PI/W）而不可行。",
-    },
-}
-
+LANG = st.sidebar.selectbox("Language / Bahasa / 語言", list(T), index=0)
 tr = T[LANG]
 st.caption(tr["caption"])
 
-# =========================
-# DEFAULT DATA
-# =========================
-default_df = pd.DataFrame(
-    {
-        "material": ["x1", "x2", "x3", "x4", "x5", "x6"],
-        "cost": [1500, 400, 600, 200, 700, 600],
-        "LB": [1, 6, 1, 3, 1, 2],
-        "UB": [10, 8, 10, 15, 10, 8],
-        "UCS_coef": [25, 5, 15, 2, 10, 8],
-        "PI_coef": [-0.5, -0.2, -0.1, -0.3, -0.2, -0.25],
-        "W_coef": [-0.2, -0.1, -0.1, -0.5, -0.1, -0.15],
-    }
-)
-
-NUMERIC_COLS = ["cost", "LB", "UB", "UCS_coef", "PI_coef", "W_coef"]
-REQUIRED_COLS = ["material"] + NUMERIC_COLS
-
 # =========================
 # SIDEBAR INPUTS
 # =========================
 st.sidebar.header(tr["mode_header"])
 mode = st.sidebar.radio(tr["mode_pick"], [tr["mode_cost"], tr["mode_ucscap"]])
+mode_key = MODE_COST if mode == tr["mode_cost"] else MODE_CAP
 
 st.sidebar.header(tr["fixed_header"])
 soil_fixed = st.sidebar.number_input(tr["soil_fixed"], value=75.0, step=1.0)
@@ -245,28 +101,67 @@ base_ucs = st.sidebar.number_input(tr["base_ucs"], value=50.0, step=1.0)
 base_pi = st.sidebar.number_input(tr["base_pi"], value=10.0, step=0.1)
 base_w = st.sidebar.number_input(tr["base_w"], value=30.0, step=0.1)
 
+# Robust and MIP models do not combine (the MIP has no uncertain rows), so the model is one choice.
+st.sidebar.header(tr["model_header"])
+model_kind = st.sidebar.radio(tr["model_kind"], [KIND_LP, KIND_ROBUST, KIND_MIP], format_func=lambda k: tr[f"kind_{k}"])
+robust = model_kind == KIND_ROBUST
+mip = model_kind == KIND_MIP
+
+if robust:
+    st.sidebar.header(tr["robust_header"])
+    robust_method = st.sidebar.radio(tr["robust_method"], [tr["robust_chance"], tr["robust_box"]])
+    robust_method = METHOD_CHANCE if robust_method == tr["robust_chance"] else METHOD_BOX
+    robust_target = st.sidebar.slider(tr["robust_target"], 0.50, 0.999, 0.95, 0.005)
+    robust_rel = st.sidebar.number_input(tr["robust_rel"], value=10.0, min_value=0.0, step=1.0)
+    robust_dist = st.sidebar.selectbox(tr["robust_dist"], [DIST_NORMAL, DIST_UNIFORM])
+
+MIP_MAX_SECONDS = 120  # upper end of the MIP time-limit slider, so a solve never holds the page for long
+if mip:
+    st.sidebar.header(tr["mip_header"])
+    mip_step = st.sidebar.number_input(tr["mip_step"], value=0.5, min_value=0.0, step=0.1)
+    mip_min = st.sidebar.number_input(tr["mip_min"], value=0.0, min_value=0.0, step=0.5)
+    mip_time = st.sidebar.slider(tr["mip_time"], 1, MIP_MAX_SECONDS, 10)
+    mip_gap = st.sidebar.number_input(tr["mip_gap"], value=1.0, min_value=0.0, step=0.1)
+    mip_threads = int(st.sidebar.number_input(tr["mip_threads"], value=1, min_value=1, max_value=os.cpu_count() or 1, step=1))
+
+SOLVER_TOLS = [None, 1e-6, 1e-7, 1e-8, 1e-9]
+st.sidebar.header(tr["solver_header"])
+solver_backend = st.sidebar.selectbox(
+    tr["solver_backend"], [AUTO] + available_backends(), format_func=lambda b: tr["solver_auto"] if b == AUTO else b
+)
+solver_time = st.sidebar.number_input(tr["solver_time"], value=0.0, min_value=0.0, step=5.0)
+solver_threads = int(st.sidebar.number_input(tr["solver_threads"], value=1, min_value=1, max_value=os.cpu_count() or 1, step=1, key="solver_threads"))
+solver_tol = st.sidebar.selectbox(tr["solver_tol"], SOLVER_TOLS, format_func=lambda v: tr["solver_default"] if v is None else f"{v:g}")
+solver_opts = SolveOptions(time_limit=solver_time or None, threads=solver_threads, tol=solver_tol)
+# Thread count never changes the answer; backend, time limit and tolerance can, so they key the cache.
+solver_tag = "" if solver_backend == AUTO and not (solver_time or solver_tol) else repr((solver_backend, solver_time, solver_tol))
+debug = st.sidebar.checkbox(tr["debug"])
+
 # =========================
 # HELPERS
 # =========================
-def coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["material"] = out["material"].astype(str)
-    for c in NUMERIC_COLS:
-        out[c] = pd.to_numeric(out[c], errors="coerce")
-    return out
-
-
-def validate_df(df: pd.DataFrame):
-    for c in REQUIRED_COLS:
-        if c not in df.columns:
-            return False, tr["err_cols"].format(cols=", ".join(REQUIRED_COLS))
-    if df[NUMERIC_COLS].isna().any().any():
-        return False, tr["err_nan"]
-    if (df["LB"] > df["UB"]).any():
-        return False, tr["err_lbub"]
-    if df["material"].duplicated().any():
-        return False, tr["err_dup"]
-    return True, ""
+def check_catalog(table: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # (coerced table, find_issues rows), memoized per session on the table's content: reruns
+    # caused by sidebar widgets skip coercion and validation of an unchanged table.
+    key = catalog_fingerprint(table)
+    memo = st.session_state.get("catalog_check")
+    if memo is None or memo[0] != key:
+        with span("coerce_numeric", materials=len(table)):
+            df = coerce_numeric(table)
+        with span("validate_df", materials=len(df)):
+            memo = (key, df, find_issues(df))
+        st.session_state["catalog_check"] = memo
+    return memo[1], memo[2]
+
+
+def validate_df(issues: pd.DataFrame):
+    # Returns (ok, message for the first kind of problem).
+    if issues.empty:
+        return True, ""
+    kinds = set(issues["issue"])
+    for kind, key in [(ISSUE_MISSING_COL, "err_cols"), (ISSUE_NAN, "err_nan"), (ISSUE_INF, "err_inf"), (ISSUE_LBUB, "err_lbub"), (ISSUE_DUP, "err_dup")]:
+        if kind in kinds:
+            return False, tr[key].format(cols=", ".join(REQUIRED_COLS))
 
 
 def render_solver_status_badge(status: str):
@@ -336,11 +231,22 @@ def ai_suggestions_feasible(res: dict, sol: dict) -> list[str]:
     margins = {"UCS": u_margin, "PI": p_margin, "W": w_margin}
     tightest = min(margins, key=margins.get)
 
-    tips.append(tr["ai_tightest"].format(c={
+    # With a sensitivity report, rank by marginal cost (|dual|) instead of raw margin.
+    sens = res.get("sensitivity")
+    if sens:
+        duals = {r["row"]: abs(r["dual"]) for r in sens["rows"] if r["row"] in margins}
+        if max(duals.values()) > 1e-9:
+            tightest = max(duals, key=duals.get)
+
+    names = {
         "UCS": tr["ai_tight_ucs"],
         "PI": tr["ai_tight_pi"],
         "W": tr["ai_tight_w"]
-    }[tightest]))
+    }
+    tips.append(tr["ai_tightest"].format(c=names[tightest]))
+
+    if sens and duals[tightest] > 1e-9:
+        tips.append(tr["ai_dual"].format(c=names[tightest], v=duals[tightest]))
 
     if tightest == "UCS":
         tips.append(tr["ai_suggest_ucs_min"] if mode == tr["mode_cost"] else tr["ai_suggest_ucs_cap"])
@@ -357,101 +263,318 @@ def ai_suggestions_feasible(res: dict, sol: dict) -> list[str]:
     return tips
 
 
-def ai_suggestions_infeasible() -> list[str]:
-    return [tr["ai_infeas_bounds"], tr["ai_infeas_tech"]]
+def ai_suggestions_infeasible(diag: dict | None = None) -> list[str]:
+    # With a diagnosis (IIS + elastic relaxation) the tips name the exact limits and how far to move them.
+    if not diag or not diag["iis"]:
+        return [tr["ai_infeas_bounds"], tr["ai_infeas_tech"]]
+    tips = [tr["ai_iis"].format(items=", ".join(diag["iis"]))]
+    for mv in diag["relaxation"]:
+        tips.append(tr["ai_relax"].format(c=mv["constraint"], a=mv["limit"], b=mv["relaxed"], d=mv["change"]))
+    return tips
 
 # =========================
 # DATA EDITOR
 # =========================
 st.subheader(tr["data_title"])
 st.write(tr["data_note"])
-edited = st.data_editor(default_df, use_container_width=True, hide_index=True, num_rows="fixed")
-df = coerce_numeric(edited)
 
-ok, msg = validate_df(df)
+PAGE_SIZE = 200
+MC_DRAWS = 100_000  # Monte Carlo draws per validated mix (robust mode)
+MANUAL_SLIDER_MAX = 12  # manual mix panel: one slider per material up to this size, a table above
+
+uploaded = st.file_uploader(tr["upload"], type=["csv", "parquet"])
+if uploaded is not None and st.session_state.get("catalog_name") != uploaded.name:
+    st.session_state["catalog"] = load_catalog(uploaded)
+    st.session_state["catalog_name"] = uploaded.name
+if "catalog" not in st.session_state:
+    st.session_state["catalog"] = pd.DataFrame(DEFAULT_TABLE)
+    st.session_state["catalog_name"] = "default"
+catalog = st.session_state["catalog"]
+
+# Large catalogs: edit one filtered page at a time instead of rendering every row.
+editor_key = f"editor_{st.session_state['catalog_name']}"
+view = catalog
+if len(catalog) > PAGE_SIZE:
+    query = st.text_input(tr["filter"])
+    if query and "material" in catalog.columns:
+        view = catalog[catalog["material"].astype(str).str.contains(query, case=False, regex=False)]
+    pages = max(1, -(-len(view) // PAGE_SIZE))
+    page = int(st.number_input(tr["page"], min_value=1, max_value=pages, value=1, step=1))
+    start = (page - 1) * PAGE_SIZE
+    st.caption(tr["rows_info"].format(n=len(catalog), m=len(view), a=min(start + 1, len(view)), b=min(start + PAGE_SIZE, len(view))))
+    view = view.iloc[start:start + PAGE_SIZE]
+    editor_key = f"{editor_key}_{query}_{page}"
+
+edited = st.data_editor(view, use_container_width=True, hide_index=True, num_rows="fixed", key=editor_key)
+if view is not catalog:
+    # Page edits go back into the full catalog kept in session state.
+    catalog.loc[edited.index, edited.columns] = edited
+with span("check_catalog", materials=len(catalog)):
+    df, issues = check_catalog(edited if view is catalog else catalog)
+ok, msg = validate_df(issues)
 if not ok:
     st.error(msg)
+    st.dataframe(issues, use_container_width=True, hide_index=True)
+    st.stop()
+if solver_backend == "dense" and len(df) > DENSE_MAX_N:
+    # The dense tableau has no time limit and grows as n²; backends.get_backend refuses it too.
+    st.error(tr["dense_big"].format(n=len(df), m=DENSE_MAX_N))
     st.stop()
 
 # =========================
-# SOLVER
+# SOLVER (headless core in lp_core.py)
 # =========================
-def solve_lp(df: pd.DataFrame):
-    mats = df["material"].tolist()
-
-    x = {
-        m: LpVariable(
-            name=m,
-            lowBound=float(df.loc[df["material"] == m, "LB"].iloc[0]),
-            upBound=float(df.loc[df["material"] == m, "UB"].iloc[0]),
-            cat="Continuous",
-        )
-        for m in mats
-    }
+problem = problem_from_df(
+    df,
+    mode=mode_key,
+    additive_cap=additive_cap,
+    ucs_limit=target_ucs if mode_key == MODE_COST else ucs_max,
+    pi_max=pi_max,
+    w_max=w_max,
+    base_ucs=base_ucs,
+    base_pi=base_pi,
+    base_w=base_w,
+)
 
-    # Objective ALWAYS: Minimize total additives cost
-    prob = LpProblem("SoilMix_CostMin", LpMinimize)
-    prob += lpSum(float(df.loc[df["material"] == m, "cost"].iloc[0]) * x[m] for m in mats)
 
-    # Additives cap
-    prob += lpSum(x[m] for m in mats) <= float(additive_cap)
+def solve_problem(p):
+    # Small catalogs on the dense backend use the in-process model kept in session state (+ sensitivity
+    # from its basis), so a rerun only patches what changed and warm-starts from the last optimal
+    # basis. Warm reruns (~1.3-2.3 ms at n=16-48, sensitivity included) keep up with HiGHS, so the
+    # app keeps this model past backends.dense_max_n(). Everything else goes through the backend
+    # interface (duals and reduced costs from HiGHS / CBC, no ranging); under "auto" the rare dense
+    # iteration-limit case moves on to the backend picked for large models.
+    if solver_backend in (AUTO, "dense") and p.n <= DENSE_MAX_N:
+        model = st.session_state.setdefault("lp_model", IncrementalModel())
+        status, res = model.solve(p)
+        if res is not None:
+            res["backend"] = "dense"
+        if status != STATUS_NOT_SOLVED or solver_backend == "dense":
+            return status, res
+        return solve_backend(p, large_backend(), solver_opts, sensitivity=True)
+    return solve_backend(p, solver_backend, solver_opts, sensitivity=True)
 
-    # Expressions
-    ucs_expr = base_ucs + lpSum(float(df.loc[df["material"] == m, "UCS_coef"].iloc[0]) * x[m] for m in mats)
-    pi_expr = base_pi + lpSum(float(df.loc[df["material"] == m, "PI_coef"].iloc[0]) * x[m] for m in mats)
-    w_expr = base_w + lpSum(float(df.loc[df["material"] == m, "W_coef"].iloc[0]) * x[m] for m in mats)
 
-    # UCS constraint depends on mode:
-    if mode == tr["mode_cost"]:
-        prob += ucs_expr >= float(target_ucs)   # UCS minimum target
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    # One cache per server process (shared by all sessions); SOIL_LP_CACHE_DIR adds a disk store.
+    return ResultCache(maxsize=512, path=os.environ.get("SOIL_LP_CACHE_DIR") or None)
+
+
+result_cache = get_result_cache()
+
+
+@st.cache_resource
+def get_history() -> RunHistory:
+    # Every run of every session is appended here (SOIL_LP_HISTORY overrides the file).
+    return RunHistory(os.environ.get("SOIL_LP_HISTORY") or HISTORY_PATH)
+
+
+history = get_history()
+
+
+def solve_or_recall(p):
+    # A past optimal run of the same problem is a lookup, not a re-solve.
+    return history.lookup(p) or solve_problem(p)
+
+# =========================
+# PANELS
+# =========================
+# Each expander below is a fragment: using its widgets reruns only that panel, not the script
+# (and the last solve result above stays on screen).
+@st.fragment
+def frontier_panel():
+    st.caption(tr["frontier_note"])
+    if problem.n > DENSE_MAX_N:
+        st.info(tr["frontier_big"].format(n=DENSE_MAX_N))
+    elif st.button(tr["frontier_btn"]):
+        pts = cost_ucs_frontier(problem)
+        if not pts:
+            render_solver_status_badge("Infeasible")
+        else:
+            fr = pd.DataFrame(
+                {
+                    "UCS": [q["UCS"] for q in pts],
+                    "total_cost": [q["total_cost"] for q in pts],
+                    "slope": [q["slope"] for q in pts],
+                    "entering": [", ".join(q["entering"]) for q in pts],
+                    "leaving": [", ".join(q["leaving"]) for q in pts],
+                }
+            )
+            st.line_chart(fr, x="UCS", y="total_cost")
+            st.dataframe(fr, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def manual_mix_panel():
+    # Live check of a hand-picked mix: one matrix-vector product per rerun, no solver.
+    if problem.n <= MANUAL_SLIDER_MAX:
+        cols = st.columns(3)
+        x_manual = [
+            cols[j % 3].slider(m, 0.0, 100.0, float(max(problem.lb[j], 0.0)), 0.1, key=f"mix_{m}")
+            for j, m in enumerate(problem.materials)
+        ]
     else:
-        prob += ucs_expr <= float(ucs_max)      # UCS maximum cap
-
-    # PI/W always maximum limits
-    prob += pi_expr <= float(pi_max)
-    prob += w_expr <= float(w_max)
-
-    prob.solve()
-    status = LpStatus.get(prob.status, str(prob.status))
-    if status != "Optimal":
-        return status, None
-
-    sol = {m: float(value(x[m])) for m in mats}
-    total_add_used = float(sum(sol.values()))
-    total_soil_approx = float(100.0 - total_add_used)
-
-    total_cost = float(sum(float(df.loc[df["material"] == m, "cost"].iloc[0]) * sol[m] for m in mats))
-    ucs_val = float(value(ucs_expr))
-    pi_val = float(value(pi_expr))
-    w_val = float(value(w_expr))
-
-    res = {
-        "solution": sol,
-        "add_used": total_add_used,
-        "soil_total": total_soil_approx,
-        "total_cost": total_cost,
-        "UCS": ucs_val,
-        "PI": pi_val,
-        "W": w_val,
+        mix_in = pd.DataFrame({"material": problem.materials, "x (%)": problem.lb})
+        x_manual = st.data_editor(mix_in, hide_index=True, disabled=["material"], key="mix_editor")["x (%)"]
+    with span("evaluate_mix", materials=problem.n):
+        ev = evaluate_mixes(problem, x_manual).iloc[0]
+        bad = mix_violations(problem, x_manual)
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric(tr["total_cost"], f"{ev['total_cost']:,.2f}")
+    m2.metric(tr["add_used"], f"{ev['add_used']:.2f}%")
+    m3.metric("UCS", f"{ev['UCS']:.3f}")
+    m4.metric("PI", f"{ev['PI']:.3f}")
+    m5.metric("Water Content", f"{ev['W']:.3f}")
+    if bad:
+        st.error(tr["manual_bad"].format(items=", ".join(bad)))
+    else:
+        st.success(tr["manual_ok"])
+
+    cand = st.file_uploader(tr["manual_upload"], type=["csv"], key="mix_upload")
+    if cand is not None:
+        cand_df = pd.read_csv(cand)
+        try:
+            X = mix_matrix(cand_df, problem.materials)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            with span("evaluate_mix", materials=problem.n, problems=len(X)):
+                scored = pd.concat([cand_df, evaluate_mixes(problem, X)], axis=1)
+            st.caption(tr["manual_scored"].format(k=len(scored), f=int(scored["feasible"].sum())))
+            st.dataframe(scored.head(PAGE_SIZE), use_container_width=True, hide_index=True)
+            st.download_button(tr["manual_download"], scored.to_csv(index=False), "mix_scores.csv", "text/csv")
+
+
+@st.fragment
+def portfolio_panel():
+    st.caption(tr["pf_note"])
+    pf_file = st.file_uploader(tr["pf_upload"], type=["csv"], key="pf_upload")
+    stock_df = st.data_editor(
+        pd.DataFrame({"material": problem.materials, STOCK_COL: float("nan")}),
+        hide_index=True, disabled=["material"], key="pf_stock",
+    )
+    pf_method = st.selectbox(tr["pf_method"], ["auto", METHOD_JOINT, METHOD_DECOMPOSED])
+    if pf_file is not None and st.button(tr["pf_btn"]):
+        ids, qty, projects = projects_from_df(problem, pd.read_csv(pf_file))
+        pf = solve_portfolio(ids, qty, projects, stock_from_df(stock_df, problem.materials), pf_method)
+        render_solver_status_badge(pf["status"])
+        if not pf.get("converged", True):
+            st.warning(tr["pf_unconverged"].format(r=pf["rounds"], gap=pf.get("gap", float("nan"))))
+        if pf["projects"]:
+            st.write(tr["pf_total"].format(k=len(projects), c=pf["total_cost"], m=pf["method"]))
+            st.dataframe(pd.DataFrame(pf["inventory"]), use_container_width=True, hide_index=True)
+            rows = [
+                {k: v for k, v in r.items() if k != "solution"} | {f"x_{m}": x for m, x in r["solution"].items()}
+                for r in pf["projects"]
+            ]
+            st.dataframe(pd.DataFrame(rows).head(PAGE_SIZE), use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def history_panel():
+    # Pages are fetched on demand (keyset on run id) and kept in session state until the
+    # filters change or a new run is stored; opening a run reads its stored result, no solve.
+    h1, h2, h3 = st.columns(3)
+    hist_mode = h1.selectbox(tr["hist_mode"], [None, MODE_COST, MODE_CAP], format_func=lambda m: tr["hist_all"] if m is None else m)
+    hist_same = h2.checkbox(tr["hist_same"])
+    hist_days = int(h3.number_input(tr["hist_days"], value=0, min_value=0, step=1))
+    hist_filter = {
+        "mode": hist_mode,
+        "material_set": material_set_key(problem.materials) if hist_same else None,
+        "since": time.time() - hist_days * 86400 if hist_days else None,
     }
-    return status, res
+    hist_key = (hist_mode, hist_filter["material_set"], hist_days, history.latest_id())
+    if st.session_state.get("hist_key") != hist_key:
+        st.session_state["hist_key"] = hist_key
+        st.session_state["hist_pages"] = [history.page(**hist_filter)]
+    pages = st.session_state["hist_pages"]
+    if len(pages[-1]) == HISTORY_PAGE and st.button(tr["hist_more"]):
+        pages.append(history.page(**hist_filter, before=int(pages[-1]["id"].iloc[-1])))
+    runs = pd.concat(pages, ignore_index=True)
+    if runs.empty:
+        st.caption(tr["hist_none"])
+    else:
+        st.caption(tr["hist_rows"].format(k=len(runs)))
+        st.dataframe(runs.drop(columns=["input_hash"]), use_container_width=True, hide_index=True)
+        labels = {
+            int(r.id): f"#{r.id} · {r.created_at:%Y-%m-%d %H:%M} · {r.mode} · {r.status}"
+            + ("" if pd.isna(r.total_cost) else f" · {r.total_cost:,.2f}")
+            for r in runs.itertuples()
+        }
+        run_id = st.selectbox(tr["hist_open"], [None] + list(labels), format_func=lambda i: "-" if i is None else labels[i])
+        if run_id is not None:
+            run = history.get(run_id)
+            render_solver_status_badge(run["status"])
+            st.json(run["params"], expanded=False)
+            if run["result"]:
+                r = run["result"]
+                k1, k2, k3, k4 = st.columns(4)
+                k1.metric(tr["total_cost"], f"{r['total_cost']:,.2f}")
+                k2.metric("UCS", f"{r['UCS']:.3f}")
+                k3.metric("PI", f"{r['PI']:.3f}")
+                k4.metric("Water Content", f"{r['W']:.3f}")
+                st.dataframe(
+                    pd.DataFrame({"material": list(r["solution"]), "x (%)": list(r["solution"].values())}),
+                    use_container_width=True, hide_index=True,
+                )
+            st.dataframe(pd.DataFrame(run["table"]), use_container_width=True, hide_index=True)
+            if run["timings"]:
+                st.caption(" · ".join(f"{k} {v * 1000:.1f} ms" for k, v in run["timings"].items()))
+
 
 # =========================
 # OUTPUT UI
 # =========================
+t_render = time.perf_counter()
 left, right = st.columns([1.05, 0.95])
 
 with left:
     st.subheader(tr["run_title"])
     if st.button(tr["btn"], type="primary"):
-        status, res = solve_lp(df)
+        n_spans = len(run_metrics.spans)
+        if robust:
+            robust_sd = coef_sd(df, robust_rel / 100.0)
+        if mip:
+            step, min_dose = dosing_from_df(df, mip_step, mip_min)
+            live = st.empty()
+            best = {"obj": "-"}
+
+            def show_mip_progress(ev):
+                if ev["event"] == "incumbent":
+                    best["obj"] = f"{ev['objective']:,.2f}"
+                elif ev["gap"] is not None:
+                    live.caption(tr["mip_progress"].format(obj=best["obj"], bound=ev["bound"], gap=f"{ev['gap']:.2%}", t=ev["seconds"], nodes=ev["nodes"]))
+
+            status, res = solve_mip(problem, step, min_dose, mip_time, mip_gap / 100.0, mip_threads, show_mip_progress)
+            live.empty()
+            if res is not None:
+                mi = res["mip"]
+                st.caption(tr["mip_result"].format(obj=res["total_cost"], gap=mi["gap"], why=mi["result"], lp=mi["lp_cost"]))
+        elif robust:
+            status, res = solve_robust(problem, robust_sd, robust_target, robust_method)
+            if res is not None and not res["robust"]["converged"]:
+                st.warning(tr["robust_unconverged"].format(cuts=res["robust"]["cuts"]))
+        else:
+            status, res = result_cache.solve(problem, solve_problem if solver_tag else solve_or_recall, solver_tag)
+            cs = result_cache.stats()
+            st.caption(tr["cache_stats"].format(**cs))
 
         # highlighted solver status
         render_solver_status_badge(status)
+        if res is not None and "backend" in res:
+            st.caption(tr["solver_used"].format(b=res["backend"]))
+        if res is not None and "history_id" in res:
+            st.caption(tr["hist_recalled"].format(id=res["history_id"]))
+        timings = {}
+        for sp in run_metrics.spans[n_spans:]:
+            timings[sp["phase"]] = timings.get(sp["phase"], 0.0) + sp["seconds"]
+        history.record(problem, status, res, model_kind, timings)
 
         if res is None:
             with st.expander(tr["ai_bad"], expanded=True):
-                for t in ai_suggestions_infeasible():
+                diag = diagnose(problem) if status == "Infeasible" else None
+                for t in ai_suggestions_infeasible(diag):
                     st.markdown(f"- {t}")
         else:
             st.write(f"**{tr['opt_comp']}**")
@@ -468,11 +591,48 @@ with left:
             k3.metric("PI", f"{res['PI']:.3f}")
             k4.metric("Water Content", f"{res['W']:.3f}")
 
+            if robust:
+                with st.expander(tr["mc_title"].format(k=MC_DRAWS), expanded=True):
+                    # Fixed seed: the same mix shows the same probabilities on every rerun.
+                    mc = simulate(problem, list(res["solution"].values()), robust_sd, MC_DRAWS, robust_dist, seed=0)
+                    mc_df = pd.DataFrame(mc["rows"])
+                    _, nominal = result_cache.solve(problem, solve_problem, solver_tag)
+                    joint0 = float("nan")
+                    if nominal is not None:
+                        mc0 = simulate(problem, list(nominal["solution"].values()), robust_sd, MC_DRAWS, robust_dist, seed=0)
+                        mc_df["prob (deterministic)"] = [r["prob"] for r in mc0["rows"]]
+                        joint0 = mc0["joint"]
+                    st.dataframe(mc_df, use_container_width=True, hide_index=True)
+                    st.write(tr["mc_joint"].format(p=mc["joint"], q=joint0))
+
+            if res.get("sensitivity"):
+                with st.expander(tr["sens_title"], expanded=False):
+                    if "limit_lo" not in res["sensitivity"]["rows"][0]:
+                        st.caption(tr["sens_no_ranging"].format(b=res.get("backend", "")))
+                    st.dataframe(pd.DataFrame(res["sensitivity"]["rows"]), use_container_width=True, hide_index=True)
+                    st.dataframe(pd.DataFrame(res["sensitivity"]["materials"]), use_container_width=True, hide_index=True)
+            elif model_kind == KIND_LP:
+                st.caption(tr["sens_unavailable"].format(b=res.get("backend", "")))
+
             with st.expander(tr["ai_ok"], expanded=True):
                 st.info(tr["ai_info"])
-                for t in ai_suggestions_feasible(res, res["solution"]):
+                with span("ai_suggestions_feasible"):
+                    tips = ai_suggestions_feasible(res, res["solution"])
+                for t in tips:
                     st.markdown(f"- {t}")
 
+    with st.expander(tr["frontier_title"], expanded=False):
+        frontier_panel()
+
+    with st.expander(tr["manual_title"], expanded=False):
+        manual_mix_panel()
+
+    with st.expander(tr["pf_title"], expanded=False):
+        portfolio_panel()
+
+    with st.expander(tr["hist_title"], expanded=False):
+        history_panel()
+
 with right:
     st.subheader(tr["math_title"])
     st.markdown(
@@ -510,3 +670,40 @@ LB_i \le x_i \le UB_i
 
 st.markdown("---")
 st.caption(tr["footer"])
+record_since("render", t_render)
+
+# =========================
+# DEBUG / METRICS
+# =========================
+RERUN_WINDOW = 200  # recent reruns kept for the latency summary
+
+
+@st.cache_resource
+def process_latency() -> dict:
+    # Lives as long as the server process: its first (cold) script run and a window of reruns.
+    return {"cold_ms": None, "rerun_ms": deque(maxlen=RERUN_WINDOW)}
+
+
+latency = process_latency()
+script_ms = (time.perf_counter() - t_script) * 1000
+if latency["cold_ms"] is None:
+    latency["cold_ms"] = script_ms
+    record_since("script_cold", t_script)
+else:
+    latency["rerun_ms"].append(script_ms)
+    record_since("script", t_script)
+
+if os.environ.get("SOIL_LP_METRICS_FILE"):
+    write_prometheus(os.environ["SOIL_LP_METRICS_FILE"])
+
+if debug:
+    with st.expander(tr["debug"], expanded=True):
+        st.write(tr["debug_run"].format(run=script_ms, cold=latency["cold_ms"]))
+        if latency["rerun_ms"]:
+            rr = pd.Series(latency["rerun_ms"])
+            st.write(tr["debug_reruns"].format(k=len(rr), med=rr.median(), p95=rr.quantile(0.95)))
+        spans = pd.DataFrame(run_metrics.spans)
+        if not spans.empty:
+            spans["ms"] = spans.pop("seconds") * 1000
+            st.dataframe(spans, use_container_width=True, hide_index=True)
+        st.code(prometheus_text(), language="text")
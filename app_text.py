@@ -0,0 +1,382 @@
+# app_text.py
+# UI strings for app3.py in its three languages (Bahasa Indonesia, English, 繁中).
+# A module rather than a literal in the script: Streamlit re-executes app3.py on every
+# interaction, while an imported module is built once per server process.
+
+T = {
+    "Bahasa Indonesia": {
+        "caption": "Linear Programming (PuLP) + AI Suggestions (rule-based, offline).",
+        "mode_header": "Mode Optimasi",
+        "mode_pick": "Pilih mode",
+        "mode_cost": "Minimasi Biaya (UCS minimum)",
+        "mode_ucscap": "UCS Maksimum (Cap) + Minimasi Biaya",
+        "fixed_header": "Komposisi",
+        "soil_fixed": "Tanah (%) (fixed)",
+        "add_cap": "Batas Maks Aditif (%)",
+        "tech_header": "Batasan Teknis",
+        "target_ucs": "Target UCS (minimum) (mode biaya)",
+        "ucs_max": "Batas UCS (maksimum) (mode cap)",
+        "pi_max": "Batas PI (maksimum)",
+        "w_max": "Batas Water Content (maksimum)",
+        "base_header": "Nilai Dasar Tanah (Base)",
+        "base_ucs": "Base UCS",
+        "base_pi": "Base PI",
+        "base_w": "Base Water Content",
+        "data_title": "Tabel Data Aditif (Editable)",
+        "data_note": "Isi semua kolom numerik dengan angka murni (tanpa satuan di sel).",
+        "run_title": "Jalankan Optimasi",
+        "btn": "Optimize",
+        "ai_ok": "🤖 AI Suggestions (Auto-Interpretation)",
+        "ai_bad": "🤖 AI Suggestions (Why infeasible?)",
+        "ai_info": "Saran dihasilkan dari aturan (rule-based) berdasarkan margin constraint.",
+        "summary": "Ringkasan hasil",
+        "total_cost": "Total Cost (Aditif)",
+        "opt_comp": "Komposisi optimal aditif (%)",
+        "add_used": "Total aditif terpakai",
+        "soil_total": "Total tanah (approx.)",
+        "math_title": "Model Matematis (untuk slide)",
+        "footer": "Haidar Fadhila Rahma- M11316025- Management Sciece | National Yunlin University of Science and Technology",
+        "err_cols": "Kolom wajib hilang. Wajib ada: {cols}",
+        "err_nan": "Ada nilai non-angka (NaN) pada kolom numerik. Perbaiki tabel.",
+        "err_inf": "Ada nilai tak hingga (inf) pada kolom numerik. Gunakan angka berhingga.",
+        "err_lbub": "Ada baris dengan LB > UB. Perbaiki bounds.",
+        "err_dup": "Nama material duplikat. Pastikan unik.",
+        "ai_margin_min": "**Margin:** UCS = **{u:.2f}** (hasil-target), PI = **{p:.2f}** (max-hasil), W = **{w:.2f}** (max-hasil).",
+        "ai_margin_cap": "**Margin:** UCS = **{u:.2f}** (UCSmax-hasil), PI = **{p:.2f}** (max-hasil), W = **{w:.2f}** (max-hasil).",
+        "ai_tightest": "✅ Constraint paling ketat: {c}",
+        "ai_tight_ucs": "UCS",
+        "ai_tight_pi": "PI",
+        "ai_tight_w": "Water Content",
+        "ai_dom": "📌 Aditif dominan: {a1}={v1:.2f}%, {a2}={v2:.2f}%.",
+        "ai_note_cap": "Catatan: Karena aditif dibatasi (≤ cap), solusi optimal bisa memakai aditif < cap untuk menekan biaya.",
+        "ai_suggest_ucs_min": "Saran: Jika infeasible, turunkan target UCS atau naikkan UB aditif yang kontribusi UCS tinggi.",
+        "ai_suggest_ucs_cap": "Saran: Jika melanggar cap UCS, turunkan koefisien UCS (atau kurangi aditif yang menaikkan UCS) / naikkan UCSmax.",
+        "ai_suggest_pi": "Saran: Perketat/longgarkan PI dengan mengatur aditif yang menurunkan PI (koefisien PI lebih negatif).",
+        "ai_suggest_w": "Saran: Perketat/longgarkan W dengan mengatur aditif yang menurunkan W (koefisien W lebih negatif).",
+        "ai_infeas_bounds": "❌ Infeasible karena bounds: ΣLB sudah terlalu besar atau constraint terlalu ketat.",
+        "ai_infeas_tech": "⚠️ Infeasible kemungkinan karena batasan teknis terlalu ketat (UCS/PI/W).",
+        "ai_iis": "🔎 Konflik minimal (IIS): {items}. Melonggarkan salah satunya akan menghapus konflik ini.",
+        "ai_relax": "🔧 Relaksasi minimum: {c} {a:.3f} → {b:.3f} ({d:+.3f}).",
+        "sens_title": "📈 Analisis Sensitivitas (shadow price, reduced cost, ranging)",
+        "sens_no_ranging": "Backend {b} hanya memberi shadow price dan reduced cost; ranging butuh basis dari solver dense.",
+        "sens_unavailable": "Analisis sensitivitas tidak tersedia untuk hasil ini (backend {b}).",
+        "ai_dual": "💰 Biaya marjinal: memperketat {c} sebesar 1 unit mengubah biaya sebesar {v:,.2f}.",
+        "frontier_title": "📉 Frontier Biaya vs UCS (parametrik, eksak)",
+        "frontier_btn": "Hitung frontier",
+        "frontier_note": "Biaya minimum sebagai fungsi target UCS (mode biaya), dengan aditif yang masuk/keluar basis di setiap breakpoint.",
+        "upload": "Muat katalog aditif (CSV/Parquet)",
+        "filter": "Filter material",
+        "page": "Halaman",
+        "rows_info": "{n} baris total, menampilkan {a}–{b} dari {m} hasil filter.",
+        "frontier_big": "Frontier hanya tersedia untuk katalog ≤ {n} material.",
+        "debug": "Debug: tampilkan waktu per fase",
+        "debug_run": "Eksekusi skrip: **{run:.1f} ms** · cold start: **{cold:.1f} ms**",
+        "debug_reruns": "Rerun ({k} terakhir): median **{med:.1f} ms**, p95 **{p95:.1f} ms**",
+        "manual_title": "🧪 Campuran manual (tanpa solver)",
+        "manual_ok": "✅ Campuran ini memenuhi semua batasan dan bounds.",
+        "manual_bad": "❌ Dilanggar: {items}",
+        "manual_upload": "Nilai kandidat campuran (CSV, satu kolom per material)",
+        "manual_scored": "{k} campuran dinilai, {f} feasible.",
+        "manual_download": "Unduh hasil (CSV)",
+        "model_header": "Model",
+        "model_kind": "Jenis model",
+        "kind_lp": "LP standar",
+        "kind_robust": "Robust / chance-constrained",
+        "kind_mip": "Kelipatan sak / dosis minimum (MIP)",
+        "robust_header": "Mode robust (koefisien tidak pasti)",
+        "robust_method": "Metode",
+        "robust_chance": "Chance constraint (normal)",
+        "robust_box": "Kasus terburuk (box)",
+        "robust_target": "Probabilitas target per batasan",
+        "robust_rel": "Ketidakpastian koefisien jika tanpa kolom *_sd atau *_lo/*_hi (% dari koef)",
+        "robust_dist": "Distribusi untuk validasi",
+        "mc_title": "🎲 Validasi Monte Carlo ({k:,} sampel)",
+        "mc_joint": "Semua batasan terpenuhi bersamaan: **{p:.1%}** (optimum deterministik: {q:.1%}).",
+        "robust_unconverged": "Batas {cuts} potongan tercapai sebelum chance constraint terpenuhi: campuran ini masih melanggar probabilitas target (lihat validasi Monte Carlo).",
+        "mip_header": "Dosis diskrit (MIP)",
+        "mip_step": "Kelipatan sak tanpa kolom step (%)",
+        "mip_min": "Dosis minimum jika dipakai tanpa kolom min_dose (%)",
+        "mip_time": "Batas waktu (detik)",
+        "mip_gap": "Gap MIP relatif (%)",
+        "mip_threads": "Jumlah thread",
+        "mip_progress": "Solusi terbaik {obj} · batas {bound:,.2f} · gap {gap} · {t:.1f} dtk · {nodes} node",
+        "mip_result": "Campuran terbaik: biaya {obj:,.2f}, gap terbukti {gap:.2%} ({why}). Optimum LP kontinu: {lp:,.2f}.",
+        "solver_header": "Solver",
+        "solver_backend": "Backend solver",
+        "solver_auto": "otomatis (menurut ukuran model)",
+        "dense_big": "Backend dense hanya untuk katalog ≤ {m} material (katalog ini {n}). Pilih backend lain.",
+        "solver_time": "Batas waktu (detik, 0 = tanpa batas)",
+        "solver_threads": "Jumlah thread",
+        "solver_tol": "Toleransi kelayakan",
+        "solver_default": "bawaan",
+        "solver_used": "Diselesaikan dengan: {b}",
+        "cache_stats": "Cache: {hits} hit ({disk_hits} dari disk) / {misses} miss, {size}/{maxsize} entri",
+        "pf_title": "🏗️ Portofolio: banyak proyek, stok aditif bersama",
+        "pf_note": "Unggah proyek (project_id, quantity dalam ton, dan parameter sidebar apa pun sebagai kolom). Stok dalam ton; kosong = tak terbatas.",
+        "pf_upload": "Proyek (CSV)",
+        "pf_method": "Metode",
+        "pf_btn": "Optimalkan portofolio",
+        "pf_total": "Total biaya untuk {k} proyek: **{c:,.2f}** ({m}).",
+        "pf_unconverged": "Dekomposisi berhenti setelah {r} putaran sebelum konvergen (gap {gap:.2%}): rencana ini belum tentu optimal.",
+        "hist_title": "📚 Riwayat run",
+        "hist_mode": "Mode",
+        "hist_all": "semua",
+        "hist_same": "Hanya set material ini",
+        "hist_days": "N hari terakhir (0 = semua)",
+        "hist_more": "Muat lebih banyak",
+        "hist_open": "Buka run",
+        "hist_none": "Belum ada run tersimpan.",
+        "hist_rows": "{k} run ditampilkan (terbaru dulu).",
+        "hist_recalled": "Diambil dari riwayat (run #{id}), tanpa menyelesaikan ulang.",
+    },
+    "English": {
+        "caption": "Linear Programming (PuLP) + AI Suggestions (rule-based, offline).",
+        "mode_header": "Optimization Mode",
+        "mode_pick": "Choose mode",
+        "mode_cost": "Minimize Cost (UCS minimum)",
+        "mode_ucscap": "UCS Maximum (Cap) + Minimize Cost",
+        "fixed_header": "Composition",
+        "soil_fixed": "Soil (%) (fixed)",
+        "add_cap": "Max Additives (%)",
+        "tech_header": "Technical Constraints",
+        "target_ucs": "Target UCS (minimum) (cost mode)",
+        "ucs_max": "UCS limit (maximum) (cap mode)",
+        "pi_max": "PI limit (maximum)",
+        "w_max": "Water content limit (maximum)",
+        "base_header": "Soil Base Properties",
+        "base_ucs": "Base UCS",
+        "base_pi": "Base PI",
+        "base_w": "Base Water Content",
+        "data_title": "Additives Data Table (Editable)",
+        "data_note": "All numeric cells must be pure numbers (no units inside cells).",
+        "run_title": "Run Optimization",
+        "btn": "Optimize",
+        "ai_ok": "🤖 AI Suggestions (Auto-Interpretation)",
+        "ai_bad": "🤖 AI Suggestions (Why infeasible?)",
+        "ai_info": "Suggestions are generated by rule-based logic using constraint margins.",
+        "summary": "Results summary",
+        "total_cost": "Total Cost (Additives)",
+        "opt_comp": "Optimal additives composition (%)",
+        "add_used": "Total additives used",
+        "soil_total": "Total soil (approx.)",
+        "math_title": "Mathematical Model (for slides)",
+        "footer": "Haidar Fadhila Rahman- M11316025- Management Sciece | National Yunlin University of Science and Technology",
+        "err_cols": "Required columns missing. Must include: {cols}",
+        "err_nan": "There are non-numeric (NaN) values in numeric columns. Fix the table.",
+        "err_inf": "There are infinite (inf) values in numeric columns. Use finite numbers.",
+        "err_lbub": "Some rows have LB > UB. Fix bounds.",
+        "err_dup": "Duplicate material names. Make them unique.",
+        "ai_margin_min": "**Margins:** UCS = **{u:.2f}** (result-target), PI = **{p:.2f}** (max-result), W = **{w:.2f}** (max-result).",
+        "ai_margin_cap": "**Margins:** UCS = **{u:.2f}** (UCSmax-result), PI = **{p:.2f}** (max-result), W = **{w:.2f}** (max-result).",
+        "ai_tightest": "✅ Tightest constraint: {c}",
+        "ai_tight_ucs": "UCS",
+        "ai_tight_pi": "PI",
+        "ai_tight_w": "Water Content",
+        "ai_dom": "📌 Dominant additives: {a1}={v1:.2f}%, {a2}={v2:.2f}%.",
+        "ai_note_cap": "Note: since additives are constrained (≤ cap), the optimal solution may use < cap to reduce cost.",
+        "ai_suggest_ucs_min": "Suggestion: If infeasible, reduce UCS target or increase UB for high-UCS additives.",
+        "ai_suggest_ucs_cap": "Suggestion: If UCS cap is violated, reduce strength-raising additives or increase UCSmax.",
+        "ai_suggest_pi": "Suggestion: Adjust PI by increasing additives that reduce PI (more negative PI coefficients) or relax PI limit.",
+        "ai_suggest_w": "Suggestion: Adjust W by increasing additives that reduce W (more negative W coefficients) or relax W limit.",
+        "ai_infeas_bounds": "❌ Infeasible due to bounds: ΣLB too high or constraints too tight.",
+        "ai_infeas_tech": "⚠️ Infeasible likely due to tight technical constraints (UCS/PI/W).",
+        "ai_iis": "🔎 Minimal conflict (IIS): {items}. Relaxing any one of them removes this conflict.",
+        "ai_relax": "🔧 Minimum relaxation: {c} {a:.3f} → {b:.3f} ({d:+.3f}).",
+        "sens_title": "📈 Sensitivity Analysis (shadow prices, reduced costs, ranging)",
+        "sens_no_ranging": "The {b} backend reports shadow prices and reduced costs only; ranging needs the dense solver's basis.",
+        "sens_unavailable": "Sensitivity analysis is not available for this result (backend {b}).",
+        "ai_dual": "💰 Marginal cost: tightening {c} by 1 unit changes cost by {v:,.2f}.",
+        "frontier_title": "📉 Cost vs UCS Frontier (parametric, exact)",
+        "frontier_btn": "Compute frontier",
+        "frontier_note": "Minimum cost as a function of the UCS target (cost mode), with the additives entering/leaving the basis at each breakpoint.",
+        "upload": "Load additive catalog (CSV/Parquet)",
+        "filter": "Filter materials",
+        "page": "Page",
+        "rows_info": "{n} rows in total, showing {a}–{b} of {m} filtered.",
+        "frontier_big": "The frontier is only available for catalogs with ≤ {n} materials.",
+        "debug": "Debug: show per-phase timings",
+        "debug_run": "Script run: **{run:.1f} ms** · cold start: **{cold:.1f} ms**",
+        "debug_reruns": "Reruns (last {k}): median **{med:.1f} ms**, p95 **{p95:.1f} ms**",
+        "manual_title": "🧪 Manual mix (no solver)",
+        "manual_ok": "✅ This mix meets every limit and bound.",
+        "manual_bad": "❌ Violated: {items}",
+        "manual_upload": "Score candidate mixes (CSV, one column per material)",
+        "manual_scored": "{k} mixes scored, {f} feasible.",
+        "manual_download": "Download scores (CSV)",
+        "model_header": "Model",
+        "model_kind": "Model type",
+        "kind_lp": "Standard LP",
+        "kind_robust": "Robust / chance-constrained",
+        "kind_mip": "Bag increments / minimum dose (MIP)",
+        "robust_header": "Robust mode (uncertain coefficients)",
+        "robust_method": "Method",
+        "robust_chance": "Chance constraint (normal)",
+        "robust_box": "Worst case (box)",
+        "robust_target": "Target probability per limit",
+        "robust_rel": "Coefficient uncertainty without *_sd or *_lo/*_hi columns (% of coef)",
+        "robust_dist": "Distribution for validation",
+        "mc_title": "🎲 Monte Carlo validation ({k:,} draws)",
+        "mc_joint": "All limits met together: **{p:.1%}** (deterministic optimum: {q:.1%}).",
+        "robust_unconverged": "Cut limit reached after {cuts} cuts before the chance constraints held: this mix still misses the target probability (see the Monte Carlo validation).",
+        "mip_header": "Discrete dosing (MIP)",
+        "mip_step": "Bag increment without a step column (%)",
+        "mip_min": "Minimum dose if used without a min_dose column (%)",
+        "mip_time": "Time limit (s)",
+        "mip_gap": "Relative MIP gap (%)",
+        "mip_threads": "Threads",
+        "mip_progress": "Incumbent {obj} · bound {bound:,.2f} · gap {gap} · {t:.1f} s · {nodes} nodes",
+        "mip_result": "Best mix: cost {obj:,.2f}, proven gap {gap:.2%} ({why}). Continuous LP optimum: {lp:,.2f}.",
+        "solver_header": "Solver",
+        "solver_backend": "Solver backend",
+        "solver_auto": "automatic (by model size)",
+        "dense_big": "The dense backend only takes catalogs with ≤ {m} materials (this one has {n}). Pick another backend.",
+        "solver_time": "Time limit (seconds, 0 = none)",
+        "solver_threads": "Threads",
+        "solver_tol": "Feasibility tolerance",
+        "solver_default": "default",
+        "solver_used": "Solved with: {b}",
+        "cache_stats": "Cache: {hits} hits ({disk_hits} from disk) / {misses} misses, {size}/{maxsize} entries",
+        "pf_title": "🏗️ Portfolio: many projects, shared inventory",
+        "pf_note": "Upload projects (project_id, quantity in tonnes, and any sidebar parameter as a column). Stock is in tonnes; blank = unlimited.",
+        "pf_upload": "Projects (CSV)",
+        "pf_method": "Method",
+        "pf_btn": "Optimize portfolio",
+        "pf_total": "Total cost for {k} projects: **{c:,.2f}** ({m}).",
+        "pf_unconverged": "Decomposition stopped after {r} rounds without converging (gap {gap:.2%}): this plan may not be optimal.",
+        "hist_title": "📚 Run history",
+        "hist_mode": "Mode",
+        "hist_all": "all",
+        "hist_same": "Only this material set",
+        "hist_days": "Last N days (0 = all)",
+        "hist_more": "Load more",
+        "hist_open": "Open run",
+        "hist_none": "No stored runs yet.",
+        "hist_rows": "{k} runs shown (newest first).",
+        "hist_recalled": "Recalled from history (run #{id}), not re-solved.",
+    },
+    "繁體中文": {
+        "caption": "線性規劃（PuLP）＋ AI 建議（規則式、離線）",
+        "mode_header": "最佳化模式",
+        "mode_pick": "選擇模式",
+        "mode_cost": "最小化成本（UCS 下限）",
+        "mode_ucscap": "UCS 上限（Cap）＋最小化成本",
+        "fixed_header": "配比",
+        "soil_fixed": "土壤 (%)（固定）",
+        "add_cap": "添加劑上限 (%)",
+        "tech_header": "技術限制",
+        "target_ucs": "UCS 目標（下限）（成本模式）",
+        "ucs_max": "UCS 上限（cap 模式）",
+        "pi_max": "PI 上限",
+        "w_max": "含水量上限",
+        "base_header": "土壤基準值",
+        "base_ucs": "Base UCS",
+        "base_pi": "Base PI",
+        "base_w": "Base 含水量",
+        "data_title": "添加劑資料表（可編輯）",
+        "data_note": "數值欄位請填純數字（不要在儲存格內寫單位）。",
+        "run_title": "執行最佳化",
+        "btn": "Optimize",
+        "ai_ok": "🤖 AI 建議（自動解讀）",
+        "ai_bad": "🤖 AI 建議（為何不可行？）",
+        "ai_info": "建議由規則式邏輯根據約束裕度自動產生。",
+        "summary": "結果摘要",
+        "total_cost": "總成本（添加劑）",
+        "opt_comp": "最佳添加劑配比 (%)",
+        "add_used": "實際使用添加劑總量",
+        "soil_total": "土壤總量（約）",
+        "math_title": "數學模型（投影片用）",
+        "footer": "Haidar Fadhila Rahman- M11316025- Management Sciece | National Yunlin University of Science and Technology",
+        "err_cols": "缺少必要欄位：{cols}",
+        "err_nan": "數值欄位出現 NaN（非數字），請修正。",
+        "err_inf": "數值欄位出現無限大（inf），請改用有限數值。",
+        "err_lbub": "有些列 LB > UB，請修正。",
+        "err_dup": "材料名稱重複，請確保唯一。",
+        "ai_margin_min": "**裕度：** UCS = **{u:.2f}**（結果-目標），PI = **{p:.2f}**（上限-結果），含水量 = **{w:.2f}**（上限-結果）。",
+        "ai_margin_cap": "**裕度：** UCS = **{u:.2f}**（UCSmax-結果），PI = **{p:.2f}**（上限-結果），含水量 = **{w:.2f}**（上限-結果）。",
+        "ai_tightest": "✅ 最緊約束：{c}",
+        "ai_tight_ucs": "UCS",
+        "ai_tight_pi": "PI",
+        "ai_tight_w": "含水量",
+        "ai_dom": "📌 主要添加劑：{a1}={v1:.2f}%，{a2}={v2:.2f}%。",
+        "ai_note_cap": "注意：因添加劑限制為「≤ 上限」，最佳解可能使用少於上限以降低成本。",
+        "ai_suggest_ucs_min": "建議：若不可行，降低 UCS 目標或提高高 UCS 添加劑的 UB。",
+        "ai_suggest_ucs_cap": "建議：若超過 UCS 上限，減少提高強度的添加劑或提高 UCSmax。",
+        "ai_suggest_pi": "建議：透過增加能降低 PI（PI 係數更負）的添加劑或放寬 PI 上限來調整。",
+        "ai_suggest_w": "建議：透過增加能降低含水量（W 係數更負）的添加劑或放寬含水量上限來調整。",
+        "ai_infeas_bounds": "❌ 因 bounds 不可行：ΣLB 太高或限制過嚴。",
+        "ai_infeas_tech": "⚠️ 可能因技術限制過嚴（UCS/PI/W）而不可行。",
+        "ai_iis": "🔎 最小衝突集合（IIS）：{items}。放寬其中任一項即可消除此衝突。",
+        "ai_relax": "🔧 最小放寬：{c} {a:.3f} → {b:.3f}（{d:+.3f}）。",
+        "sens_title": "📈 敏感度分析（影子價格、縮減成本、範圍）",
+        "sens_no_ranging": "{b} 後端只提供影子價格與縮減成本；範圍分析需要 dense 求解器的基底。",
+        "sens_unavailable": "此結果無法提供敏感度分析（後端 {b}）。",
+        "ai_dual": "💰 邊際成本：{c} 收緊 1 單位，成本變動 {v:,.2f}。",
+        "frontier_title": "📉 成本－UCS 前緣（參數式、精確）",
+        "frontier_btn": "計算前緣",
+        "frontier_note": "最低成本隨 UCS 目標（成本模式）的變化，並列出每個轉折點進出基底的添加劑。",
+        "upload": "載入添加劑目錄（CSV/Parquet）",
+        "filter": "篩選材料",
+        "page": "頁數",
+        "rows_info": "共 {n} 列，顯示篩選後 {m} 列中的第 {a}–{b} 列。",
+        "frontier_big": "前緣僅適用於 ≤ {n} 種材料的目錄。",
+        "debug": "除錯：顯示各階段耗時",
+        "debug_run": "本次執行：**{run:.1f} ms** · 冷啟動：**{cold:.1f} ms**",
+        "debug_reruns": "重跑（最近 {k} 次）：中位數 **{med:.1f} ms**，p95 **{p95:.1f} ms**",
+        "manual_title": "🧪 手動配比（不使用求解器）",
+        "manual_ok": "✅ 此配比滿足所有限制與上下限。",
+        "manual_bad": "❌ 違反：{items}",
+        "manual_upload": "評估候選配比（CSV，每種材料一欄）",
+        "manual_scored": "已評估 {k} 組配比，其中 {f} 組可行。",
+        "manual_download": "下載結果（CSV）",
+        "model_header": "模型",
+        "model_kind": "模型類型",
+        "kind_lp": "標準 LP",
+        "kind_robust": "穩健／機會約束",
+        "kind_mip": "袋裝增量／最低用量（MIP）",
+        "robust_header": "穩健模式（係數不確定）",
+        "robust_method": "方法",
+        "robust_chance": "機會約束（常態）",
+        "robust_box": "最壞情況（box）",
+        "robust_target": "每項限制的目標機率",
+        "robust_rel": "無 *_sd 或 *_lo/*_hi 欄位時的係數不確定度（係數的 %）",
+        "robust_dist": "驗證用分布",
+        "mc_title": "🎲 蒙地卡羅驗證（{k:,} 次抽樣）",
+        "mc_joint": "同時滿足所有限制：**{p:.1%}**（確定性最佳解：{q:.1%}）。",
+        "robust_unconverged": "在機會約束成立前已達 {cuts} 條割平面上限：此配比仍未達目標機率（請見蒙地卡羅驗證）。",
+        "mip_header": "離散投料（MIP）",
+        "mip_step": "無 step 欄位時的袋裝增量（%）",
+        "mip_min": "無 min_dose 欄位時的最低使用量（%）",
+        "mip_time": "時間上限（秒）",
+        "mip_gap": "MIP 相對間隙（%）",
+        "mip_threads": "執行緒數",
+        "mip_progress": "目前最佳解 {obj} · 下界 {bound:,.2f} · 間隙 {gap} · {t:.1f} 秒 · {nodes} 節點",
+        "mip_result": "最佳配比：成本 {obj:,.2f}，已證明間隙 {gap:.2%}（{why}）。連續 LP 最佳值：{lp:,.2f}。",
+        "solver_header": "求解器",
+        "solver_backend": "求解器後端",
+        "solver_auto": "自動（依模型大小）",
+        "dense_big": "dense 後端僅適用於 ≤ {m} 種材料的目錄（此目錄有 {n} 種），請改選其他後端。",
+        "solver_time": "時間上限（秒，0 = 不限）",
+        "solver_threads": "執行緒數",
+        "solver_tol": "可行性容差",
+        "solver_default": "預設",
+        "solver_used": "求解後端：{b}",
+        "cache_stats": "快取：命中 {hits} 次（磁碟 {disk_hits} 次）/ 未命中 {misses} 次，{size}/{maxsize} 筆",
+        "pf_title": "🏗️ 專案組合：多個專案共用添加劑庫存",
+        "pf_note": "上傳專案（project_id、以噸計的 quantity，以及任何側邊欄參數欄位）。庫存以噸計；空白 = 不限。",
+        "pf_upload": "專案（CSV）",
+        "pf_method": "方法",
+        "pf_btn": "最佳化專案組合",
+        "pf_total": "{k} 個專案總成本：**{c:,.2f}**（{m}）。",
+        "pf_unconverged": "分解法在 {r} 輪後仍未收斂即停止（gap {gap:.2%}）：此計畫不一定最佳。",
+        "hist_title": "📚 執行紀錄",
+        "hist_mode": "模式",
+        "hist_all": "全部",
+        "hist_same": "僅此材料組合",
+        "hist_days": "最近 N 天（0 = 全部）",
+        "hist_more": "載入更多",
+        "hist_open": "開啟執行紀錄",
+        "hist_none": "尚無已儲存的執行紀錄。",
+        "hist_rows": "顯示 {k} 筆執行紀錄（最新在前）。",
+        "hist_recalled": "取自執行紀錄（#{id}），未重新求解。",
+    },
+}
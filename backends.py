@@ -0,0 +1,269 @@
+# backends.py
+# Pluggable LP/MIP backends behind one call, picked from the problem size and integrality.
+#
+#   dense   in-process batched tableau simplex (dense_solver)    small LPs, batches of them
+#   highs   HiGHS through SciPy (linprog / milp), if installed    large LPs and MIPs, in-process
+#   cbc     PuLP + CBC subprocess                                 always there; any size, MIPs
+#
+# Every backend solves  min c·x  s.t.  A x (sense) rhs,  lb <= x <= ub  (some x integer) and
+# returns a Solution whose status is one of PuLP's strings (Optimal / Infeasible / Unbounded /
+# Not Solved), so render_solver_status_badge and the (status, res) callers never see which
+# backend ran. A time-limited solve that still found a mix reports Optimal, as PuLP does.
+#
+# SolveOptions carry the per-call time limit, thread count, tolerance and MIP gap; a backend
+# ignores what it cannot use (dense: everything; it runs in microseconds under an iteration cap
+# with its own fixed tolerances. highs: threads, since HiGHS' LP/MIP paths here are serial).
+# Because dense has no time limit and its tableau grows as n², it refuses n > DENSE_MAX_N.
+
+import importlib.util
+from dataclasses import dataclass
+
+import numpy as np
+from pulp import PULP_CBC_CMD, LpStatus
+
+from dense_solver import (
+    DENSE_MAX_N,
+    STATUS_INFEASIBLE,
+    STATUS_NOT_SOLVED,
+    STATUS_OPTIMAL,
+    STATUS_UNBOUNDED,
+    solve_batch,
+    solve_many,
+)
+from lp_core import SENSE_GE, MixProblem, build_lp_arrays, extract_result
+from metrics import span
+from sensitivity import from_duals
+
+AUTO = "auto"
+STATUSES = (STATUS_OPTIMAL, STATUS_INFEASIBLE, STATUS_UNBOUNDED, STATUS_NOT_SOLVED)
+
+
+@dataclass
+class SolveOptions:
+    time_limit: float | None = None  # seconds
+    threads: int | None = None
+    tol: float | None = None         # primal/dual feasibility tolerance
+    gap: float | None = None         # relative MIP gap
+
+
+@dataclass
+class Solution:
+    status: str
+    x: np.ndarray | None
+    backend: str
+    duals: np.ndarray | None = None          # d(objective) / d(rhs) per row, continuous models only
+    reduced_costs: np.ndarray | None = None
+
+
+def normalize_status(status) -> str:
+    # PuLP's "Undefined" and anything a backend invents becomes "Not Solved".
+    status = LpStatus.get(status, status) if isinstance(status, int) else str(status)
+    return status if status in STATUSES else STATUS_NOT_SOLVED
+
+
+# =========================
+# BACKENDS
+# =========================
+class Backend:
+    name = ""
+    integer = False  # handles integer columns
+
+    def available(self) -> bool:
+        return True
+
+    def solve(self, c, A, sense, rhs, lb, ub, integer=None, options=None) -> Solution:
+        raise NotImplementedError
+
+
+class DenseBackend(Backend):
+    name = "dense"
+
+    def solve(self, c, A, sense, rhs, lb, ub, integer=None, options=None) -> Solution:
+        with span("solve", backend=self.name, materials=len(c), rows=len(rhs), problems=1) as s:
+            out = solve_batch(c, A, sense, rhs, lb, ub)
+            s["iterations"] = int(out.iterations.sum())
+        status = str(out.status[0])
+        return Solution(status, out.x[0] if status == STATUS_OPTIMAL else None, self.name)
+
+
+class CbcBackend(Backend):
+    name = "cbc"
+    integer = True
+
+    def solve(self, c, A, sense, rhs, lb, ub, integer=None, options=None) -> Solution:
+        o = options or SolveOptions()
+        with span("build", backend=self.name, materials=len(c), rows=len(rhs)):
+            prob, x = build_lp_arrays(c, lb, ub, A, sense, rhs)
+            if integer is not None:
+                for j in np.flatnonzero(integer):
+                    x[j].cat = "Integer"
+        solver = PULP_CBC_CMD(
+            msg=False,
+            timeLimit=o.time_limit,
+            threads=o.threads,
+            gapRel=o.gap,
+            options=[f"primalTolerance {o.tol}", f"dualTolerance {o.tol}"] if o.tol else [],
+        )
+        with span("solve", backend=self.name, materials=len(c), rows=len(rhs), problems=1):
+            prob.solve(solver)
+        status = normalize_status(prob.status)
+        if status != STATUS_OPTIMAL:
+            return Solution(status, None, self.name)
+        sol = Solution(status, np.array([v.varValue for v in x], dtype=float), self.name)
+        if integer is None or not np.any(integer):
+            cons = prob.constraints
+            sol.duals = np.array([cons[f"r_{i}"].pi or 0.0 for i in range(len(rhs))], dtype=float)
+            sol.reduced_costs = np.array([v.dj or 0.0 for v in x], dtype=float)
+        return sol
+
+
+class HighsBackend(Backend):
+    name = "highs"
+    integer = True
+
+    # scipy status codes: 0 optimal, 1 iteration/time limit, 2 infeasible, 3 unbounded, 4 numerical
+    _STATUS = {0: STATUS_OPTIMAL, 2: STATUS_INFEASIBLE, 3: STATUS_UNBOUNDED}
+
+    def available(self) -> bool:
+        # Optional: without SciPy large models go to CBC.
+        return importlib.util.find_spec("scipy") is not None
+
+    def solve(self, c, A, sense, rhs, lb, ub, integer=None, options=None) -> Solution:
+        # Imported on first use: scipy.optimize alone costs ~0.5 s, too much for the app's cold start.
+        from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+        o = options or SolveOptions()
+        A = np.asarray(A, dtype=float)
+        rhs = np.asarray(rhs, dtype=float)
+        ge = np.asarray(sense) == SENSE_GE
+        opts = {}
+        if o.time_limit is not None:
+            opts["time_limit"] = float(o.time_limit)
+        with span("solve", backend=self.name, materials=len(c), rows=len(rhs), problems=1):
+            if integer is not None and np.any(integer):
+                if o.gap is not None:
+                    opts["mip_rel_gap"] = float(o.gap)
+                out = milp(
+                    c,
+                    integrality=np.asarray(integer, dtype=int),
+                    bounds=Bounds(lb, ub),
+                    constraints=LinearConstraint(A, np.where(ge, rhs, -np.inf), np.where(ge, np.inf, rhs)),
+                    options=opts,
+                )
+            else:
+                if o.tol is not None:
+                    opts["primal_feasibility_tolerance"] = opts["dual_feasibility_tolerance"] = float(o.tol)
+                # linprog only takes <= rows.
+                g = np.where(ge, -1.0, 1.0)
+                out = linprog(c, A_ub=A * g[:, None], b_ub=rhs * g, bounds=np.column_stack([lb, ub]), method="highs", options=opts)
+                if out.status == 0:
+                    # Marginals are on the <= form; bound marginals fold into the reduced cost.
+                    return Solution(STATUS_OPTIMAL, np.asarray(out.x, dtype=float), self.name,
+                                    out.ineqlin.marginals * g, out.lower.marginals + out.upper.marginals)
+        if out.x is not None and out.status in (0, 1):
+            return Solution(STATUS_OPTIMAL, np.asarray(out.x, dtype=float), self.name)
+        return Solution(self._STATUS.get(out.status, STATUS_NOT_SOLVED), None, self.name)
+
+
+BACKENDS: dict[str, Backend] = {}
+
+
+def register_backend(backend: Backend):
+    BACKENDS[backend.name] = backend
+
+
+for _b in (DenseBackend(), HighsBackend(), CbcBackend()):
+    register_backend(_b)
+
+
+def available_backends() -> list[str]:
+    return [name for name, b in BACKENDS.items() if b.available()]
+
+
+# =========================
+# SELECTION
+# =========================
+# Largest n the dense tableau takes under "auto", by the backend it competes with. Crossovers
+# measured per problem with benchmark.generate_problems (one CPU): a single dense solve beats
+# HiGHS (~2.5 ms flat) up to n≈16-20 and CBC (~5-6 ms) up to n≈24-30; a stack of STACK_MIN or
+# more problems brings dense to ~2 ms at n=40 and ~3.5 ms at n=48 (vs ~3.5 / 10 ms at 64).
+DENSE_SINGLE_MAX_N = {"highs": 16, "cbc": 24}
+DENSE_STACKED_MAX_N = {"highs": 40, "cbc": 56}
+STACK_MIN = 16  # below this the per-problem cost of a stack is still close to a single solve
+
+
+def large_backend() -> str:
+    return "highs" if BACKENDS["highs"].available() else "cbc"
+
+
+def dense_max_n(batch: int = 1) -> int:
+    cutoffs = DENSE_STACKED_MAX_N if batch >= STACK_MIN else DENSE_SINGLE_MAX_N
+    return min(cutoffs[large_backend()], DENSE_MAX_N)
+
+
+def select_backend(n: int, integer: bool = False, batch: int = 1) -> str:
+    # Small continuous models stay in-process on the dense tableau (no subprocess, no model files);
+    # large or integer models go to HiGHS when SciPy is there, else CBC. batch: problems of this
+    # size solved together (one stacked dense solve), which moves the crossover up.
+    if not integer and n <= dense_max_n(batch):
+        return "dense"
+    return large_backend()
+
+
+def get_backend(name: str, n: int, integer: bool = False) -> Backend:
+    if name == AUTO:
+        name = select_backend(n, integer)
+    backend = BACKENDS.get(name)
+    if backend is None or not backend.available():
+        raise ValueError(f"solver backend not available: {name} (have: {', '.join(available_backends())})")
+    if integer and not backend.integer:
+        raise ValueError(f"solver backend {name} cannot solve integer models")
+    if name == "dense" and n > DENSE_MAX_N:
+        raise ValueError(f"solver backend dense takes at most {DENSE_MAX_N} materials (got {n})")
+    return backend
+
+
+# =========================
+# SOLVE
+# =========================
+def solve_arrays(c, A, sense, rhs, lb, ub, integer=None, backend: str = AUTO, options: SolveOptions | None = None) -> Solution:
+    # The dense backend hands its rare iteration-limit case on to the next backend in line.
+    is_int = integer is not None and bool(np.any(integer))
+    b = get_backend(backend, len(c), is_int)
+    sol = b.solve(c, A, sense, rhs, lb, ub, integer, options)
+    if sol.status == STATUS_NOT_SOLVED and b.name == "dense" and backend == AUTO:
+        sol = BACKENDS[large_backend()].solve(c, A, sense, rhs, lb, ub, integer, options)
+    return sol
+
+
+def solve_problem(p: MixProblem, backend: str = AUTO, options: SolveOptions | None = None, sensitivity: bool = False):
+    # Same (status, res) as lp_core.solve_lp, from whichever backend runs; res["backend"] names it.
+    # sensitivity: res["sensitivity"] from the backend's duals where it reports them (HiGHS, CBC).
+    A, sense, rhs = p.rows()
+    sol = solve_arrays(p.cost, A, sense, rhs, p.lb, p.ub, backend=backend, options=options)
+    if sol.x is None:
+        return sol.status, None
+    with span("extract", backend=sol.backend):
+        res = extract_result(p, sol.x)
+    res["backend"] = sol.backend
+    if sensitivity and sol.duals is not None:
+        with span("sensitivity", backend=sol.backend):
+            res["sensitivity"] = from_duals(p, sol.x, sol.duals, sol.reduced_costs)
+    return sol.status, res
+
+
+def solve_problems(problems: list[MixProblem], backend: str = AUTO, options: SolveOptions | None = None):
+    # Batches: one stacked dense solve when the dense backend is chosen, else one call per problem.
+    if not problems:
+        return []
+    name = select_backend(problems[0].n, batch=len(problems)) if backend == AUTO else get_backend(backend, problems[0].n).name
+    if name != "dense":
+        return [solve_problem(p, name, options) for p in problems]
+    out = []
+    for p, (status, res) in zip(problems, solve_many(problems)):
+        if status == STATUS_NOT_SOLVED and backend == AUTO:
+            status, res = solve_problem(p, large_backend(), options)
+        elif res is not None:
+            res["backend"] = name
+        out.append((status, res))
+    return out
@@ -0,0 +1,219 @@
+# benchmark.py
+# Benchmark harness + synthetic instance generator for the soil mix LP.
+#
+# Times each code path separately (coerce, validate, build, solve, extract) for every solver
+# backend and writes one JSON record per measurement so runs can be compared over time.
+#
+# Run:
+#   python benchmark.py --materials 6 60 600 --batch 100 --out bench.json
+#   python benchmark.py --materials 1000 10000 --batch 1 --backends pulp highs
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from pulp import PULP_CBC_CMD, LpStatus
+
+from backends import BACKENDS as SOLVERS
+from catalog import coerce_numeric, find_issues
+from dense_solver import DENSE_MAX_N, solve_standard, stack_problems
+from lp_core import MODE_CAP, MODE_COST, MixProblem, build_lp, extract_result, problem_from_df
+from metrics import add_log_arg, setup_logging
+
+BACKENDS = ["pulp", "dense", "highs"]
+
+
+# =========================
+# GENERATOR
+# =========================
+def generate_table(n_materials: int, rng=None) -> pd.DataFrame:
+    # Additive table shaped like DEFAULT_TABLE.
+    rng = rng or np.random.default_rng()
+    lb = rng.uniform(0, 2, n_materials).round(2)
+    table = {
+        "material": [f"m{i}" for i in range(n_materials)],
+        "cost": rng.uniform(100, 1500, n_materials).round(0),
+        "LB": lb,
+        "UB": (lb + rng.uniform(1, 15, n_materials)).round(2),
+        "UCS_coef": rng.uniform(0, 30, n_materials).round(2),
+        "PI_coef": rng.uniform(-0.6, 0.05, n_materials).round(3),
+        "W_coef": rng.uniform(-0.6, 0.05, n_materials).round(3),
+    }
+    return pd.DataFrame(table)
+
+
+def generate_problems(table: pd.DataFrame, batch: int, feasible: bool = True, rng=None) -> list[MixProblem]:
+    # Limits are placed around a random mix x0 inside the bounds, so feasible instances are
+    # feasible by construction; infeasible ones ask for more UCS than the bounds can give.
+    rng = rng or np.random.default_rng()
+    base = problem_from_df(table, MODE_COST, 0, 0, 0, 0, 50.0, 10.0, 30.0)
+    out = []
+    for _ in range(batch):
+        # Random mix inside the bounds, pulled towards LB by a random factor.
+        x0 = base.lb + rng.uniform(0, 1, base.n) * (base.ub - base.lb) * rng.uniform(0, 1)
+        props = base.base + base.coef @ x0
+        slack = rng.uniform(0, 5, 4)
+        mode = MODE_COST if rng.random() < 0.7 else MODE_CAP
+        if not feasible:
+            ucs = base.base[0] + np.maximum(base.coef[0] * base.ub, base.coef[0] * base.lb).sum() + 1.0
+            mode = MODE_COST
+        elif mode == MODE_COST:
+            ucs = props[0] - slack[1]
+        else:
+            ucs = props[0] + slack[1]
+        out.append(
+            MixProblem(
+                materials=base.materials,
+                cost=base.cost,
+                lb=base.lb,
+                ub=base.ub,
+                coef=base.coef,
+                base=base.base,
+                additive_cap=float(x0.sum() + slack[0]),
+                ucs_limit=float(ucs),
+                pi_max=float(props[1] + slack[2]),
+                w_max=float(props[2] + slack[3]),
+                mode=mode,
+            )
+        )
+    return out
+
+
+# =========================
+# TIMING
+# =========================
+def _timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t
+
+
+def bench_case(n_materials: int, batch: int, feasible: bool, backends: list[str], seed: int,
+               pulp_max: int = 20) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    table = generate_table(n_materials, rng)
+    problems = generate_problems(table, batch, feasible, rng)
+    case = {"materials": n_materials, "batch": batch, "feasible": feasible}
+    records = []
+
+    def record(phase, backend, seconds, items, **extra):
+        records.append({**case, "phase": phase, "backend": backend, "seconds": seconds,
+                        "per_item_us": seconds / max(items, 1) * 1e6, **extra})
+
+    coerced, dt = _timed(coerce_numeric, table)
+    record("coerce_numeric", "-", dt, 1)
+    _, dt = _timed(find_issues, coerced)
+    record("validate_df", "-", dt, 1)
+
+    results = {}
+    if "pulp" in backends:
+        # CBC runs one process per solve, so only the first pulp_max problems are timed.
+        subset = problems[:pulp_max]
+        build = solve = extract = 0.0
+        objs = []
+        for p in subset:
+            (prob, x), dt = _timed(build_lp, p)
+            build += dt
+            _, dt = _timed(prob.solve, PULP_CBC_CMD(msg=False))
+            solve += dt
+            status = LpStatus.get(prob.status, str(prob.status))
+            if status == "Optimal":
+                res, dt = _timed(extract_result, p, np.array([v.varValue for v in x], dtype=float))
+                extract += dt
+                objs.append(res["total_cost"])
+            else:
+                objs.append(None)
+        record("build", "pulp", build, len(subset))
+        record("solve", "pulp", solve, len(subset))
+        record("extract", "pulp", extract, len(subset))
+        results["pulp"] = objs
+
+    # The dense tableau is only used up to DENSE_MAX_N materials (see dense_solver).
+    if "dense" in backends and n_materials <= DENSE_MAX_N:
+        sf, dt = _timed(stack_problems, problems)
+        record("build", "dense", dt, batch)
+        out, dt = _timed(solve_standard, sf)
+        record("solve", "dense", dt, batch, iterations_mean=float(out.iterations.mean()))
+        ok = out.status == "Optimal"
+        res, dt = _timed(lambda: [extract_result(p, xv) if o else None for p, xv, o in zip(problems, out.x, ok)])
+        record("extract", "dense", dt, batch)
+        results["dense"] = [r["total_cost"] if r else None for r in res]
+
+    if "highs" in backends and SOLVERS["highs"].available():
+        # In-process like dense, but one solve per problem (build: the row arrays it is handed).
+        rows, dt = _timed(lambda: [p.rows() for p in problems])
+        record("build", "highs", dt, batch)
+        SOLVERS["highs"].solve(problems[0].cost, *rows[0], problems[0].lb, problems[0].ub)  # untimed: imports SciPy
+        t = time.perf_counter()
+        sols = [SOLVERS["highs"].solve(p.cost, A, sense, rhs, p.lb, p.ub) for p, (A, sense, rhs) in zip(problems, rows)]
+        record("solve", "highs", time.perf_counter() - t, batch)
+        res, dt = _timed(lambda: [extract_result(p, s.x) if s.x is not None else None for p, s in zip(problems, sols)])
+        record("extract", "highs", dt, batch)
+        results["highs"] = [r["total_cost"] if r else None for r in res]
+
+    # Status and objective agreement of every backend with the first one, on the problems both solved.
+    names = list(results)
+    for other in names[1:]:
+        pairs = list(zip(results[names[0]], results[other]))
+        bad = sum(
+            (a is None) != (b is None) or (a is not None and abs(a - b) > 1e-6 * max(1.0, abs(a)))
+            for a, b in pairs
+        )
+        records.append({**case, "phase": "agreement", "backend": f"{names[0]}/{other}", "compared": len(pairs), "mismatches": int(bad)})
+    return records
+
+
+# =========================
+# CLI
+# =========================
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the soil mix LP code paths.")
+    ap.add_argument("--materials", type=int, nargs="+", default=[6, 30, 60])
+    ap.add_argument("--batch", type=int, default=100)
+    ap.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    ap.add_argument("--pulp-max", type=int, default=20, help="problems per case timed with CBC")
+    ap.add_argument("--infeasible", action="store_true", help="also time infeasible instances")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="JSON file to write ({meta, records})")
+    add_log_arg(ap)
+    args = ap.parse_args(argv)
+    setup_logging(args.log_level)
+
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+    }
+    records = []
+    for n in args.materials:
+        for feasible in [True, False] if args.infeasible else [True]:
+            records += bench_case(n, args.batch, feasible, args.backends, args.seed, args.pulp_max)
+
+    table = pd.DataFrame(records)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.6g}"))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "records": records}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# bulk.py
+# Bulk mix design: one LP per lab soil sample against a shared additive table (headless).
+#
+# Every sample row carries its own base properties (base_ucs, base_pi, base_w); the additive
+# table, mode and limits are shared. Base values only shift the rhs of the UCS/PI/W rows, so a
+# chunk of samples is one batched dense solve over the same A with a (k, 4) rhs.
+# The samples file is read in chunks with at most 2 × workers chunks in flight, and results are
+# appended to the output CSV as they complete. Re-running with the same --out skips sample ids
+# that are already written.
+#
+# Run:
+#   python bulk.py --samples samples.csv --table additives.csv --out mixes.csv
+#   python bulk.py --samples samples.csv --param ucs_limit=300 --param pi_max=12 --out mixes.csv
+
+import argparse
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from backends import large_backend, select_backend, solve_arrays
+from catalog import read_table
+from dense_solver import STATUS_NOT_SOLVED, solve_batch
+from lp_core import DEFAULT_PARAMS, DEFAULT_TABLE, PROPS, MixProblem, problem_from_df
+from metrics import add_log_arg, setup_logging, span
+from sweep import RESULT_COLS, done_ids, parse_grid, run_pool
+
+ID_COL = "sample_id"
+SAMPLE_COLS = ["base_ucs", "base_pi", "base_w"]
+
+
+# =========================
+# SOLVE
+# =========================
+def solve_samples(p: MixProblem, bases) -> pd.DataFrame:
+    # bases: (k, 3) base UCS/PI/W per sample; everything else comes from p.
+    # One row per sample: RESULT_COLS + x_<material>. Samples with a missing base value stay unsolved.
+    bases = np.atleast_2d(np.asarray(bases, dtype=float))
+    k = len(bases)
+    A, sense, rhs = p.rows()
+    rhs_k = np.repeat(rhs[None], k, axis=0)
+    rhs_k[:, 1:] -= bases - p.base
+
+    status = np.full(k, STATUS_NOT_SOLVED, dtype=object)
+    X = np.full((k, p.n), np.nan)
+    idx = np.flatnonzero(~np.isnan(bases).any(axis=1))
+    dense = select_backend(p.n, batch=len(idx)) == "dense"
+    if dense and len(idx):
+        with span("solve", backend="dense", materials=p.n, problems=len(idx)) as s:
+            out = solve_batch(p.cost, A, sense, rhs_k[idx], p.lb, p.ub)
+            s["iterations"] = int(out.iterations.sum())
+        status[idx] = out.status
+        X[idx] = out.x
+        idx = idx[out.status == STATUS_NOT_SOLVED]
+    # Large catalogs, and the rare dense iteration-limit case, go to HiGHS (or CBC) one sample at a time.
+    large = large_backend()
+    for i in idx:
+        sol = solve_arrays(p.cost, A, sense, rhs_k[i], p.lb, p.ub, backend=large)
+        status[i] = sol.status
+        if sol.x is not None:
+            X[i] = sol.x
+
+    with span("extract", backend="dense" if dense else large, problems=k):
+        props = bases + X @ p.coef.T
+        add_used = X.sum(axis=1)
+        res = pd.DataFrame({"status": status, "total_cost": X @ p.cost, "add_used": add_used})
+        res[PROPS] = props
+        res[[f"x_{m}" for m in p.materials]] = X
+    return res
+
+
+# =========================
+# SAMPLE SOURCE
+# =========================
+def iter_samples(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    # Streams the samples file; sample id = the sample_id column, or the data row index without one.
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype={ID_COL: str}):
+        missing = [c for c in SAMPLE_COLS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Samples file is missing columns: {', '.join(missing)}")
+        if ID_COL not in chunk.columns:
+            chunk[ID_COL] = chunk.index.astype(str)
+        chunk[SAMPLE_COLS] = chunk[SAMPLE_COLS].apply(pd.to_numeric, errors="coerce")
+        yield chunk[[ID_COL] + SAMPLE_COLS].reset_index(drop=True)
+
+
+# =========================
+# WORKER
+# =========================
+_BASE = None
+
+
+def _init_worker(table: dict, params: dict):
+    global _BASE
+    _BASE = problem_from_df(pd.DataFrame(table), **params)
+
+
+def _solve_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    res = solve_samples(_BASE, chunk[SAMPLE_COLS].to_numpy())
+    res.index = chunk.index
+    return pd.concat([chunk, res], axis=1)
+
+
+# =========================
+# RUN
+# =========================
+def run_bulk(
+    samples: Iterator[pd.DataFrame],
+    out_path: str,
+    table: dict | None = None,
+    params: dict | None = None,
+    workers: int | None = None,
+) -> int:
+    table = table or DEFAULT_TABLE
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    columns = [ID_COL] + SAMPLE_COLS + RESULT_COLS + [f"x_{m}" for m in table["material"]]
+
+    skip = done_ids(out_path, ID_COL, str)
+
+    def todo():
+        for chunk in samples:
+            if skip:
+                chunk = chunk[~chunk[ID_COL].isin(skip)]
+            if not chunk.empty:
+                yield chunk
+
+    def write(f, rows: pd.DataFrame) -> int:
+        rows.to_csv(f, header=False, index=False, columns=columns)
+        return len(rows)
+
+    return run_pool(todo(), _solve_chunk, write, out_path, columns, workers, _init_worker, (table, params))
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Solve the soil mix LP once per lab sample.")
+    ap.add_argument("--samples", required=True, metavar="CSV",
+                    help=f"one sample per row with columns {', '.join(SAMPLE_COLS)} (and optionally {ID_COL})")
+    ap.add_argument("--table", metavar="FILE", help="additive table, CSV or Parquet (default: built-in table)")
+    ap.add_argument("--param", action="append", metavar="NAME=VALUE",
+                    help="shared limit or mode for every sample, e.g. ucs_limit=300 (repeatable)")
+    ap.add_argument("--out", required=True, help="results CSV (appended to; existing sample ids are skipped)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk-size", type=int, default=256)
+    add_log_arg(ap)
+    args = ap.parse_args(argv)
+    setup_logging(args.log_level)
+
+    params = {name: values[0] for name, values in parse_grid(args.param or []).items()}
+    try:
+        table = read_table(args.table).to_dict("list") if args.table else None
+    except ValueError as e:
+        ap.error(str(e))
+    n = run_bulk(iter_samples(args.samples, args.chunk_size), args.out, table=table, params=params, workers=args.workers)
+    print(f"{n} samples solved -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# catalog.py
+# Additive catalog ingestion and validation (headless, columnar).
+#
+# Catalogs may be CSV or Parquet and may carry extra property columns; only REQUIRED_COLS feed
+# the model. Validation checks whole columns at once and lists every bad row, not just the first.
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from lp_core import NUMERIC_COLS, REQUIRED_COLS
+
+ISSUE_MISSING_COL = "missing_column"
+ISSUE_NAN = "nan"
+ISSUE_INF = "non_finite"
+ISSUE_LBUB = "lb_gt_ub"
+ISSUE_DUP = "duplicate"
+
+
+def load_catalog(source, name: str | None = None) -> pd.DataFrame:
+    # source: path or file-like (e.g. a Streamlit upload); name decides the format when source has none.
+    name = name or (source if isinstance(source, str) else getattr(source, "name", ""))
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext in (".parquet", ".pq"):
+        # Needs pyarrow or fastparquet; pandas raises an ImportError naming them otherwise.
+        df = pd.read_parquet(source)
+    else:
+        df = pd.read_csv(source)
+    df.columns = [str(c).strip() for c in df.columns]
+    # Integer columns become float so edited cells can hold decimals.
+    ints = [c for c in NUMERIC_COLS if c in df.columns and pd.api.types.is_integer_dtype(df[c])]
+    df[ints] = df[ints].astype(float)
+    return df.reset_index(drop=True)
+
+
+def catalog_fingerprint(df: pd.DataFrame) -> str:
+    # Content hash of every cell, index and column name (vectorized; no sampling of large tables).
+    h = hashlib.sha256("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    # A missing material column is left for find_issues to report.
+    if "material" in out.columns:
+        out["material"] = out["material"].astype(str)
+    cols = [c for c in NUMERIC_COLS if c in out.columns]
+    out[cols] = out[cols].apply(pd.to_numeric, errors="coerce")
+    return out
+
+
+def find_issues(df: pd.DataFrame) -> pd.DataFrame:
+    # One row per problem: row index (as in df), material, column, issue code.
+    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    if missing:
+        return pd.DataFrame(
+            {"row": -1, "material": "", "column": missing, "issue": ISSUE_MISSING_COL}
+        )
+
+    parts = []
+    nan = df[NUMERIC_COLS].isna().to_numpy()
+    r, c = np.nonzero(nan)
+    parts.append(pd.DataFrame({"row": df.index[r], "column": np.array(NUMERIC_COLS)[c], "issue": ISSUE_NAN}))
+
+    # "inf" in a CSV parses as a number; CBC rejects infinite bounds and costs turn into NaN.
+    r, c = np.nonzero(np.isinf(df[NUMERIC_COLS].to_numpy(dtype=float, na_value=np.nan)))
+    parts.append(pd.DataFrame({"row": df.index[r], "column": np.array(NUMERIC_COLS)[c], "issue": ISSUE_INF}))
+
+    bad = np.flatnonzero((df["LB"] > df["UB"]).to_numpy())
+    parts.append(pd.DataFrame({"row": df.index[bad], "column": "LB/UB", "issue": ISSUE_LBUB}))
+
+    dup = np.flatnonzero(df["material"].duplicated(keep=False).to_numpy())
+    parts.append(pd.DataFrame({"row": df.index[dup], "column": "material", "issue": ISSUE_DUP}))
+
+    issues = pd.concat(parts, ignore_index=True)
+    issues.insert(1, "material", df["material"].reindex(issues["row"]).to_numpy())
+    return issues.sort_values(["row", "issue"], kind="stable").reset_index(drop=True)
+
+
+def describe_issues(issues: pd.DataFrame) -> str:
+    first = issues.iloc[0]
+    return f"{len(issues)} issue(s), first: {first['issue']} in {first['column']} (row {first['row']})"
+
+
+def read_table(path: str) -> pd.DataFrame:
+    # --table of the CLIs: load (CSV or Parquet), coerce and validate; raises ValueError on any issue.
+    df = coerce_numeric(load_catalog(path))
+    issues = find_issues(df)
+    if not issues.empty:
+        raise ValueError(f"bad table {path}: {describe_issues(issues)}")
+    return df
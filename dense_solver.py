@@ -0,0 +1,321 @@
+# dense_solver.py
+# In-process batched LP solver for small dense models shaped like the soil mix LP.
+#
+# Solves many problems at once over stacked NumPy arrays (no MPS/LP files, no CBC process):
+#   min c·x   s.t.  A x (sense) rhs,  lb <= x <= ub
+# Method: two-phase tableau simplex with Bland's rule, vectorized over the batch axis.
+# Bounds become rows (x = lb + z, z <= ub - lb), which is cheap while n is small.
+#
+# Status strings match PuLP's LpStatus values so callers can treat both paths the same.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from lp_core import SENSE_GE, MixProblem, extract_result
+from metrics import span
+
+STATUS_OPTIMAL = "Optimal"
+STATUS_INFEASIBLE = "Infeasible"
+STATUS_UNBOUNDED = "Unbounded"
+STATUS_NOT_SOLVED = "Not Solved"
+
+TOL = 1e-9
+FEAS_TOL = 1e-7
+
+# The tableau grows as n², so larger catalogs go to the sparse PuLP/CBC model instead.
+DENSE_MAX_N = 64
+
+
+@dataclass
+class StandardForm:
+    # Batch of  [M I] [z; s] = b,  z, s >= 0  with x = lb + z (rows: general rows, then bound rows).
+    M: np.ndarray      # (B, R, n)
+    b: np.ndarray      # (B, R)
+    c: np.ndarray      # (B, n)
+    lb: np.ndarray     # (B, n)
+    row_sign: np.ndarray  # (B, m): +1 if the general row was already <=, -1 if it was a >= row
+    obj_offset: np.ndarray  # (B,) c·lb
+
+
+@dataclass
+class DenseResult:
+    status: np.ndarray      # (B,) str
+    x: np.ndarray           # (B, n), NaN where not optimal
+    objective: np.ndarray   # (B,)
+    basis: np.ndarray       # (B, R) column index per row (z: <n, slack: n..n+R, artificial: >= n+R)
+    iterations: np.ndarray  # (B,)
+
+
+# =========================
+# STANDARD FORM
+# =========================
+def standard_form(c, A, sense, rhs, lb, ub) -> StandardForm:
+    lb = np.atleast_2d(np.asarray(lb, dtype=float))
+    ub = np.atleast_2d(np.asarray(ub, dtype=float))
+    c = np.atleast_2d(np.asarray(c, dtype=float))
+    A = np.asarray(A, dtype=float)
+    if A.ndim == 2:
+        A = A[None]
+    rhs = np.atleast_2d(np.asarray(rhs, dtype=float))
+    sense = np.atleast_2d(np.asarray(sense))
+
+    B = max(len(lb), len(ub), len(c), len(A), len(rhs), len(sense))
+    m, n = A.shape[1:]
+    lb, ub, c, rhs = (np.broadcast_to(a, (B, a.shape[1])) for a in (lb, ub, c, rhs))
+    A = np.broadcast_to(A, (B, m, n))
+    sense = np.broadcast_to(sense, (B, m))
+
+    # >= rows are negated so every row reads G z <= h.
+    g = np.where(sense == SENSE_GE, -1.0, 1.0)
+    h = rhs - np.einsum("bmn,bn->bm", A, lb)
+    M = np.concatenate([g[:, :, None] * A, np.broadcast_to(np.eye(n), (B, n, n))], axis=1)
+    b = np.concatenate([g * h, ub - lb], axis=1)
+    return StandardForm(M=M, b=b, c=np.array(c), lb=np.array(lb), row_sign=g, obj_offset=np.einsum("bn,bn->b", c, lb))
+
+
+# =========================
+# SIMPLEX
+# =========================
+def _pivot(T: np.ndarray, basis: np.ndarray, k: np.ndarray, r: np.ndarray, e: np.ndarray):
+    # k is sorted (flatnonzero), so a full batch is updated in place instead of gathered and scattered.
+    full = len(k) == len(T)
+    Tk = T if full else T[k]
+    piv = Tk[np.arange(len(k)), r, :] / Tk[np.arange(len(k)), r, e][:, None]
+    col = Tk[np.arange(len(k)), :, e]
+    Tk -= col[:, :, None] * piv[:, None, :]
+    Tk[np.arange(len(k)), r, :] = piv
+    if not full:
+        T[k] = Tk
+    basis[k, r] = e
+
+
+def _simplex(T, basis, allowed, active, iters, max_iter) -> np.ndarray:
+    # Runs Bland-rule iterations on the problems in `active`; returns a per-problem "unbounded" flag.
+    R = T.shape[1] - 1
+    N = T.shape[2] - 1
+    unbounded = np.zeros(len(T), dtype=bool)
+    active = active.copy()
+    while active.any():
+        k = np.flatnonzero(active & (iters < max_iter))
+        if len(k) == 0:
+            break
+
+        d = T[k, R, :N]
+        cand = (d < -TOL) & allowed
+        has = cand.any(axis=1)
+        active[k[~has]] = False
+        k, cand = k[has], cand[has]
+        if len(k) == 0:
+            break
+        e = cand.argmax(axis=1)  # lowest index with negative reduced cost
+
+        col = T[k, :R, e]
+        rhs = T[k, :R, N]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(col > TOL, rhs / col, np.inf)
+        rmin = ratio.min(axis=1)
+        nobound = ~np.isfinite(rmin)
+        unbounded[k[nobound]] = True
+        active[k[nobound]] = False
+        k, e, ratio, rmin = k[~nobound], e[~nobound], ratio[~nobound], rmin[~nobound]
+        if len(k) == 0:
+            break
+
+        # Ties broken by the smallest basic variable index (Bland).
+        tie = ratio <= rmin[:, None] + TOL * (1.0 + np.abs(rmin[:, None]))
+        r = np.where(tie, basis[k], np.iinfo(basis.dtype).max).argmin(axis=1)
+        _pivot(T, basis, k, r, e)
+        iters[k] += 1
+    return unbounded
+
+
+def _dual_simplex(T, basis, allowed, active, iters, max_iter) -> np.ndarray:
+    # Dual simplex from a dual-feasible basis; returns a per-problem "primal infeasible" flag.
+    R = T.shape[1] - 1
+    N = T.shape[2] - 1
+    infeasible = np.zeros(len(T), dtype=bool)
+    active = active.copy()
+    while active.any():
+        k = np.flatnonzero(active & (iters < max_iter))
+        if len(k) == 0:
+            break
+
+        neg = T[k, :R, N] < -FEAS_TOL
+        has = neg.any(axis=1)
+        active[k[~has]] = False
+        k, neg = k[has], neg[has]
+        if len(k) == 0:
+            break
+        r = np.where(neg, basis[k], np.iinfo(basis.dtype).max).argmin(axis=1)
+
+        row = T[k, r, :N]
+        cand = (row < -TOL) & allowed
+        none = ~cand.any(axis=1)
+        infeasible[k[none]] = True
+        active[k[none]] = False
+        k, r, row, cand = k[~none], r[~none], row[~none], cand[~none]
+        if len(k) == 0:
+            break
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(cand, T[k, R, :N] / -row, np.inf)
+        _pivot(T, basis, k, r, ratio.argmin(axis=1))
+        iters[k] += 1
+    return infeasible
+
+
+def _phase2_objective(T, basis, c):
+    Bn, R1, N1 = T.shape
+    R, N = R1 - 1, N1 - 1
+    n = c.shape[1]
+    c_full = np.zeros((Bn, N))
+    c_full[:, :n] = c
+    c_B = np.take_along_axis(c_full, basis, axis=1)
+    T[:, R, :N] = c_full - np.einsum("br,brj->bj", c_B, T[:, :R, :N])
+    T[:, R, N] = -np.einsum("br,br->b", c_B, T[:, :R, N])
+
+
+def _result(sf, T, basis, iters, infeasible, unbounded, max_iter) -> DenseResult:
+    Bn, R, n = sf.M.shape
+    N = n + 2 * R
+    limit = (iters >= max_iter) & ~infeasible & ~unbounded
+    status = np.full(Bn, STATUS_OPTIMAL, dtype=object)
+    status[infeasible] = STATUS_INFEASIBLE
+    status[unbounded] = STATUS_UNBOUNDED
+    status[limit] = STATUS_NOT_SOLVED
+
+    z = np.zeros((Bn, N))
+    np.put_along_axis(z, basis, T[:, :R, N], axis=1)
+    x = sf.lb + z[:, :n]
+    objective = np.einsum("bn,bn->b", sf.c, x)
+    bad = status != STATUS_OPTIMAL
+    x[bad] = np.nan
+    objective[bad] = np.nan
+    return DenseResult(status=status, x=x, objective=objective, basis=basis, iterations=iters)
+
+
+def _solve_cold(sf: StandardForm, max_iter: int) -> DenseResult:
+    Bn, R, n = sf.M.shape
+    N = n + 2 * R
+
+    # Rows with negative rhs are flipped and start on their artificial; others start on their slack.
+    f = np.where(sf.b < 0, -1.0, 1.0)
+    T = np.zeros((Bn, R + 1, N + 1))
+    T[:, :R, :n] = f[:, :, None] * sf.M
+    T[:, :R, n:n + R] = f[:, :, None] * np.eye(R)
+    T[:, :R, n + R:N] = np.eye(R)
+    T[:, :R, N] = f * sf.b
+    basis = np.where(f > 0, n + np.arange(R), n + R + np.arange(R))
+    iters = np.zeros(Bn, dtype=int)
+    allowed = np.arange(N) < n + R  # artificials never re-enter
+
+    # Phase 1: minimize the sum of artificials that start in the basis.
+    art = f < 0
+    T[:, R, :] = -np.einsum("br,brj->bj", art.astype(float), T[:, :R, :])
+    T[:, R, n + R:N] += art
+    _simplex(T, basis, allowed, art.any(axis=1), iters, max_iter)
+    # Only a finished phase 1 proves infeasibility; one cut off by max_iter ends as Not Solved.
+    infeasible = (-T[:, R, N] > FEAS_TOL * (1.0 + np.abs(sf.b).max(axis=1))) & (iters < max_iter)
+
+    # Drive zero-level artificials out of the basis where the row allows it.
+    for r in range(R):
+        k = np.flatnonzero((basis[:, r] >= n + R) & ~infeasible)
+        if len(k) == 0:
+            continue
+        row = np.abs(T[k, r, :n + R]) > TOL
+        ok = row.any(axis=1)
+        if ok.any():
+            _pivot(T, basis, k[ok], np.full(ok.sum(), r), row[ok].argmax(axis=1))
+
+    # Phase 2: original costs (slacks and artificials cost 0).
+    _phase2_objective(T, basis, sf.c)
+    unbounded = _simplex(T, basis, allowed, ~infeasible, iters, max_iter)
+    return _result(sf, T, basis, iters, infeasible, unbounded, max_iter)
+
+
+def _take(sf: StandardForm, idx: np.ndarray) -> StandardForm:
+    return StandardForm(
+        M=sf.M[idx], b=sf.b[idx], c=sf.c[idx], lb=sf.lb[idx], row_sign=sf.row_sign[idx], obj_offset=sf.obj_offset[idx]
+    )
+
+
+def _solve_warm(sf: StandardForm, basis: np.ndarray, max_iter: int) -> DenseResult:
+    # Starts from a previous optimal basis: no pivots if it is still optimal, dual simplex after
+    # RHS changes, primal phase 2 after cost changes. Anything else falls back to a cold solve.
+    Bn, R, n = sf.M.shape
+    N = n + 2 * R
+    K = np.concatenate([sf.M, np.broadcast_to(np.eye(R), (Bn, R, R))], axis=2)
+    basis = np.where(basis >= n + R, basis - R, basis)  # leftover artificials -> their row's slack
+    Bm = np.take_along_axis(K, basis[:, None, :], axis=2)
+    ok = np.linalg.cond(Bm) < 1e12
+    Bm[~ok] = np.eye(R)
+    Binv = np.linalg.inv(Bm)
+
+    T = np.zeros((Bn, R + 1, N + 1))
+    T[:, :R, :n + R] = Binv @ K
+    T[:, :R, N] = np.einsum("brs,bs->br", Binv, sf.b)
+    _phase2_objective(T, basis, sf.c)
+    iters = np.zeros(Bn, dtype=int)
+    allowed = np.arange(N) < n + R
+
+    primal_ok = (T[:, :R, N] >= -FEAS_TOL).all(axis=1)
+    dual_ok = ((T[:, R, :N] >= -TOL) | ~allowed).all(axis=1)
+    use_dual = ok & ~primal_ok & dual_ok
+    infeasible = _dual_simplex(T, basis, allowed, use_dual, iters, max_iter)
+    warm = ok & (primal_ok | use_dual)
+    unbounded = _simplex(T, basis, allowed, warm & ~infeasible, iters, max_iter)
+    out = _result(sf, T, basis, iters, infeasible, unbounded, max_iter)
+
+    cold = np.flatnonzero(~warm)
+    if len(cold):
+        rest = _solve_cold(_take(sf, cold), max_iter)
+        for field in ("status", "x", "objective", "basis", "iterations"):
+            getattr(out, field)[cold] = getattr(rest, field)
+    return out
+
+
+def solve_standard(sf: StandardForm, max_iter: int | None = None, basis: np.ndarray | None = None) -> DenseResult:
+    # basis: optional (B, R) warm start, e.g. DenseResult.basis from an earlier solve of the same shape.
+    Bn, R, n = sf.M.shape
+    max_iter = max_iter or 50 * (R + n)
+    if basis is None:
+        return _solve_cold(sf, max_iter)
+    return _solve_warm(sf, np.array(np.broadcast_to(basis, (Bn, R))), max_iter)
+
+
+def solve_batch(c, A, sense, rhs, lb, ub, max_iter: int | None = None) -> DenseResult:
+    # Any argument may carry a leading batch axis; the others are broadcast.
+    return solve_standard(standard_form(c, A, sense, rhs, lb, ub), max_iter=max_iter)
+
+
+# =========================
+# SOIL MIX PROBLEMS
+# =========================
+def stack_problems(problems: list[MixProblem]) -> StandardForm:
+    rows = [p.rows() for p in problems]
+    return standard_form(
+        c=np.stack([p.cost for p in problems]),
+        A=np.stack([r[0] for r in rows]),
+        sense=np.stack([r[1] for r in rows]),
+        rhs=np.stack([r[2] for r in rows]),
+        lb=np.stack([p.lb for p in problems]),
+        ub=np.stack([p.ub for p in problems]),
+    )
+
+
+def solve_many(problems: list[MixProblem]) -> list[tuple[str, dict | None]]:
+    # Same (status, res) pairs as lp_core.solve_lp, for a whole list of problems in one call.
+    # Problems must share the material count; the table itself may differ per problem.
+    if not problems:
+        return []
+    with span("build", backend="dense", materials=problems[0].n, problems=len(problems)):
+        sf = stack_problems(problems)
+    with span("solve", backend="dense", materials=problems[0].n) as s:
+        out = solve_standard(sf)
+        s["iterations"] = int(out.iterations.sum())
+    with span("extract", backend="dense"):
+        return [
+            (s, extract_result(p, xv) if s == STATUS_OPTIMAL else None)
+            for p, s, xv in zip(problems, out.status.tolist(), out.x)
+        ]
@@ -0,0 +1,117 @@
+# frontier.py
+# Exact minimum-cost vs UCS-target frontier by parametric RHS on the UCS row.
+#
+# Cost mode (UCS >= t) is solved once at the low end; then t is pushed up along the optimal basis
+# until a basic variable hits zero (a breakpoint) and one dual simplex pivot gives the next basis.
+# Between breakpoints the cost is linear in t, so the breakpoint list is the whole curve.
+
+from dataclasses import replace
+
+import numpy as np
+
+from dense_solver import STATUS_OPTIMAL, solve_standard, stack_problems
+from lp_core import MODE_COST, ROW_NAMES, MixProblem
+from sensitivity import basis_matrix
+
+TOL = 1e-9
+
+
+def _labels(j: int, p: MixProblem, m: int) -> tuple[str, str]:
+    # (text when column j enters the basis, text when it leaves)
+    n = p.n
+    if j < n:
+        return f"{p.materials[j]} leaves LB", f"{p.materials[j]} drops to LB"
+    if j < n + m:
+        row = ROW_NAMES[j - n]
+        return f"{row} becomes slack", f"{row} becomes binding"
+    mat = p.materials[j - n - m]
+    return f"{mat} leaves UB", f"{mat} reaches UB"
+
+
+def _point(points: list[dict], p: MixProblem, t: float, z: np.ndarray, slope: float):
+    # A repeated t (degenerate pivot) keeps the point and only updates the slope to its right.
+    if points and t - points[-1]["UCS"] <= TOL:
+        points[-1]["slope"] = slope
+        return
+    xv = p.lb + z[:p.n]
+    points.append(
+        {
+            "UCS": float(t),
+            "total_cost": float(p.cost @ xv),
+            "slope": slope,
+            "entering": [],
+            "leaving": [],
+            "solution": dict(zip(p.materials, xv.tolist())),
+        }
+    )
+
+
+def cost_ucs_frontier(
+    p: MixProblem,
+    t_min: float | None = None,
+    t_max: float | None = None,
+    max_pivots: int = 1000,
+) -> list[dict]:
+    # Breakpoints of min cost(t) for UCS >= t, from t_min (default: lowest reachable UCS) up to
+    # t_max (default: until infeasible). "slope" is d cost / d t on the segment to the right.
+    p = replace(p, mode=MODE_COST)
+    if t_min is None:
+        t_min = p.base[0] + np.minimum(p.coef[0] * p.lb, p.coef[0] * p.ub).sum()
+    t = float(t_min)
+    t_max = np.inf if t_max is None else float(t_max)
+
+    sf = stack_problems([replace(p, ucs_limit=t)])
+    out = solve_standard(sf)
+    if out.status[0] != STATUS_OPTIMAL:
+        return []
+
+    M, b0 = sf.M[0], sf.b[0]
+    R, n = M.shape
+    m = sf.row_sign.shape[1]
+    db = stack_problems([replace(p, ucs_limit=t + 1.0)]).b[0] - b0  # d b / d t
+    K = np.hstack([M, np.eye(R)])
+    c_full = np.concatenate([p.cost, np.zeros(R)])
+    _, cols = basis_matrix(K, out.basis[0], n)
+
+    points = []
+    t0 = t
+    for _ in range(max_pivots):
+        Binv = np.linalg.inv(K[:, cols])
+        y = Binv.T @ c_full[cols]
+        xB = Binv @ (b0 + (t - t0) * db)
+        dx = Binv @ db
+        slope = float(y @ db)
+        z = np.zeros(n + R)
+        z[cols] = xB
+        _point(points, p, t, z, slope)
+
+        # Step along the current basis until a basic variable hits zero.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            steps = np.where(dx < -TOL, np.maximum(xB, 0.0) / -dx, np.inf)
+        r = int(np.argmin(steps))
+        step = float(steps[r])
+        if t + step >= t_max:
+            if np.isfinite(t_max) and t_max > t:
+                z[cols] = xB + (t_max - t) * dx
+                _point(points, p, t_max, z, slope)
+            break
+        t += step
+        z[cols] = xB + step * dx
+        _point(points, p, t, z, slope)
+
+        # Dual simplex pivot: row r leaves; the entering column keeps all reduced costs >= 0.
+        alpha = Binv[r] @ K
+        d = c_full - K.T @ y
+        cand = alpha < -TOL
+        cand[cols] = False
+        if not cand.any():
+            points[-1]["slope"] = float("nan")  # UCS cannot go higher: infeasible beyond t
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = int(np.argmin(np.where(cand, d / -alpha, np.inf)))
+        points[-1]["entering"].append(_labels(k, p, m)[0])
+        points[-1]["leaving"].append(_labels(int(cols[r]), p, m)[1])
+        cols = cols.copy()
+        cols[r] = k
+
+    return points
@@ -0,0 +1,282 @@
+# history.py
+# Append-only run history in SQLite (stdlib only): every solve the app makes is one row.
+#
+#   runs     one row per run: time, input hash (result_cache.problem_key), material set, mode,
+#            kind (lp / robust / mip), backend, status, cost / additive use / UCS / PI / W and
+#            solve seconds as columns; parameters, full result and per-phase timings as JSON
+#   tables   additive tables by content hash, stored once however many runs use them
+#
+# Indexes on (input_hash, id), (material_set, id), (mode, id) and created_at. Dates become an id
+# range first (ids only grow, like the timestamps), so every listing is one index range scan.
+# Pages are keyset-paginated on id (id < cursor): page k costs what page 1 costs at millions of
+# rows, and the JSON columns are only read when a single run is opened. Triggers reject UPDATE
+# and DELETE on runs.
+#
+# Run:
+#   python history.py --db soil_lp_history.sqlite --mode cost --limit 20
+#   python history.py --db soil_lp_history.sqlite --show 42
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from lp_core import MixProblem
+from result_cache import problem_key
+
+DEFAULT_PATH = "soil_lp_history.sqlite"
+PAGE_SIZE = 50
+KIND_LP = "lp"
+KIND_ROBUST = "robust"
+KIND_MIP = "mip"
+
+SUMMARY_COLS = [
+    "id", "created_at", "kind", "mode", "materials", "backend", "status",
+    "total_cost", "add_used", "UCS", "PI", "W", "seconds", "input_hash",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tables (
+    table_hash TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    input_hash TEXT NOT NULL,
+    material_set TEXT NOT NULL,
+    table_hash TEXT NOT NULL REFERENCES tables(table_hash),
+    kind TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    materials INTEGER NOT NULL,
+    backend TEXT,
+    status TEXT NOT NULL,
+    total_cost REAL,
+    add_used REAL,
+    UCS REAL,
+    PI REAL,
+    W REAL,
+    seconds REAL,
+    params TEXT NOT NULL,
+    result TEXT,
+    timings TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_input ON runs(input_hash, id);
+CREATE INDEX IF NOT EXISTS runs_material_set ON runs(material_set, id);
+CREATE INDEX IF NOT EXISTS runs_mode ON runs(mode, id);
+CREATE INDEX IF NOT EXISTS runs_created ON runs(created_at);
+CREATE TRIGGER IF NOT EXISTS runs_no_update BEFORE UPDATE ON runs
+BEGIN SELECT RAISE(ABORT, 'run history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS runs_no_delete BEFORE DELETE ON runs
+BEGIN SELECT RAISE(ABORT, 'run history is append-only'); END;
+"""
+
+
+def material_set_key(materials) -> str:
+    # Same additives in any order -> same key.
+    return hashlib.sha256("\x1f".join(sorted(materials)).encode("utf-8")).hexdigest()[:16]
+
+
+def table_key(p: MixProblem) -> str:
+    h = hashlib.sha256("\x1f".join(p.materials).encode("utf-8"))
+    for arr in (p.cost, p.lb, p.ub, p.coef):
+        h.update(np.ascontiguousarray(arr, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def problem_params(p: MixProblem) -> dict:
+    # Keys as in lp_core.DEFAULT_PARAMS.
+    return {
+        "mode": p.mode,
+        "additive_cap": float(p.additive_cap),
+        "ucs_limit": float(p.ucs_limit),
+        "pi_max": float(p.pi_max),
+        "w_max": float(p.w_max),
+        "base_ucs": float(p.base[0]),
+        "base_pi": float(p.base[1]),
+        "base_w": float(p.base[2]),
+    }
+
+
+def problem_table(p: MixProblem) -> dict:
+    # Column layout of lp_core.DEFAULT_TABLE.
+    return {
+        "material": list(p.materials),
+        "cost": p.cost.tolist(),
+        "LB": p.lb.tolist(),
+        "UB": p.ub.tolist(),
+        "UCS_coef": p.coef[0].tolist(),
+        "PI_coef": p.coef[1].tolist(),
+        "W_coef": p.coef[2].tolist(),
+    }
+
+
+def _json(value) -> str:
+    # NumPy scalars (sensitivity reports) go out as plain floats.
+    return json.dumps(value, default=float)
+
+
+class RunHistory:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # One connection shared by the app's session threads, serialized by the lock.
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ---- write ----
+    def record(self, p: MixProblem, status: str, res: dict | None, kind: str = KIND_LP, timings: dict | None = None) -> int:
+        # Appends one run and returns its id. timings: phase -> seconds for this run.
+        tkey = table_key(p)
+        res = res or {}
+        row = (
+            time.time(),
+            problem_key(p),
+            material_set_key(p.materials),
+            tkey,
+            kind,
+            p.mode,
+            p.n,
+            res.get("backend"),
+            status,
+            res.get("total_cost"),
+            res.get("add_used"),
+            res.get("UCS"),
+            res.get("PI"),
+            res.get("W"),
+            sum((timings or {}).values()) or None,
+            _json(problem_params(p)),
+            _json(res) if res else None,
+            _json(timings) if timings else None,
+        )
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("INSERT OR IGNORE INTO tables VALUES (?, ?)", (tkey, _json(problem_table(p))))
+                cur = self._db.execute(
+                    "INSERT INTO runs (created_at, input_hash, material_set, table_hash, kind, mode, materials, backend,"
+                    " status, total_cost, add_used, UCS, PI, W, seconds, params, result, timings)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return cur.lastrowid
+
+    # ---- read ----
+    def _id_range(self, since: float | None, until: float | None) -> tuple[int | None, int | None]:
+        lo = hi = None
+        if since is not None:
+            row = self._db.execute("SELECT id FROM runs WHERE created_at >= ? ORDER BY created_at LIMIT 1", (since,)).fetchone()
+            if row is None:
+                return 0, -1  # nothing that recent: empty range
+            lo = row[0]
+        if until is not None:
+            row = self._db.execute("SELECT id FROM runs WHERE created_at < ? ORDER BY created_at DESC LIMIT 1", (until,)).fetchone()
+            hi = -1 if row is None else row[0]
+        return lo, hi
+
+    def page(
+        self,
+        material_set: str | None = None,
+        mode: str | None = None,
+        kind: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        before: int | None = None,
+        limit: int = PAGE_SIZE,
+    ) -> pd.DataFrame:
+        # Newest first; pass the last id of a page as `before` to get the next one.
+        # since / until: Unix timestamps (until is exclusive).
+        where, args = [], []
+        with self._lock:
+            lo, hi = self._id_range(since, until)
+            for col, op, v in [("material_set", "=", material_set), ("mode", "=", mode), ("kind", "=", kind),
+                               ("id", ">=", lo), ("id", "<=", hi), ("id", "<", before)]:
+                if v is not None:
+                    where.append(f"{col} {op} ?")
+                    args.append(v)
+            sql = f"SELECT {', '.join(SUMMARY_COLS)} FROM runs"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            rows = self._db.execute(sql + " ORDER BY id DESC LIMIT ?", args + [int(limit)]).fetchall()
+        out = pd.DataFrame(rows, columns=SUMMARY_COLS)
+        out["created_at"] = pd.to_datetime(out["created_at"], unit="s")
+        return out
+
+    def get(self, run_id: int) -> dict | None:
+        # One run in full: summary columns + params, result, timings and the additive table.
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join('r.' + c for c in SUMMARY_COLS)}, r.params, r.result, r.timings, t.data"
+                " FROM runs r JOIN tables t ON t.table_hash = r.table_hash WHERE r.id = ?",
+                (int(run_id),),
+            ).fetchone()
+        if row is None:
+            return None
+        out = dict(zip(SUMMARY_COLS, row[:len(SUMMARY_COLS)]))
+        params, result, timings, table = row[len(SUMMARY_COLS):]
+        out["params"] = json.loads(params)
+        out["result"] = json.loads(result) if result else None
+        out["timings"] = json.loads(timings) if timings else {}
+        out["table"] = json.loads(table)
+        return out
+
+    def lookup(self, p: MixProblem):
+        # Latest optimal plain-LP run of exactly this problem -> (status, res), or None.
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, status, result FROM runs WHERE input_hash = ? AND kind = ? AND status = 'Optimal'"
+                " ORDER BY id DESC LIMIT 1",
+                (problem_key(p), KIND_LP),
+            ).fetchone()
+        if row is None:
+            return None
+        res = json.loads(row[2])
+        res["history_id"] = row[0]
+        return row[1], res
+
+    def latest_id(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT max(id) FROM runs").fetchone()[0] or 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM runs").fetchone()[0]
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="List or show stored soil mix runs.")
+    ap.add_argument("--db", default=DEFAULT_PATH)
+    ap.add_argument("--mode", default=None)
+    ap.add_argument("--kind", default=None)
+    ap.add_argument("--limit", type=int, default=PAGE_SIZE)
+    ap.add_argument("--before", type=int, default=None, help="id cursor: list runs older than this one")
+    ap.add_argument("--show", type=int, default=None, metavar="ID", help="print one run in full as JSON")
+    args = ap.parse_args(argv)
+
+    history = RunHistory(args.db)
+    if args.show is not None:
+        print(json.dumps(history.get(args.show), indent=2, default=str))
+    else:
+        print(history.page(mode=args.mode, kind=args.kind, before=args.before, limit=args.limit).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# incremental.py
+# Keeps one built soil mix model alive across Streamlit reruns and patches it in place.
+#
+# update(p) compares the new problem with the previous one and touches only what changed:
+#   limits / base values -> the four general-row RHS entries
+#   a coefficient cell   -> that matrix entry (and the RHS shift it causes through LB)
+#   cost / bounds        -> the cost vector / bound rows
+#   mode switch          -> the sign of the UCS row
+# solve() then warm-starts the dense solver from the previous optimal basis.
+
+import numpy as np
+
+from dense_solver import STATUS_OPTIMAL, StandardForm, solve_standard, stack_problems
+from lp_core import MODE_COST, MixProblem, extract_result
+from metrics import span
+from sensitivity import analyze
+
+
+class IncrementalModel:
+    def __init__(self):
+        self.p = None
+        self.sf = None
+        self.basis = None
+        self.last_changes = []
+
+    def _rebuild(self, p: MixProblem):
+        self.sf = stack_problems([p])
+        self.basis = None
+        self.last_changes = ["rebuild"]
+
+    def update(self, p: MixProblem) -> list[str]:
+        old = self.p
+        if old is None or old.materials != p.materials:
+            self._rebuild(p)
+            self.p = p
+            return self.last_changes
+
+        sf = self.sf
+        M, b, c, lb = sf.M[0], sf.b[0], sf.c[0], sf.lb[0]
+        g = sf.row_sign[0]
+        m = len(g)
+        changes = []
+
+        if p.mode != old.mode:
+            g[1] = 1.0 if p.mode != MODE_COST else -1.0
+            M[1] *= -1.0
+            changes.append("sense")
+
+        cost_idx = np.flatnonzero(p.cost != old.cost)
+        if len(cost_idx):
+            c[cost_idx] = p.cost[cost_idx]
+            changes.append("cost")
+
+        ci, cj = np.nonzero(p.coef != old.coef)
+        if len(ci):
+            M[1 + ci, cj] = g[1 + ci] * p.coef[ci, cj]
+            changes.append("coef")
+
+        lb_idx = np.flatnonzero(p.lb != old.lb)
+        if len(lb_idx):
+            lb[lb_idx] = p.lb[lb_idx]
+            changes.append("bounds")
+        ub_idx = np.flatnonzero((p.ub != old.ub) | (p.lb != old.lb))
+        if len(ub_idx):
+            b[m + ub_idx] = p.ub[ub_idx] - p.lb[ub_idx]
+            if "bounds" not in changes:
+                changes.append("bounds")
+
+        # General-row RHS: rhs - A·lb, so limits, base values, LB and coefficients all feed it.
+        A, _, rhs = p.rows()
+        new_b = g * (rhs - A @ p.lb)
+        if not np.array_equal(new_b, b[:m]):
+            b[:m] = new_b
+            changes.append("rhs")
+        sf.obj_offset[0] = c @ lb
+
+        self.p = p
+        self.last_changes = changes
+        return changes
+
+    def solve(self, p: MixProblem):
+        # Same (status, res) as sensitivity.solve_with_sensitivity, warm-started when possible.
+        with span("build", backend="dense", materials=p.n, problems=1) as s:
+            s["changes"] = ",".join(self.update(p))
+        with span("solve", backend="dense", materials=p.n, rows=self.sf.M.shape[1]) as s:
+            out = solve_standard(self.sf, basis=self.basis)
+            s["iterations"] = int(out.iterations[0])
+            s["warm"] = self.basis is not None
+        status = out.status[0]
+        if status != STATUS_OPTIMAL:
+            return status, None
+        self.basis = out.basis
+        with span("extract", backend="dense"):
+            res = extract_result(p, out.x[0])
+        with span("sensitivity", backend="dense"):
+            sf: StandardForm = self.sf
+            res["sensitivity"] = analyze(p, sf.M[0], sf.b[0], sf.row_sign[0], out.basis[0])
+        return status, res
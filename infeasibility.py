@@ -0,0 +1,140 @@
+# infeasibility.py
+# Why is the mix infeasible, and what is the smallest change that fixes it?
+#
+#   find_iis          deletion filter over the limits (cap, UCS, PI, W) and the material bounds;
+#                     the result is an irreducible infeasible subset (drop any one and it solves).
+#   min_relaxation    one elastic LP: every limit and bound may move at a weighted cost, and the
+#                     cheapest set of moves that restores feasibility is reported.
+#
+# A relaxed bound falls back to the physical range of a percentage (0..100). Catalogs larger than
+# DENSE_MAX_N treat all lower bounds as one element (ΣLB) and all upper bounds as another (UB).
+
+import numpy as np
+
+from backends import BACKENDS, solve_arrays
+from dense_solver import DENSE_MAX_N, STATUS_OPTIMAL
+from lp_core import ROW_NAMES, SENSE_GE, SENSE_LE, MixProblem
+
+PCT_MAX = 100.0
+TOL = 1e-9
+
+
+def _solve(c, A, sense, rhs, lb, ub) -> tuple[str, np.ndarray | None]:
+    # The elastic LP has ~3n columns but stays cheap on the dense tableau well past DENSE_MAX_N,
+    # so it goes to the dense backend directly (get_backend would refuse it above DENSE_MAX_N).
+    if len(c) <= 4 * DENSE_MAX_N:
+        sol = BACKENDS["dense"].solve(c, A, sense, rhs, lb, ub)
+    else:
+        sol = solve_arrays(c, A, sense, rhs, lb, ub)
+    return sol.status, sol.x
+
+
+def _row_limits(p: MixProblem) -> list[float]:
+    return [p.additive_cap, p.ucs_limit, p.pi_max, p.w_max]
+
+
+# =========================
+# IIS (deletion filter)
+# =========================
+def _elements(p: MixProblem) -> list[tuple[str, str, np.ndarray]]:
+    # (label, kind, index mask); bounds that cannot be relaxed any further are left out.
+    elems = [(name, "row", np.arange(len(ROW_NAMES)) == i) for i, name in enumerate(ROW_NAMES)]
+    lb_c = p.lb > 0
+    ub_c = p.ub < PCT_MAX
+    if p.n > DENSE_MAX_N:
+        if lb_c.any():
+            elems.append(("ΣLB", "lb", lb_c))
+        if ub_c.any():
+            elems.append(("UB", "ub", ub_c))
+        return elems
+    idx = np.arange(p.n)
+    elems += [(f"LB {p.materials[j]}", "lb", idx == j) for j in np.flatnonzero(lb_c)]
+    elems += [(f"UB {p.materials[j]}", "ub", idx == j) for j in np.flatnonzero(ub_c)]
+    return elems
+
+
+def _feasible(p: MixProblem, kept: list[tuple[str, str, np.ndarray]]) -> bool:
+    A, sense, rhs = p.rows()
+    rows = np.zeros(len(ROW_NAMES), dtype=bool)
+    lb_keep = np.zeros(p.n, dtype=bool)
+    ub_keep = np.zeros(p.n, dtype=bool)
+    for _, kind, mask in kept:
+        if kind == "row":
+            rows |= mask
+        elif kind == "lb":
+            lb_keep |= mask
+        else:
+            ub_keep |= mask
+
+    # A dropped row becomes 0 <= 0; a dropped bound opens up to 0..100.
+    A = A * rows[:, None]
+    rhs = np.where(rows, rhs, 0.0)
+    sense = np.where(rows, sense, SENSE_LE)
+    lb = np.where(lb_keep, p.lb, np.minimum(p.lb, 0.0))
+    ub = np.where(ub_keep, p.ub, np.maximum(p.ub, PCT_MAX))
+    status, _ = _solve(np.zeros(p.n), A, sense, rhs, lb, ub)
+    return status == STATUS_OPTIMAL
+
+
+def find_iis(p: MixProblem) -> list[str]:
+    # Labels of an irreducible infeasible subset; [] if the problem is feasible.
+    kept = _elements(p)
+    if _feasible(p, kept):
+        return []
+    for elem in list(kept):
+        trial = [e for e in kept if e is not elem]
+        if not _feasible(p, trial):
+            kept = trial
+    return [label for label, _, _ in kept]
+
+
+# =========================
+# ELASTIC LP
+# =========================
+def min_relaxation(p: MixProblem, weights: dict[str, float] | None = None) -> dict:
+    # Weighted minimum relaxation of every limit and bound, from one LP.
+    # Default weight of an element = 1 / max(|value|, 1), i.e. roughly a relative change.
+    weights = weights or {}
+    n = p.n
+    A, sense, rhs = p.rows()
+    limits = np.array(_row_limits(p))
+
+    def w(label, value):
+        return float(weights.get(label, 1.0 / max(abs(value), 1.0)))
+
+    # x = lb + m - d + u:  m moves inside [LB, UB] for free, d goes below LB, u goes above UB.
+    m_ub = np.maximum(p.ub - p.lb, 0.0)
+    d_ub = np.maximum(p.lb, 0.0)
+    u_ub = np.maximum(PCT_MAX - p.ub, 0.0)
+    h = rhs - A @ p.lb
+    e_ub = np.abs(h) + np.abs(A).sum(axis=1) * PCT_MAX
+    e_col = np.where(sense == SENSE_GE, 1.0, -1.0)
+
+    A_el = np.hstack([A, -A, A, np.diag(e_col)])
+    c_el = np.concatenate(
+        [
+            np.zeros(n),
+            [w(f"LB {m}", v) for m, v in zip(p.materials, p.lb)],
+            [w(f"UB {m}", v) for m, v in zip(p.materials, p.ub)],
+            [w(name, v) for name, v in zip(ROW_NAMES, limits)],
+        ]
+    )
+    status, v = _solve(c_el, A_el, sense, h, np.zeros(3 * n + len(ROW_NAMES)), np.concatenate([m_ub, d_ub, u_ub, e_ub]))
+    if status != STATUS_OPTIMAL:
+        return {"status": status, "relaxation": [], "weighted_cost": float("nan")}
+
+    d, u, e = v[n:2 * n], v[2 * n:3 * n], v[3 * n:]
+    moves = []
+    for i, name in enumerate(ROW_NAMES):
+        if e[i] > TOL:
+            new = limits[i] + (e[i] if sense[i] == SENSE_LE else -e[i])
+            moves.append({"constraint": name, "limit": float(limits[i]), "relaxed": float(new), "change": float(new - limits[i])})
+    for j in np.flatnonzero(d > TOL):
+        moves.append({"constraint": f"LB {p.materials[j]}", "limit": float(p.lb[j]), "relaxed": float(p.lb[j] - d[j]), "change": float(-d[j])})
+    for j in np.flatnonzero(u > TOL):
+        moves.append({"constraint": f"UB {p.materials[j]}", "limit": float(p.ub[j]), "relaxed": float(p.ub[j] + u[j]), "change": float(u[j])})
+    return {"status": status, "relaxation": moves, "weighted_cost": float(c_el @ v)}
+
+
+def diagnose(p: MixProblem, weights: dict[str, float] | None = None) -> dict:
+    return {"iis": find_iis(p), **min_relaxation(p, weights)}
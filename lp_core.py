@@ -0,0 +1,225 @@
+# lp_core.py
+# Headless LP core for the soil mix model (no Streamlit dependency).
+# app3.py, batch jobs and other tools import this module to build and solve the model.
+#
+# Model (same as the slide in app3.py):
+#   min  Σ c_i x_i
+#   s.t. Σ x_i <= additive_cap
+#        baseUCS + Σ a_i x_i >= UCS_min   (cost mode)   |   <= UCS_max (cap mode)
+#        basePI  + Σ b_i x_i <= PI_max
+#        baseW   + Σ d_i x_i <= W_max
+#        LB_i <= x_i <= UB_i
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+from pulp import (
+    PULP_CBC_CMD,
+    LpAffineExpression,
+    LpConstraint,
+    LpConstraintGE,
+    LpConstraintLE,
+    LpMinimize,
+    LpProblem,
+    LpStatus,
+    LpVariable,
+)
+
+from metrics import span
+
+# =========================
+# CONSTANTS
+# =========================
+MODE_COST = "cost"  # UCS is a minimum target (>=)
+MODE_CAP = "cap"    # UCS is a maximum cap (<=)
+
+NUMERIC_COLS = ["cost", "LB", "UB", "UCS_coef", "PI_coef", "W_coef"]
+REQUIRED_COLS = ["material"] + NUMERIC_COLS
+COEF_COLS = ["UCS_coef", "PI_coef", "W_coef"]
+PROPS = ["UCS", "PI", "W"]
+ROW_NAMES = ["cap", "UCS", "PI", "W"]
+
+SENSE_LE = -1
+SENSE_GE = 1
+
+# Built-in additive table and sidebar defaults (mirrors app3.py).
+DEFAULT_TABLE = {
+    "material": ["x1", "x2", "x3", "x4", "x5", "x6"],
+    "cost": [1500, 400, 600, 200, 700, 600],
+    "LB": [1, 6, 1, 3, 1, 2],
+    "UB": [10, 8, 10, 15, 10, 8],
+    "UCS_coef": [25, 5, 15, 2, 10, 8],
+    "PI_coef": [-0.5, -0.2, -0.1, -0.3, -0.2, -0.25],
+    "W_coef": [-0.2, -0.1, -0.1, -0.5, -0.1, -0.15],
+}
+
+DEFAULT_PARAMS = {
+    "mode": MODE_COST,
+    "additive_cap": 25.0,
+    "ucs_limit": 250.0,
+    "pi_max": 15.0,
+    "w_max": 25.0,
+    "base_ucs": 50.0,
+    "base_pi": 10.0,
+    "base_w": 30.0,
+}
+PARAM_NAMES = list(DEFAULT_PARAMS)
+
+
+# =========================
+# PROBLEM
+# =========================
+@dataclass
+class MixProblem:
+    materials: list[str]
+    cost: np.ndarray   # (n,)
+    lb: np.ndarray     # (n,)
+    ub: np.ndarray     # (n,)
+    coef: np.ndarray   # (3, n): UCS, PI, W coefficients
+    base: np.ndarray   # (3,): base UCS, PI, W
+    additive_cap: float
+    ucs_limit: float   # UCS minimum (cost mode) or UCS maximum (cap mode)
+    pi_max: float
+    w_max: float
+    mode: str = MODE_COST
+
+    @property
+    def n(self) -> int:
+        return len(self.materials)
+
+    def rows(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # General rows (cap, UCS, PI, W) as  A x (sense) rhs, with base values moved to the rhs.
+        A = np.vstack([np.ones(self.n), self.coef])
+        rhs = np.array(
+            [
+                self.additive_cap,
+                self.ucs_limit - self.base[0],
+                self.pi_max - self.base[1],
+                self.w_max - self.base[2],
+            ],
+            dtype=float,
+        )
+        ucs_sense = SENSE_GE if self.mode == MODE_COST else SENSE_LE
+        sense = np.array([SENSE_LE, ucs_sense, SENSE_LE, SENSE_LE])
+        return A, sense, rhs
+
+
+def row_terms(A: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+    # CSR-style (column indices, values) per row; zero coefficients are dropped.
+    out = []
+    for row in np.asarray(A, dtype=float):
+        nz = np.flatnonzero(row)
+        out.append((nz, row[nz]))
+    return out
+
+
+def problem_from_df(
+    df: pd.DataFrame,
+    mode: str,
+    additive_cap: float,
+    ucs_limit: float,
+    pi_max: float,
+    w_max: float,
+    base_ucs: float,
+    base_pi: float,
+    base_w: float,
+) -> MixProblem:
+    # One columnar read per field instead of a per-material row lookup.
+    return MixProblem(
+        materials=df["material"].astype(str).tolist(),
+        cost=df["cost"].to_numpy(dtype=float),
+        lb=df["LB"].to_numpy(dtype=float),
+        ub=df["UB"].to_numpy(dtype=float),
+        coef=df[COEF_COLS].to_numpy(dtype=float).T.copy(),
+        base=np.array([base_ucs, base_pi, base_w], dtype=float),
+        additive_cap=float(additive_cap),
+        ucs_limit=float(ucs_limit),
+        pi_max=float(pi_max),
+        w_max=float(w_max),
+        mode=mode,
+    )
+
+
+def apply_params(p: MixProblem, params: dict) -> MixProblem:
+    # Same additive table, new limits/base values (keys as in DEFAULT_PARAMS; missing keys keep p's value).
+    base = p.base.copy()
+    for i, k in enumerate(["base_ucs", "base_pi", "base_w"]):
+        if k in params:
+            base[i] = float(params[k])
+    return replace(
+        p,
+        base=base,
+        mode=params.get("mode", p.mode),
+        additive_cap=float(params.get("additive_cap", p.additive_cap)),
+        ucs_limit=float(params.get("ucs_limit", p.ucs_limit)),
+        pi_max=float(params.get("pi_max", p.pi_max)),
+        w_max=float(params.get("w_max", p.w_max)),
+    )
+
+
+# =========================
+# PULP MODEL
+# =========================
+def build_lp_arrays(c, lb, ub, A, sense, rhs, row_names=None) -> tuple[LpProblem, list[LpVariable]]:
+    # min c·x  s.t.  A x (sense) rhs,  lb <= x <= ub.  Single pass over the arrays (zeros skipped).
+    return build_lp_rows(c, lb, ub, row_terms(A), sense, rhs, row_names)
+
+
+def build_lp_rows(c, lb, ub, terms, sense, rhs, row_names=None) -> tuple[LpProblem, list[LpVariable]]:
+    # Same model with the rows given CSR-style, as row_terms() returns them, so block-structured
+    # models never need a dense A. Names are positional so any material label is safe.
+    x = [
+        LpVariable(name=f"x_{i}", lowBound=float(lo), upBound=float(hi), cat="Continuous")
+        for i, (lo, hi) in enumerate(zip(np.asarray(lb).tolist(), np.asarray(ub).tolist()))
+    ]
+
+    # Objective ALWAYS: Minimize total additives cost
+    prob = LpProblem("SoilMix_CostMin", LpMinimize)
+    prob += LpAffineExpression(zip(x, np.asarray(c, dtype=float).tolist()))
+
+    row_names = row_names or [f"r_{i}" for i in range(len(rhs))]
+    for name, (idx, vals), s, r in zip(row_names, terms, np.asarray(sense).tolist(), np.asarray(rhs).tolist()):
+        expr = LpAffineExpression(zip([x[j] for j in idx.tolist()], vals.tolist()))
+        prob += LpConstraint(expr, LpConstraintGE if s == SENSE_GE else LpConstraintLE, name, r)
+
+    return prob, x
+
+
+def build_lp(p: MixProblem) -> tuple[LpProblem, list[LpVariable]]:
+    A, sense, rhs = p.rows()
+    return build_lp_arrays(p.cost, p.lb, p.ub, A, sense, rhs, ROW_NAMES)
+
+
+def solve_arrays_pulp(c, lb, ub, A, sense, rhs, solver=None) -> tuple[str, np.ndarray | None]:
+    with span("build", backend="cbc", materials=len(lb), rows=len(rhs)):
+        prob, x = build_lp_arrays(c, lb, ub, A, sense, rhs)
+    with span("solve", backend="cbc", materials=len(lb), rows=len(rhs), problems=1):
+        prob.solve(solver or PULP_CBC_CMD(msg=False))
+    status = LpStatus.get(prob.status, str(prob.status))
+    if status != "Optimal":
+        return status, None
+    return status, np.array([v.varValue for v in x], dtype=float)
+
+
+def extract_result(p: MixProblem, xv: np.ndarray) -> dict:
+    props = p.base + p.coef @ xv
+    add_used = float(xv.sum())
+    return {
+        "solution": dict(zip(p.materials, xv.tolist())),
+        "add_used": add_used,
+        "soil_total": float(100.0 - add_used),
+        "total_cost": float(p.cost @ xv),
+        "UCS": float(props[0]),
+        "PI": float(props[1]),
+        "W": float(props[2]),
+    }
+
+
+def solve_lp(p: MixProblem, solver=None):
+    A, sense, rhs = p.rows()
+    status, xv = solve_arrays_pulp(p.cost, p.lb, p.ub, A, sense, rhs, solver)
+    if status != "Optimal":
+        return status, None
+    with span("extract", backend="cbc"):
+        return status, extract_result(p, xv)
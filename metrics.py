@@ -0,0 +1,147 @@
+# metrics.py
+# Lightweight per-phase timing spans + metrics export (structured logs, Prometheus text).
+#
+#   with span("solve", backend="dense", materials=n) as s:
+#       out = ...
+#       s["iterations"] = int(out.iterations.sum())
+#
+# Every finished span is appended to the current run's Recorder (if one is active), folded into
+# process-wide totals and logged as one JSON line on the "soil_lp.metrics" logger (INFO).
+# Logging is opt-in: entry points call setup_logging() (--log-level or SOIL_LP_LOG_LEVEL).
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger("soil_lp.metrics")
+
+LOG_ENV = "SOIL_LP_LOG_LEVEL"
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+COUNTED_ATTRS = ("iterations", "problems")  # summed into *_total counters
+SIZE_ATTRS = ("materials", "rows")          # exported as last-seen gauges
+
+
+class Recorder:
+    def __init__(self):
+        self.spans = []
+
+
+_current = contextvars.ContextVar("soil_lp_recorder", default=None)
+_lock = threading.Lock()
+_hist = {}      # (phase, backend) -> [bucket counts..., +Inf count, sum]
+_counters = {}  # (attr, phase, backend) -> total
+_gauges = {}    # (attr, phase, backend) -> last value
+
+
+def setup_logging(level: str | None = None):
+    # Sends the "soil_lp.*" loggers to stderr at `level` (default: $SOIL_LP_LOG_LEVEL; unset -> no-op).
+    # Span records go out as bare JSON lines; everything else with time, logger and level.
+    level = level or os.environ.get(LOG_ENV)
+    if not level:
+        return
+    root = logging.getLogger("soil_lp")
+    root.setLevel(level.upper())
+    if not root.handlers:  # Streamlit reruns the script: add the handlers once per process
+        h = logging.StreamHandler()
+        h.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+        root.addHandler(h)
+        h = logging.StreamHandler()
+        h.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(h)
+        log.propagate = False
+
+
+def add_log_arg(ap):
+    # --log-level for the CLIs; pass args.log_level to setup_logging().
+    ap.add_argument("--log-level", choices=LOG_LEVELS, default=None, help=f"log spans/errors to stderr (default: ${LOG_ENV})")
+
+
+def start_run() -> Recorder:
+    rec = Recorder()
+    _current.set(rec)
+    return rec
+
+
+@contextmanager
+def span(phase: str, **attrs):
+    record = {"phase": phase, **attrs}
+    t0 = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - t0
+        _finish(record)
+
+
+def record_since(phase: str, t0: float, **attrs):
+    # For phases that are awkward to wrap in a with-block (t0 from time.perf_counter()).
+    _finish({"phase": phase, **attrs, "seconds": time.perf_counter() - t0})
+
+
+def _finish(record: dict):
+    rec = _current.get()
+    if rec is not None:
+        rec.spans.append(record)
+
+    key = (record["phase"], str(record.get("backend", "")))
+    with _lock:
+        h = _hist.setdefault(key, [0] * (len(BUCKETS) + 1) + [0.0])
+        for i, le in enumerate(BUCKETS):
+            if record["seconds"] <= le:
+                h[i] += 1
+        h[len(BUCKETS)] += 1
+        h[-1] += record["seconds"]
+        for attr in COUNTED_ATTRS:
+            if attr in record:
+                _counters[(attr,) + key] = _counters.get((attr,) + key, 0) + record[attr]
+        for attr in SIZE_ATTRS:
+            if attr in record:
+                _gauges[(attr,) + key] = record[attr]
+
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps({"event": "span", **record}, default=str))
+
+
+def _labels(phase: str, backend: str) -> str:
+    out = f'phase="{phase}"'
+    return out + (f',backend="{backend}"' if backend else "")
+
+
+def prometheus_text() -> str:
+    lines = [
+        "# HELP soil_lp_phase_seconds Time spent per phase.",
+        "# TYPE soil_lp_phase_seconds histogram",
+    ]
+    with _lock:
+        for (phase, backend), h in sorted(_hist.items()):
+            lab = _labels(phase, backend)
+            for le, count in zip(BUCKETS, h):
+                lines.append(f'soil_lp_phase_seconds_bucket{{{lab},le="{le}"}} {count}')
+            lines.append(f'soil_lp_phase_seconds_bucket{{{lab},le="+Inf"}} {h[len(BUCKETS)]}')
+            lines.append(f"soil_lp_phase_seconds_sum{{{lab}}} {h[-1]:.9f}")
+            lines.append(f"soil_lp_phase_seconds_count{{{lab}}} {h[len(BUCKETS)]}")
+        for attr in COUNTED_ATTRS:
+            rows = [(k[1:], v) for k, v in sorted(_counters.items()) if k[0] == attr]
+            if rows:
+                lines.append(f"# TYPE soil_lp_{attr}_total counter")
+                lines += [f"soil_lp_{attr}_total{{{_labels(*k)}}} {v}" for k, v in rows]
+        for attr in SIZE_ATTRS:
+            rows = [(k[1:], v) for k, v in sorted(_gauges.items()) if k[0] == attr]
+            if rows:
+                lines.append(f"# TYPE soil_lp_problem_{attr} gauge")
+                lines += [f"soil_lp_problem_{attr}{{{_labels(*k)}}} {v}" for k, v in rows]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str):
+    # Atomic write, suitable for a node-exporter textfile collector.
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
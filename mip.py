@@ -0,0 +1,232 @@
+# mip.py
+# Discrete dosing: additives come in bag increments and, if used at all, have a minimum dose.
+#
+#   x_j = step_j · k_j,               k_j integer   (where step_j > 0)
+#   min_j · y_j <= x_j <= UB_j · y_j,  y_j binary    (where min_j > 0)
+#
+# on top of the LP rows from lp_core. The LP optimum, rounded onto the dose grid, is handed to
+# CBC as a MIP start. CBC runs as a child process under a time limit / relative gap / thread count
+# while its log is tailed for incumbent and bound updates, and the best mix found comes back with
+# the gap CBC could prove. A CBC that overruns its own limit is interrupted (SIGINT: it stops and
+# writes its incumbent), then killed if it still does not exit.
+
+import math
+import os
+import re
+import signal
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+from pulp import PULP_CBC_CMD, LpStatus, LpVariable
+
+from backends import solve_problem
+from lp_core import MixProblem, build_lp, extract_result
+from metrics import span
+
+STEP_COL = "step"
+MIN_COL = "min_dose"
+GRACE_SECONDS = 10.0  # extra wait past the time limit before interrupting CBC
+STOP_SECONDS = 5.0    # wait after the interrupt before killing it
+EPS = 1e-9
+
+_NUM = r"([-+]?\d+(?:\.\d*)?(?:e[-+]?\d+)?)"
+_INCUMBENT = re.compile(rf"Cbc0012I Integer solution of {_NUM} found by (.+?) after \d+ iterations and (\d+) nodes \({_NUM} seconds\)")
+_PROGRESS = re.compile(rf"Cbc0010I After (\d+) nodes, \d+ on tree, {_NUM} best solution, best possible {_NUM} \({_NUM} seconds\)")
+_SUMMARY = re.compile(rf"^(Objective value|Lower bound|Enumerated nodes|Time \(Wallclock seconds\)):\s+{_NUM}")
+
+
+def dosing_from_df(df: pd.DataFrame, step: float = 0.0, min_dose: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    # Per-material (step, min_dose) from optional catalog columns; blank cells take the defaults.
+    out = []
+    for col, default in [(STEP_COL, step), (MIN_COL, min_dose)]:
+        v = np.full(len(df), float(default))
+        if col in df.columns:
+            v = pd.to_numeric(df[col], errors="coerce").fillna(default).to_numpy(dtype=float)
+        out.append(np.maximum(v, 0.0))
+    return out[0], out[1]
+
+
+def _gap(obj: float, bound: float) -> float:
+    return abs(obj - bound) / max(abs(obj), 1e-10)
+
+
+# =========================
+# MODEL
+# =========================
+def build_mip(p: MixProblem, step: np.ndarray, min_dose: np.ndarray):
+    prob, x = build_lp(p)
+    k, y = {}, {}
+    for j in np.flatnonzero(step > 0):
+        k[j] = LpVariable(
+            f"k_{j}",
+            lowBound=math.ceil(p.lb[j] / step[j] - EPS),
+            upBound=math.floor(p.ub[j] / step[j] + EPS),
+            cat="Integer",
+        )
+        prob += x[j] == float(step[j]) * k[j], f"step_{j}"
+    for j in np.flatnonzero(min_dose > 0):
+        y[j] = LpVariable(f"y_{j}", cat="Binary")
+        prob += x[j] >= float(min_dose[j]) * y[j], f"min_{j}"
+        prob += x[j] <= float(p.ub[j]) * y[j], f"use_{j}"
+    return prob, x, k, y
+
+
+def seed_from_lp(p: MixProblem, x_lp: np.ndarray, step: np.ndarray, min_dose: np.ndarray) -> np.ndarray:
+    # LP mix pushed onto the dose grid: small doses drop to 0 or up to the minimum, then every
+    # stepped dose rounds to the nearest bag count inside its bounds. CBC repairs what is left.
+    x = x_lp.copy()
+    small = (min_dose > 0) & (x < min_dose) & (x > EPS)
+    x[small] = np.where(x[small] >= min_dose[small] / 2, min_dose[small], 0.0)
+    x = np.clip(x, p.lb, p.ub)
+    s = np.where(step > 0, step, 1.0)
+    lo = np.ceil(p.lb / s - EPS)
+    hi = np.floor(p.ub / s + EPS)
+    need = np.where(min_dose > 0, np.ceil(min_dose / s - EPS), 0.0)
+    kv = np.clip(np.round(x / s), lo, hi)
+    # A minimum dose above the last bag count that fits under UB leaves 0 as the only start value.
+    kv = np.clip(np.where((kv > 0) & (kv < need), np.where(need <= hi, need, 0.0), kv), lo, hi)
+    return np.where(step > 0, kv * s, x)
+
+
+# =========================
+# SOLVE
+# =========================
+def parse_cbc_line(line: str) -> dict | None:
+    m = _INCUMBENT.search(line)
+    if m:
+        return {"event": "incumbent", "objective": float(m[1]), "found_by": m[2], "nodes": int(m[3]), "seconds": float(m[4])}
+    m = _PROGRESS.search(line)
+    if m:
+        obj, bound = float(m[2]), float(m[3])
+        has = obj < 1e49  # CBC prints 1e+50 while there is no incumbent
+        return {
+            "event": "progress",
+            "nodes": int(m[1]),
+            "objective": obj if has else None,
+            "bound": bound,
+            "gap": _gap(obj, bound) if has else None,
+            "seconds": float(m[4]),
+        }
+    return None
+
+
+def _summary(text: str) -> dict:
+    out = {}
+    for line in text.splitlines():
+        if line.startswith("Result - "):
+            out["result"] = line[len("Result - "):].strip()
+        m = _SUMMARY.match(line)
+        if m:
+            out[m[1]] = float(m[2])
+    return out
+
+
+def solve_mip(
+    p: MixProblem,
+    step: np.ndarray,
+    min_dose: np.ndarray,
+    time_limit: float = 10.0,
+    gap: float = 0.01,
+    threads: int | None = None,
+    progress=None,
+    poll: float = 0.2,
+):
+    # Same (status, res) as lp_core.solve_lp plus res["mip"]. progress(event) is called from the
+    # calling thread with parse_cbc_line() events while CBC runs.
+    with span("mip_seed", materials=p.n):
+        lp_status, lp = solve_problem(p)
+    if lp is None:
+        # The LP is a relaxation of the MIP: no LP mix, no discrete mix.
+        return lp_status, None
+
+    prob, x, k, y = build_mip(p, step, min_dose)
+    seed = seed_from_lp(p, np.array(list(lp["solution"].values())), step, min_dose)
+    for j, v in enumerate(seed):
+        x[j].setInitialValue(float(v))
+    for j, var in k.items():
+        var.setInitialValue(round(seed[j] / step[j]))
+    for j, var in y.items():
+        var.setInitialValue(1 if seed[j] > EPS else 0)
+
+    # The same files and command line PuLP would use, but our own Popen so an overrun can be stopped.
+    solver = PULP_CBC_CMD(msg=False, timeLimit=time_limit, gapRel=gap, threads=threads, warmStart=True)
+    mps_path, mst_path, sol_path, log_path = solver.create_tmp_files(prob.name, "mps", "mst", "sol", "log")
+    vs, var_names, con_names, _ = prob.writeMPS(mps_path, rename=1)
+    solver.writesol(mst_path, prob, vs, var_names, con_names)
+    args = [solver.path, mps_path, "-mips", mst_path, "-sec", str(time_limit)]
+    args += [a for o in solver.getOptions() for a in ("-" + o).split()]
+    args += ["-solve", "-printingOptions", "all", "-solution", sol_path]
+
+    incumbents = 0
+    cbc = None
+    try:
+        with span("solve", backend="cbc-mip", materials=p.n) as s, open(log_path, "w") as out, open(log_path) as log:
+            t0 = time.perf_counter()
+            cbc = subprocess.Popen(args, stdout=out, stderr=out, stdin=subprocess.DEVNULL)
+            pending = ""
+            interrupted = False
+            while True:
+                alive = cbc.poll() is None
+                # Only complete lines are parsed; a half-written one waits for the next poll.
+                *lines, pending = (pending + log.read()).split("\n")
+                for line in lines:
+                    event = parse_cbc_line(line)
+                    if event is None:
+                        continue
+                    incumbents += event["event"] == "incumbent"
+                    if progress:
+                        progress(event)
+                if not alive:
+                    break
+                elapsed = time.perf_counter() - t0
+                if elapsed > time_limit + GRACE_SECONDS + STOP_SECONDS:
+                    cbc.kill()
+                    cbc.wait()
+                    s["killed"] = True
+                    break
+                if not interrupted and elapsed > time_limit + GRACE_SECONDS:
+                    # CBC ignored its own limit: on SIGINT it stops and writes the best mix so far.
+                    if os.name == "nt":
+                        cbc.terminate()
+                    else:
+                        cbc.send_signal(signal.SIGINT)
+                    interrupted = s["interrupted"] = True
+                try:
+                    cbc.wait(poll)
+                except subprocess.TimeoutExpired:
+                    pass
+            log.seek(0)
+            summary = _summary(log.read())
+            s["incumbents"] = incumbents
+        if not os.path.exists(sol_path):
+            return "Not Solved", None
+        cbc_status, values, _, _, _, sol_status = solver.readsol_MPS(sol_path, prob, vs, var_names, con_names)
+        prob.assignVarsVals(values)
+        prob.assignStatus(cbc_status, sol_status)
+    finally:
+        if cbc is not None and cbc.poll() is None:
+            cbc.kill()
+            cbc.wait()
+        solver.delete_tmp_files(mps_path, mst_path, sol_path, log_path)
+
+    status = LpStatus.get(prob.status, str(prob.status))
+    if status != "Optimal":
+        return status, None
+    xv = np.array([v.varValue for v in x], dtype=float)
+    res = extract_result(p, xv)
+    obj = res["total_cost"]
+    bound = summary.get("Lower bound", obj)
+    res["mip"] = {
+        "result": summary.get("result", ""),
+        "bound": float(bound),
+        "gap": _gap(obj, bound),
+        "proven": prob.sol_status == 1,
+        "nodes": int(summary.get("Enumerated nodes", 0)),
+        "seconds": float(summary.get("Time (Wallclock seconds)", 0.0)),
+        "incumbents": incumbents,
+        "interrupted": interrupted,
+        "lp_cost": lp["total_cost"],
+    }
+    return status, res
@@ -0,0 +1,60 @@
+# mix_eval.py
+# Scores given additive mixes against the model without calling a solver.
+#
+# X holds one mix per row (percent per material, in p.materials order). Properties come from one
+# matrix product (base + X·coefᵀ), and every limit and bound is checked the same way, so thousands
+# of candidate mixes cost about as much as one.
+#
+# Violations are reported in the constraint's own units (0 = satisfied); a mix counts as feasible
+# when each one is within FEAS_TOL relative to its limit, so LP solutions read back as feasible.
+
+import numpy as np
+import pandas as pd
+
+from lp_core import PROPS, ROW_NAMES, SENSE_LE, MixProblem
+
+FEAS_TOL = 1e-6
+
+
+def mix_matrix(df: pd.DataFrame, materials: list[str]) -> np.ndarray:
+    # Wide candidates table (one column per material) -> k × n array; blank cells count as 0%.
+    missing = [m for m in materials if m not in df.columns]
+    if missing:
+        raise ValueError(f"missing material columns: {', '.join(missing)}")
+    return df[materials].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+
+def evaluate_mixes(p: MixProblem, X) -> pd.DataFrame:
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    A, sense, rhs = p.rows()
+    props = p.base + X @ p.coef.T
+    act = X @ A.T
+    row_v = np.maximum(np.where(sense == SENSE_LE, act - rhs, rhs - act), 0.0)
+    lb_v = np.maximum(p.lb - X, 0.0)
+    ub_v = np.maximum(X - p.ub, 0.0)
+    ok = (
+        (row_v <= FEAS_TOL * np.maximum(np.abs(rhs), 1.0)).all(axis=1)
+        & (lb_v <= FEAS_TOL * np.maximum(np.abs(p.lb), 1.0)).all(axis=1)
+        & (ub_v <= FEAS_TOL * np.maximum(np.abs(p.ub), 1.0)).all(axis=1)
+    )
+
+    add_used = X.sum(axis=1)
+    out = {"total_cost": X @ p.cost, "add_used": add_used, "soil_total": 100.0 - add_used}
+    out.update({name: props[:, i] for i, name in enumerate(PROPS)})
+    out.update({f"{name}_violation": row_v[:, i] for i, name in enumerate(ROW_NAMES)})
+    out["LB_violation"] = lb_v.sum(axis=1)
+    out["UB_violation"] = ub_v.sum(axis=1)
+    out["feasible"] = ok
+    return pd.DataFrame(out)
+
+
+def mix_violations(p: MixProblem, x) -> list[str]:
+    # Labels of the violated limits and bounds for a single mix (same labels as infeasibility.py).
+    x = np.asarray(x, dtype=float)
+    A, sense, rhs = p.rows()
+    act = A @ x
+    row_v = np.where(sense == SENSE_LE, act - rhs, rhs - act)
+    out = [name for name, v, r in zip(ROW_NAMES, row_v, rhs) if v > FEAS_TOL * max(abs(r), 1.0)]
+    out += [f"LB {p.materials[j]}" for j in np.flatnonzero(p.lb - x > FEAS_TOL * np.maximum(np.abs(p.lb), 1.0))]
+    out += [f"UB {p.materials[j]}" for j in np.flatnonzero(x - p.ub > FEAS_TOL * np.maximum(np.abs(p.ub), 1.0))]
+    return out
@@ -0,0 +1,324 @@
+# portfolio.py
+# Joint mix design for many projects that draw on one limited additive inventory.
+#
+# Project p keeps its own cap, UCS/PI/W limits, base values and mode, and needs quantity Q_p
+# (tonnes of treated soil); x_p is in % as everywhere else, so it uses Q_p·x_pj/100 tonnes of
+# additive j. The model is
+#
+#   min  Σ_p Q_p c·x_p   s.t.  project rows of p for every p,   Σ_p Q_p x_pj / 100 <= stock_j
+#
+#   joint        one sparse LP: block-diagonal project rows plus the inventory rows (CBC)
+#   decomposed   Dantzig-Wolfe: a small master LP over project mixes picks how much of each
+#                proposal to use; the inventory prices it returns re-cost every project, and all
+#                projects are re-solved together in one batched dense call. Stops when no project
+#                can propose a cheaper mix (the Lagrangian bound closes the gap). If the cheapest
+#                mixes overrun the stock, a phase 1 first prices on overrun alone: it either finds
+#                columns that fit the stock or proves the portfolio infeasible.
+
+import argparse
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+from pulp import (
+    PULP_CBC_CMD,
+    LpAffineExpression,
+    LpConstraint,
+    LpConstraintEQ,
+    LpConstraintLE,
+    LpMinimize,
+    LpProblem,
+    LpStatus,
+    LpVariable,
+)
+
+from backends import solve_problem
+from catalog import read_table
+from dense_solver import DENSE_MAX_N, STATUS_NOT_SOLVED, STATUS_OPTIMAL, solve_standard, stack_problems
+from lp_core import (
+    DEFAULT_PARAMS,
+    DEFAULT_TABLE,
+    PARAM_NAMES,
+    SENSE_LE,
+    MixProblem,
+    apply_params,
+    build_lp_rows,
+    extract_result,
+    problem_from_df,
+    row_terms,
+)
+from metrics import add_log_arg, setup_logging, span
+
+METHOD_JOINT = "joint"
+METHOD_DECOMPOSED = "decomposed"
+PROJECT_COL = "project_id"
+QTY_COL = "quantity"
+STOCK_COL = "stock"
+
+JOINT_MAX_VARS = 20_000  # "auto" switches to the decomposition above this many variables
+TOL = 1e-7
+RC_TOL = 1e-6  # phase-1 reduced costs, relative to the convexity duals (CBC reports ~7 digits)
+
+
+# =========================
+# INPUTS
+# =========================
+def projects_from_df(base: MixProblem, df: pd.DataFrame) -> tuple[list[str], np.ndarray, list[MixProblem]]:
+    # One project per row; columns named as the sidebar parameters override base, quantity defaults to 1.
+    ids = df[PROJECT_COL].astype(str).tolist() if PROJECT_COL in df.columns else [str(i) for i in range(len(df))]
+    qty = pd.to_numeric(df[QTY_COL], errors="coerce").fillna(1.0).to_numpy(dtype=float) if QTY_COL in df.columns else np.ones(len(df))
+    cols = [c for c in PARAM_NAMES if c in df.columns]
+    problems = [
+        apply_params(base, {k: v for k, v in row.items() if not pd.isna(v)})
+        for row in df[cols].to_dict("records")
+    ]
+    return ids, qty, problems
+
+
+def stock_from_df(df: pd.DataFrame, materials: list[str]) -> np.ndarray:
+    # Tonnes on hand per material; materials missing from the table (or blank) are unlimited.
+    stock = pd.to_numeric(df[STOCK_COL], errors="coerce")
+    by_name = dict(zip(df["material"].astype(str), stock))
+    stock = np.array([by_name.get(m, np.inf) for m in materials], dtype=float)
+    return np.where(np.isnan(stock), np.inf, stock)
+
+
+def _report(ids, qty, problems, X, stock, prices, status, method, **extra) -> dict:
+    if X is None:
+        return {"status": status, "method": method, "projects": [], "inventory": [], **extra}
+    used = (qty[:, None] * X).sum(axis=0) / 100.0
+    projects = [{"project_id": pid, "quantity": float(q), **extract_result(p, x)} for pid, q, p, x in zip(ids, qty, problems, X)]
+    inventory = [
+        {"material": m, "stock": float(s), "used": float(u), "price": float(v)}
+        for m, s, u, v in zip(problems[0].materials, stock, used, prices)
+    ]
+    return {
+        "status": status,
+        "method": method,
+        "total_cost": float(sum(q * r["total_cost"] for q, r in zip(qty, projects))),
+        "projects": projects,
+        "inventory": inventory,
+        **extra,
+    }
+
+
+# =========================
+# JOINT LP
+# =========================
+def build_joint(problems: list[MixProblem], qty: np.ndarray, stock: np.ndarray):
+    # Block-diagonal project rows + coupling inventory rows, built straight from sparse row terms.
+    n = problems[0].n
+    terms, sense, rhs, names = [], [], [], []
+    for k, p in enumerate(problems):
+        A, s, r = p.rows()
+        terms += [(idx + k * n, vals) for idx, vals in row_terms(A)]
+        sense += s.tolist()
+        rhs += r.tolist()
+        names += [f"p{k}_r{i}" for i in range(len(r))]
+    offsets = np.arange(len(problems)) * n
+    for j in np.flatnonzero(np.isfinite(stock)):
+        terms.append((offsets + j, qty / 100.0))
+        sense.append(SENSE_LE)
+        rhs.append(float(stock[j]))
+        names.append(f"inv_{j}")
+    c = np.concatenate([q * p.cost for q, p in zip(qty, problems)])
+    lb = np.concatenate([p.lb for p in problems])
+    ub = np.concatenate([p.ub for p in problems])
+    return build_lp_rows(c, lb, ub, terms, sense, rhs, names)
+
+
+def solve_joint(ids, qty, problems, stock, solver=None) -> dict:
+    P, n = len(problems), problems[0].n
+    with span("build", backend="cbc", materials=P * n, problems=P):
+        prob, x = build_joint(problems, qty, stock)
+    with span("solve", backend="cbc", materials=P * n, problems=P):
+        prob.solve(solver or PULP_CBC_CMD(msg=False))
+    status = LpStatus.get(prob.status, str(prob.status))
+    if status != STATUS_OPTIMAL:
+        return _report(ids, qty, problems, None, stock, None, status, METHOD_JOINT)
+    X = np.array([v.varValue for v in x], dtype=float).reshape(P, n)
+    cons = prob.constraints
+    prices = np.array([0.0 - (cons[f"inv_{j}"].pi or 0.0) if f"inv_{j}" in cons else 0.0 for j in range(n)])
+    return _report(ids, qty, problems, X, stock, prices, status, METHOD_JOINT)
+
+
+# =========================
+# DANTZIG-WOLFE
+# =========================
+def _price(problems: list[MixProblem], cost: np.ndarray, sf=None, basis=None):
+    # Every project re-solved with its own cost vector -> (status, x, basis). On the dense path only
+    # the costs change between rounds, so the previous basis stays primal feasible and warm-starts.
+    if sf is not None:
+        sf.c[:] = cost
+        sf.obj_offset[:] = np.einsum("bn,bn->b", sf.c, sf.lb)
+        out = solve_standard(sf, basis=basis)
+        return out.status, out.x, out.basis
+    status, X = [], []
+    for p, c in zip(problems, cost):
+        s, res = solve_problem(replace(p, cost=c))
+        status.append(s)
+        X.append(np.array(list(res["solution"].values())) if res else np.full(p.n, np.nan))
+    return np.array(status), np.array(X), None
+
+
+def _master(K: np.ndarray, Xc: np.ndarray, qty, base_cost, stock, penalty: float):
+    # min Σ cost(col) λ  s.t.  Σ usage(col) λ - over_j <= stock_j,  Σ_{cols of p} λ = 1.
+    # over_j (priced at `penalty`) keeps the master feasible before enough columns exist.
+    prob = LpProblem("Portfolio_Master", LpMinimize)
+    lam = [LpVariable(f"l_{i}", lowBound=0) for i in range(len(K))]
+    limited = np.flatnonzero(np.isfinite(stock))
+    over = {j: LpVariable(f"o_{j}", lowBound=0) for j in limited}
+    cost = qty[K] * np.einsum("cn,cn->c", base_cost[K], Xc)
+    use = qty[K, None] * Xc / 100.0
+    prob += LpAffineExpression(list(zip(lam, cost.tolist())) + [(v, penalty) for v in over.values()])
+    for j in limited:
+        nz = np.flatnonzero(use[:, j])
+        expr = LpAffineExpression([(lam[i], v) for i, v in zip(nz.tolist(), use[nz, j].tolist())] + [(over[j], -1.0)])
+        prob += LpConstraint(expr, LpConstraintLE, f"inv_{j}", float(stock[j]))
+    order = np.argsort(K, kind="stable")
+    for k, idx in enumerate(np.split(order, np.cumsum(np.bincount(K, minlength=len(qty)))[:-1])):
+        prob += LpConstraint(LpAffineExpression([(lam[i], 1.0) for i in idx.tolist()]), LpConstraintEQ, f"conv_{k}", 1.0)
+    prob.solve(PULP_CBC_CMD(msg=False))
+    return prob, lam, over, cost
+
+
+def _overrun(over: dict) -> bool:
+    return any((v.varValue or 0.0) > TOL for v in over.values())
+
+
+def _duals(prob, n: int, P: int) -> tuple[np.ndarray, np.ndarray]:
+    cons = prob.constraints
+    pi = np.array([cons[f"inv_{j}"].pi or 0.0 if f"inv_{j}" in cons else 0.0 for j in range(n)])
+    mu = np.array([cons[f"conv_{k}"].pi or 0.0 for k in range(P)])
+    return pi, mu
+
+
+def _phase1(problems, qty, stock, K, Xc, sf, basis, max_rounds: int):
+    # Column generation on total overrun alone (zero mix cost, overrun priced at 1). Returns
+    # (K, Xc, basis, rounds, status): Optimal once the master fits the stock, Infeasible when no
+    # project can propose a mix that lowers the overrun any further, Not Solved out of rounds.
+    P, n = len(problems), problems[0].n
+    zero = np.zeros((P, n))
+    for rounds in range(1, max_rounds + 1):
+        with span("master_phase1", backend="cbc", problems=P) as s:
+            prob, _, over, _ = _master(K, Xc, qty, zero, stock, 1.0)
+            s["columns"] = len(K)
+        if not _overrun(over):
+            return K, Xc, basis, rounds, STATUS_OPTIMAL
+        pi, mu = _duals(prob, n, P)
+        priced = np.broadcast_to(-pi[None, :] / 100.0, (P, n)).copy()
+        with span("solve", backend="dense", materials=n, problems=P):
+            _, Xk, basis = _price(problems, priced, sf, basis)
+        rc = qty * np.einsum("pn,pn->p", priced, Xk) - mu
+        new = np.flatnonzero(rc < -RC_TOL * (1.0 + np.abs(mu)))
+        if len(new) == 0:
+            return K, Xc, basis, rounds, "Infeasible"
+        K, Xc = np.concatenate([K, new]), np.vstack([Xc, Xk[new]])
+    return K, Xc, basis, max_rounds, STATUS_NOT_SOLVED
+
+
+def solve_decomposed(ids, qty, problems, stock, max_rounds: int = 200) -> dict:
+    P, n = len(problems), problems[0].n
+    base_cost = np.stack([p.cost for p in problems])
+    sf = stack_problems(problems) if n <= DENSE_MAX_N else None
+    with span("solve", backend="dense", materials=n, problems=P):
+        status, X0, basis = _price(problems, base_cost, sf)
+    if (status != STATUS_OPTIMAL).any():
+        # Some project cannot be mixed even with unlimited stock.
+        return _report(ids, qty, problems, None, stock, None, status[status != STATUS_OPTIMAL][0], METHOD_DECOMPOSED)
+
+    K, Xc = np.arange(P), X0
+    rounds = 0
+    used = (qty[:, None] * X0).sum(axis=0) / 100.0
+    if (used > stock + TOL * (1.0 + np.abs(stock))).any():
+        # Phase 1 before pricing on cost: a big-M overrun penalty alone stalls on infeasible portfolios.
+        # Leaves at least one round for the cost phase, whose master is the plan returned.
+        K, Xc, basis, rounds, status = _phase1(problems, qty, stock, K, Xc, sf, basis, max_rounds - 1)
+        if status != STATUS_OPTIMAL:
+            return _report(ids, qty, problems, None, stock, None, status, METHOD_DECOMPOSED,
+                           rounds=rounds, converged=status != STATUS_NOT_SOLVED)
+
+    # Cost of a tonne of stock overrun; raised while the master still needs it at convergence.
+    penalty = 1e3 * (1.0 + 100.0 * float(np.abs(base_cost).max()))
+    lower = -np.inf
+    converged = False  # stays False if max_rounds runs out before the gap closes
+    while rounds < max_rounds:
+        rounds += 1
+        with span("master", backend="cbc", problems=P) as s:
+            prob, lam, over, cost = _master(K, Xc, qty, base_cost, stock, penalty)
+            s["columns"] = len(K)
+        pi, mu = _duals(prob, n, P)
+        upper = float(prob.objective.value() or 0.0)
+
+        # Inventory prices (pi <= 0) make scarce additives dearer in every project at once.
+        priced = base_cost - pi[None, :] / 100.0
+        with span("solve", backend="dense", materials=n, problems=P):
+            _, Xk, basis = _price(problems, priced, sf, basis)
+        rc = qty * np.einsum("pn,pn->p", priced, Xk) - mu
+        lower = max(lower, upper + float(np.minimum(rc, 0.0).sum()))
+        new = np.flatnonzero(rc < -TOL * (1.0 + np.abs(upper) / P))
+        if len(new) == 0 or upper - lower <= TOL * (1.0 + abs(upper)):
+            if not _overrun(over) or penalty > 1e12:
+                converged = True
+                break
+            penalty *= 1e3
+            lower = -np.inf
+        K, Xc = np.concatenate([K, new]), np.vstack([Xc, Xk[new]])
+
+    if _overrun(over):
+        # Still leaning on overrun: proven infeasible at the top penalty, otherwise undecided.
+        status = "Infeasible" if converged else STATUS_NOT_SOLVED
+        return _report(ids, qty, problems, None, stock, None, status, METHOD_DECOMPOSED, rounds=rounds, converged=converged)
+    # Out of rounds, the columns priced after the last master are not in it yet.
+    K, Xc = K[:len(lam)], Xc[:len(lam)]
+    weights = np.array([l.varValue or 0.0 for l in lam])
+    X = np.zeros((P, n))
+    np.add.at(X, K, weights[:, None] * Xc)
+    # Out of rounds the plan is feasible (no overrun) but only within `gap` of the optimum.
+    return _report(ids, qty, problems, X, stock, 0.0 - pi, STATUS_OPTIMAL, METHOD_DECOMPOSED, rounds=rounds,
+                   columns=len(K), gap=float(max(upper - lower, 0.0) / max(abs(upper), 1e-10)), converged=converged)
+
+
+def solve_portfolio(ids, qty, problems, stock, method: str = "auto") -> dict:
+    if method == "auto":
+        method = METHOD_DECOMPOSED if len(problems) * problems[0].n > JOINT_MAX_VARS else METHOD_JOINT
+    if method == METHOD_DECOMPOSED:
+        return solve_decomposed(ids, qty, problems, stock)
+    return solve_joint(ids, qty, problems, stock)
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Design mixes for many projects sharing one additive inventory.")
+    ap.add_argument("--projects", required=True, metavar="CSV",
+                    help=f"one project per row: {PROJECT_COL}, {QTY_COL} and any sidebar parameter columns")
+    ap.add_argument("--stock", required=True, metavar="CSV", help=f"material,{STOCK_COL} (tonnes); missing materials are unlimited")
+    ap.add_argument("--table", metavar="FILE", help="additive table, CSV or Parquet (default: built-in table)")
+    ap.add_argument("--method", default="auto", choices=["auto", METHOD_JOINT, METHOD_DECOMPOSED])
+    ap.add_argument("--out", help="per-project results CSV")
+    add_log_arg(ap)
+    args = ap.parse_args(argv)
+    setup_logging(args.log_level)
+
+    try:
+        table = read_table(args.table) if args.table else pd.DataFrame(DEFAULT_TABLE)
+    except ValueError as e:
+        ap.error(str(e))
+    base = problem_from_df(table, **DEFAULT_PARAMS)
+    ids, qty, problems = projects_from_df(base, pd.read_csv(args.projects))
+    stock = stock_from_df(pd.read_csv(args.stock), base.materials)
+    res = solve_portfolio(ids, qty, problems, stock, args.method)
+    print(f"{res['status']} ({res['method']}), {len(problems)} projects, total cost {res.get('total_cost', float('nan')):,.2f}")
+    if not res.get("converged", True):
+        print(f"not converged after {res['rounds']} rounds (gap {res.get('gap', float('nan')):.2%})")
+    if res["inventory"]:
+        print(pd.DataFrame(res["inventory"]).to_string(index=False))
+    if args.out and res["projects"]:
+        rows = [{k: v for k, v in r.items() if k != "solution"} | {f"x_{m}": x for m, x in r["solution"].items()} for r in res["projects"]]
+        pd.DataFrame(rows).to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# result_cache.py
+# Content-addressed cache for soil mix solves.
+#
+# Key = SHA-256 of the canonical problem (coerced additive table as float64 arrays, material
+# names, mode, limits and base values). Entries live in an in-memory LRU and, optionally, in a
+# directory of JSON files that several Streamlit sessions or worker processes can share.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from lp_core import MixProblem
+from metrics import span
+
+KEY_VERSION = b"soil-lp/2"  # bump when the cached result layout changes
+
+
+def problem_key(p: MixProblem) -> str:
+    h = hashlib.sha256(KEY_VERSION)
+    h.update("\x1f".join(p.materials).encode("utf-8"))
+    for arr in (p.cost, p.lb, p.ub, p.coef, p.base):
+        a = np.ascontiguousarray(arr, dtype=np.float64)
+        h.update(str(a.shape).encode())
+        h.update(a.tobytes())
+    h.update(p.mode.encode())
+    h.update(np.array([p.additive_cap, p.ucs_limit, p.pi_max, p.w_max], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def cache_key(p: MixProblem, tag: str = "") -> str:
+    # problem_key, kept apart per `tag` for results that depend on more than the problem
+    # (e.g. a chosen backend or time limit).
+    key = problem_key(p)
+    if tag:
+        key = hashlib.sha256(f"{key}\x1f{tag}".encode("utf-8")).hexdigest()
+    return key
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = 512, path: str | None = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    # ---- disk store (one JSON file per key, written atomically) ----
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def _disk_get(self, key: str):
+        if not self.path:
+            return None
+        try:
+            with open(self._file(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, key: str, value):
+        if not self.path:
+            return
+        target = self._file(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp, target)
+
+    # ---- LRU ----
+    def _remember(self, key: str, value):
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return self._mem[key]
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._remember(key, value)
+        self._disk_put(key, value)
+
+    def solve(self, p: MixProblem, solve_fn, tag: str = ""):
+        # Returns solve_fn(p) -> (status, res), skipping build and solve on a hit (tag: see cache_key).
+        with span("cache_lookup") as s:
+            key = cache_key(p, tag)
+            cached = self.get(key)
+            s["hit"] = cached is not None
+        if cached is not None:
+            return cached[0], cached[1]
+        status, res = solve_fn(p)
+        self.put(key, [status, res])
+        return status, res
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._mem),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
@@ -0,0 +1,158 @@
+# robust.py
+# Robust / chance-constrained mix design and Monte Carlo validation for uncertain coefficients.
+#
+# Uncertainty is one standard deviation per coefficient (3 × n, rows UCS/PI/W), read from optional
+# UCS_sd / PI_sd / W_sd catalog columns, else from a range UCS_lo..UCS_hi (etc.) taken as a uniform
+# coefficient, sd = (hi - lo) / (2√3), else set as a fraction of |coef|. Each UCS/PI/W row must hold
+# with probability >= target:
+#
+#   box      every coefficient moves z·sd against its limit (worst case of a box; x >= 0 makes
+#            that a plain LP with shifted coefficients, solvable by every existing path)
+#   chance   normal approximation  a·x ∓ z·‖sd∘x‖ (>= / <=) limit, a convex constraint solved by
+#            adding linear cuts until it holds (less conservative than box)
+#
+# with z = Φ⁻¹(target). simulate() then checks a mix against many coefficient draws at once.
+
+from dataclasses import replace
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from backends import solve_arrays, solve_problem
+from dense_solver import STATUS_OPTIMAL
+from lp_core import COEF_COLS, PROPS, MixProblem, extract_result
+from metrics import span
+
+METHOD_BOX = "box"
+METHOD_CHANCE = "chance"
+DIST_NORMAL = "normal"
+DIST_UNIFORM = "uniform"
+
+SD_COLS = ["UCS_sd", "PI_sd", "W_sd"]
+RANGE_COLS = [("UCS_lo", "UCS_hi"), ("PI_lo", "PI_hi"), ("W_lo", "W_hi")]
+MC_CHUNK = 4_000_000  # coefficient draws held in memory at once
+TOL = 1e-6
+
+
+def coef_sd(df: pd.DataFrame, rel: float = 0.0) -> np.ndarray:
+    # (3, n): *_sd columns where present and filled, then *_lo/*_hi ranges where both are filled,
+    # rel·|coef| everywhere else.
+    coef = df[COEF_COLS].to_numpy(dtype=float).T
+    sd = rel * np.abs(coef)
+    for i, (lo, hi) in enumerate(RANGE_COLS):
+        if lo in df.columns and hi in df.columns:
+            v = np.abs(sd_from_range(pd.to_numeric(df[lo], errors="coerce"), pd.to_numeric(df[hi], errors="coerce")))
+            sd[i] = np.where(np.isnan(v), sd[i], v)
+    for i, col in enumerate(SD_COLS):
+        if col in df.columns:
+            v = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+            sd[i] = np.where(np.isnan(v), sd[i], np.abs(v))
+    return sd
+
+
+def sd_from_range(lo, hi) -> np.ndarray:
+    return (np.asarray(hi, dtype=float) - np.asarray(lo, dtype=float)) / (2.0 * np.sqrt(3.0))
+
+
+def z_value(target: float) -> float:
+    return NormalDist().inv_cdf(target)
+
+
+def _prop_sign(p: MixProblem) -> np.ndarray:
+    # +1 where a larger UCS/PI/W value works against its limit (<= rows), -1 for the >= UCS row.
+    _, sense, _ = p.rows()
+    return np.where(sense[1:] > 0, -1.0, 1.0)
+
+
+# =========================
+# ROBUST COUNTERPARTS
+# =========================
+def robust_problem(p: MixProblem, sd: np.ndarray, z: float) -> MixProblem:
+    return replace(p, coef=p.coef + _prop_sign(p)[:, None] * z * sd)
+
+
+def solve_chance(p: MixProblem, sd: np.ndarray, z: float, max_cuts: int = 200) -> tuple[str, np.ndarray | None, int, bool]:
+    # Kelley cutting planes: ‖S x‖ >= (S²x_k / ‖S x_k‖)·x, so each cut is a valid outer
+    # approximation; stop once the current mix meets every row to TOL. Returns (status, x, cuts,
+    # converged); converged is False when max_cuts ran out first and x still violates a row.
+    A, sense, rhs = p.rows()
+    lim = rhs[1:]
+    g = _prop_sign(p)
+    cuts = 0
+    while True:
+        sol = solve_arrays(p.cost, A, sense, rhs, p.lb, p.ub)
+        status, x = sol.status, sol.x
+        if status != STATUS_OPTIMAL:
+            return status, None, cuts, True
+        spread = np.sqrt(((sd * x) ** 2).sum(axis=1))
+        viol = g * (p.coef @ x - lim) + z * spread
+        bad = np.flatnonzero(viol > TOL * (1.0 + np.abs(lim)))
+        if len(bad) == 0 or cuts >= max_cuts:
+            return status, x, cuts, len(bad) == 0
+        grad = sd[bad] ** 2 * x / spread[bad, None]
+        A = np.vstack([A, p.coef[bad] + g[bad, None] * z * grad])
+        sense = np.concatenate([sense, sense[1 + bad]])
+        rhs = np.concatenate([rhs, lim[bad]])
+        cuts += len(bad)
+
+
+def solve_robust(p: MixProblem, sd: np.ndarray, target: float = 0.95, method: str = METHOD_CHANCE):
+    # Same (status, res) as lp_core.solve_lp; res["robust"] records how the mix was chosen.
+    z = z_value(target)
+    with span("robust_solve", method=method, materials=p.n) as s:
+        if method == METHOD_BOX:
+            status, res = solve_problem(robust_problem(p, sd, z))
+            cuts, converged = 0, True
+            x = None if res is None else np.array(list(res["solution"].values()))
+        else:
+            status, x, cuts, converged = solve_chance(p, sd, z)
+        s["cuts"] = cuts
+        s["converged"] = converged
+    if status != STATUS_OPTIMAL:
+        return status, None
+    res = extract_result(p, x)
+    res["robust"] = {"method": method, "target": target, "z": z, "cuts": cuts, "converged": converged}
+    return status, res
+
+
+# =========================
+# MONTE CARLO
+# =========================
+def simulate(p: MixProblem, x, sd: np.ndarray, draws: int = 100_000, dist: str = DIST_NORMAL, seed=None) -> dict:
+    # Draws every coefficient independently (normal, or uniform with the same sd) and reports,
+    # per limit, how often the mix meets it; "joint" is the share of draws meeting all of them.
+    rng = np.random.default_rng(seed)
+    x = np.asarray(x, dtype=float)
+    _, _, rhs = p.rows()
+    g = _prop_sign(p)
+    limits = rhs[1:] + p.base
+    spread = sd * x  # (3, n)
+    step = max(1, MC_CHUNK // max(spread.size, 1))
+
+    props = np.empty((draws, 3))
+    with span("monte_carlo", materials=p.n, problems=draws):
+        for a in range(0, draws, step):
+            k = min(step, draws - a)
+            if dist == DIST_UNIFORM:
+                Z = rng.uniform(-np.sqrt(3.0), np.sqrt(3.0), (k,) + spread.shape)
+            else:
+                Z = rng.standard_normal((k,) + spread.shape)
+            props[a:a + k] = np.einsum("kin,in->ki", Z, spread)
+        props += p.base + p.coef @ x
+        ok = g * (props - limits) <= 1e-9 * (1.0 + np.abs(limits))
+
+    q05, q50, q95 = np.quantile(props, [0.05, 0.5, 0.95], axis=0)
+    rows = [
+        {
+            "property": name,
+            "limit": float(limits[i]),
+            "nominal": float(p.base[i] + p.coef[i] @ x),
+            "p05": float(q05[i]),
+            "p50": float(q50[i]),
+            "p95": float(q95[i]),
+            "prob": float(ok[:, i].mean()),
+        }
+        for i, name in enumerate(PROPS)
+    ]
+    return {"draws": draws, "dist": dist, "rows": rows, "joint": float(ok.all(axis=1).mean())}
@@ -0,0 +1,138 @@
+# sensitivity.py
+# Shadow prices, reduced costs and ranging for the soil mix LP, read off the optimal basis
+# of the dense solve (no extra solves). HiGHS and CBC report duals and reduced costs but no basis,
+# so from_duals() gives the same report without the ranging columns.
+#
+# Conventions (all in the units the user edits):
+#   dual           d(total cost) / d(limit) for cap, UCS, PI, W  (base values act with the opposite sign)
+#   reduced_cost   c_j - Σ_rows dual_i a_ij  (0 for a material strictly between its bounds)
+#   limit_lo/hi    range of the limit over which the current basis (and the dual) stays valid
+#   cost_lo/hi     range of a material's cost over which the current mix stays optimal
+
+import numpy as np
+
+from dense_solver import STATUS_OPTIMAL, solve_standard, stack_problems
+from lp_core import ROW_NAMES, MixProblem, extract_result
+from metrics import span
+
+TOL = 1e-9
+
+
+def basis_matrix(K: np.ndarray, basis: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    # Artificials left in the basis (redundant rows, value 0) stand in for their row's slack.
+    R = K.shape[0]
+    cols = np.where(basis >= n + R, basis - R, basis)
+    return K[:, cols], cols
+
+
+def analyze(p: MixProblem, M: np.ndarray, b: np.ndarray, row_sign: np.ndarray, basis: np.ndarray) -> dict:
+    R, n = M.shape
+    m = len(row_sign)
+    K = np.hstack([M, np.eye(R)])
+    c_full = np.concatenate([p.cost, np.zeros(R)])
+
+    Bm, cols = basis_matrix(K, basis, n)
+    xB = np.linalg.solve(Bm, b)
+    y = np.linalg.solve(Bm.T, c_full[cols])
+    d = c_full - K.T @ y
+    d[cols] = 0.0
+
+    # ---- rows: duals and RHS ranging ----
+    A, _, rhs = p.rows()
+    limits = [p.additive_cap, p.ucs_limit, p.pi_max, p.w_max]
+    x = np.zeros(n + R)
+    x[cols] = xB
+    xv = p.lb + x[:n]
+    activity = A @ xv + np.concatenate([[0.0], p.base])
+
+    Binv = np.linalg.inv(Bm)
+    rows = []
+    for i in range(m):
+        col = Binv[:, i]
+        with np.errstate(divide="ignore"):
+            up = np.min(np.where(col < -TOL, xB / -col, np.inf))
+            down = np.min(np.where(col > TOL, xB / col, np.inf))
+        # Ranging is on the <= form; >= rows (sign -1) swap directions.
+        lo, hi = (-down, up) if row_sign[i] > 0 else (-up, down)
+        rows.append(
+            {
+                "row": ROW_NAMES[i],
+                "limit": float(limits[i]),
+                "activity": float(activity[i]),
+                "slack": float(x[n + i]),
+                "dual": float(y[i] * row_sign[i]),
+                "limit_lo": float(limits[i] + lo),
+                "limit_hi": float(limits[i] + hi),
+            }
+        )
+
+    # ---- materials: reduced costs and cost ranging ----
+    # Bound rows sit after the general rows; their duals fold into the material reduced cost.
+    rc = d[:n] + y[m:m + n]
+    alpha = Binv @ K
+    nonbasic = np.ones(n + R, dtype=bool)
+    nonbasic[cols] = False
+    pos = {int(j): r for r, j in enumerate(cols)}
+
+    materials = []
+    for j in range(n):
+        if j in pos:
+            a = alpha[pos[j]]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = d / a
+            inc = np.min(np.where(nonbasic & (a > TOL), ratio, np.inf))
+            dec = np.min(np.where(nonbasic & (a < -TOL), -ratio, np.inf))
+        else:
+            inc, dec = np.inf, d[j]
+        materials.append(
+            {
+                "material": p.materials[j],
+                "x": float(xv[j]),
+                "cost": float(p.cost[j]),
+                "reduced_cost": float(rc[j]),
+                "cost_lo": float(p.cost[j] - dec),
+                "cost_hi": float(p.cost[j] + inc),
+            }
+        )
+
+    return {"rows": rows, "materials": materials}
+
+
+def from_duals(p: MixProblem, x: np.ndarray, duals: np.ndarray, reduced_costs: np.ndarray) -> dict:
+    # duals: d(objective) / d(rhs) per row of p.rows(), which is d(total cost) / d(limit).
+    A, _, rhs = p.rows()
+    limits = [p.additive_cap, p.ucs_limit, p.pi_max, p.w_max]
+    ax = A @ x
+    activity = ax + np.concatenate([[0.0], p.base])
+    rows = [
+        {
+            "row": ROW_NAMES[i],
+            "limit": float(limits[i]),
+            "activity": float(activity[i]),
+            "slack": float(abs(rhs[i] - ax[i])),
+            "dual": float(duals[i]) + 0.0,
+        }
+        for i in range(len(rhs))
+    ]
+    materials = [
+        {"material": m, "x": float(v), "cost": float(c), "reduced_cost": float(d) + 0.0}
+        for m, v, c, d in zip(p.materials, x, p.cost, reduced_costs)
+    ]
+    return {"rows": rows, "materials": materials}
+
+
+def solve_with_sensitivity(p: MixProblem):
+    # Same (status, res) as lp_core.solve_lp; res["sensitivity"] carries the report.
+    with span("build", backend="dense", materials=p.n, problems=1):
+        sf = stack_problems([p])
+    with span("solve", backend="dense", materials=p.n, rows=sf.M.shape[1]) as s:
+        out = solve_standard(sf)
+        s["iterations"] = int(out.iterations[0])
+    status = out.status[0]
+    if status != STATUS_OPTIMAL:
+        return status, None
+    with span("extract", backend="dense"):
+        res = extract_result(p, out.x[0])
+    with span("sensitivity", backend="dense"):
+        res["sensitivity"] = analyze(p, sf.M[0], sf.b[0], sf.row_sign[0], out.basis[0])
+    return status, res
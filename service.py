@@ -0,0 +1,455 @@
+# service.py
+# Local HTTP/JSON solve service for other tools (headless; stdlib http.server + backends).
+#
+#   POST /solve         {"params": {...}, "table": {...}?, "backend": "auto"?, "timeout": s?}
+#                       -> {"key", "status", "result"}               (waits up to timeout)
+#   POST /solve/batch   {"params": [{...}, ...], "table": {...}?, "backend"?, "timeout"?}
+#                       -> {"results": [{"key", "status", "result"}, ...]}
+#   POST /jobs          same body as /solve -> 202 {"key"}; poll GET /jobs/<key>
+#   GET  /jobs/<key>    200 {"key", "status", "result"} | 200 {"key", "error"} | 202 {"key", "pending": true}
+#                       | 404 (never submitted through /jobs, or finished more than JOB_TTL ago)
+#   GET  /health        queue depth, in-flight jobs, counters
+#   GET  /metrics       Prometheus text (metrics.py)
+#
+# params use the keys of lp_core.DEFAULT_PARAMS (missing keys take the defaults); table has the
+# columns of lp_core.DEFAULT_TABLE (default: the built-in table).
+#
+# Every problem becomes a job on one queue served by a pool of worker threads:
+#   coalescing    identical problems (result_cache.cache_key incl. backend) share one in-flight
+#                 job; finished results stay in a ResultCache, so repeats never queue
+#   batching      a worker takes up to BATCH_MAX queued jobs at once and solves the dense-sized
+#                 ones of equal size as one stacked dense solve, so throughput grows with load
+#   backpressure  more than QUEUE_MAX queued problems -> 503 + Retry-After (batches all or none)
+#   timeouts      a request waits at most its timeout (504 after that); a job whose waiters have
+#                 all given up is dropped before it is solved, and large models get the time left
+#                 as their solver time limit
+#
+# Run:
+#   python service.py --port 8765 --workers 4
+#   curl -s localhost:8765/solve -d '{"params": {"ucs_limit": 300, "mode": "cap"}}'
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from backends import AUTO, SolveOptions, get_backend, select_backend, solve_problem, solve_problems
+from catalog import coerce_numeric, describe_issues, find_issues
+from dense_solver import DENSE_MAX_N, STATUS_NOT_SOLVED
+from lp_core import DEFAULT_PARAMS, DEFAULT_TABLE, MODE_CAP, MODE_COST, PARAM_NAMES, MixProblem, apply_params, problem_from_df
+from metrics import add_log_arg, prometheus_text, setup_logging, span
+from result_cache import ResultCache, cache_key
+
+log = logging.getLogger("soil_lp.service")
+
+QUEUE_MAX = 10_000        # queued problems before new work is refused (503)
+BATCH_MAX = 256           # jobs a worker takes off the queue at once
+BATCH_REQUEST_MAX = 10_000  # problems per /solve/batch call
+DEFAULT_TIMEOUT = 30.0    # seconds a request waits for its result
+MAX_TIMEOUT = 600.0
+JOB_TTL = 600.0           # /jobs submissions: how long a queued job stays worth solving, and how
+                          # long its result (or error) stays pollable once finished
+TABLE_CACHE = 64          # parsed additive tables kept (by content)
+RETRY_AFTER = 1           # seconds, sent with 503
+
+
+class Busy(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    key: str
+    problem: MixProblem
+    backend: str
+    deadline: float  # time.monotonic(); extended when a coalesced request waits longer
+    keep: bool = False  # submitted through /jobs: kept in SolveService._done once finished
+    queued: float = field(default_factory=time.monotonic)
+    future: Future = field(default_factory=Future)
+
+
+# =========================
+# SERVICE
+# =========================
+class SolveService:
+    def __init__(self, workers: int | None = None, queue_max: int = QUEUE_MAX, batch_max: int = BATCH_MAX, cache_size: int = 65536):
+        self.queue_max = queue_max
+        self.batch_max = batch_max
+        self.cache = ResultCache(maxsize=cache_size)
+        self.counts = {"requests": 0, "coalesced": 0, "cached": 0, "rejected": 0, "expired": 0, "solved": 0}
+        self._queue = queue.SimpleQueue()
+        self._queued = 0
+        self._inflight: dict[str, Job] = {}
+        self._done = OrderedDict()  # /jobs key -> (expires, result, error), oldest first
+        self._lock = threading.Lock()
+        self._tables = OrderedDict()
+        self._tables_lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"solve-worker-{i}", daemon=True)
+            for i in range(workers or os.cpu_count() or 1)
+        ]
+        for t in self._workers:
+            t.start()
+
+    def close(self):
+        for _ in self._workers:
+            self._queue.put(None)
+        for t in self._workers:
+            t.join()
+
+    # ---- input ----
+    def base_problem(self, table: dict | None) -> MixProblem:
+        # Parsed and validated once per distinct table; raises ValueError on a bad table.
+        tkey = "default" if table is None else hashlib.sha256(json.dumps(table, sort_keys=True).encode("utf-8")).hexdigest()
+        with self._tables_lock:
+            p = self._tables.get(tkey)
+            if p is not None:
+                self._tables.move_to_end(tkey)
+                return p
+        try:
+            df = coerce_numeric(pd.DataFrame(DEFAULT_TABLE if table is None else table))
+        except (TypeError, ValueError, KeyError) as e:
+            raise ValueError(f"bad table: {e}") from None
+        issues = find_issues(df)
+        if not issues.empty:
+            raise ValueError(f"bad table: {describe_issues(issues)}")
+        p = problem_from_df(df, **DEFAULT_PARAMS)
+        with self._tables_lock:
+            self._tables[tkey] = p
+            while len(self._tables) > TABLE_CACHE:
+                self._tables.popitem(last=False)
+        return p
+
+    @staticmethod
+    def with_params(base: MixProblem, params: dict | None) -> MixProblem:
+        params = {} if params is None else params
+        if not isinstance(params, dict):
+            raise ValueError("params must be a JSON object")
+        unknown = sorted(set(params) - set(PARAM_NAMES))
+        if unknown:
+            raise ValueError(f"unknown params: {', '.join(unknown)} (known: {', '.join(PARAM_NAMES)})")
+        if params.get("mode", MODE_COST) not in (MODE_COST, MODE_CAP):
+            raise ValueError(f"mode must be {MODE_COST!r} or {MODE_CAP!r}")
+        for k, v in params.items():
+            if k == "mode":
+                continue
+            # JSON numbers like 1e400 decode to inf, which the solvers turn into NaN pivots.
+            if isinstance(v, bool) or not isinstance(v, (int, float)) or not math.isfinite(v):
+                raise ValueError(f"bad params: {k} must be a finite number")
+        return apply_params(base, params)
+
+    # ---- submit ----
+    def submit_many(self, problems: list[MixProblem], backend: str = AUTO, timeout: float = DEFAULT_TIMEOUT,
+                    keep: bool = False) -> list[tuple[str, Future]]:
+        # (key, future) per problem; the future resolves to (status, res). Raises Busy if the
+        # new jobs do not fit in the queue (nothing is queued then). keep: pollable via poll().
+        if backend != AUTO:
+            # Unknown, unavailable or unfit for the model size (dense past DENSE_MAX_N): a 400, not a stuck worker.
+            for n in {p.n for p in problems}:
+                get_backend(backend, n)
+        tag = "" if backend == AUTO else backend
+        deadline = time.monotonic() + timeout
+        keys = [cache_key(p, tag) for p in problems]
+        out, new = [], {}
+        with self._lock:
+            self.counts["requests"] += len(problems)
+            for key, p in zip(keys, problems):
+                job = self._inflight.get(key) or new.get(key)
+                if job is not None:
+                    job.deadline = max(job.deadline, deadline)
+                    job.keep = job.keep or keep
+                    self.counts["coalesced"] += 1
+                    out.append((key, job.future))
+                    continue
+                cached = self.cache.get(key)
+                if cached is not None:
+                    f = Future()
+                    f.set_result((cached[0], cached[1]))
+                    self.counts["cached"] += 1
+                    if keep:
+                        self._keep(key, (cached[0], cached[1]), None)
+                    out.append((key, f))
+                    continue
+                job = new[key] = Job(key, p, backend, deadline, keep)
+                out.append((key, job.future))
+            if self._queued + len(new) > self.queue_max:
+                self.counts["rejected"] += len(problems)
+                raise Busy(f"queue full ({self._queued} queued)")
+            self._queued += len(new)
+            self._inflight.update(new)
+        for job in new.values():
+            self._queue.put(job)
+        return out
+
+    def submit(self, p: MixProblem, backend: str = AUTO, timeout: float = DEFAULT_TIMEOUT, keep: bool = False) -> tuple[str, Future]:
+        return self.submit_many([p], backend, timeout, keep)[0]
+
+    def _keep(self, key: str, result, error: Exception | None):
+        # Caller holds self._lock. Entries share one TTL, so expired ones sit at the front.
+        now = time.monotonic()
+        self._done.pop(key, None)
+        self._done[key] = (now + JOB_TTL, result, error)
+        while self._done and next(iter(self._done.values()))[0] <= now:
+            self._done.popitem(last=False)
+
+    def poll(self, key: str):
+        # (done, status, res, error) for /jobs/<key>; None if the key was never submitted with
+        # keep=True or finished more than JOB_TTL ago. error: message of a failed job.
+        with self._lock:
+            if key in self._inflight:
+                return False, None, None, None
+            done = self._done.get(key)
+        if done is None or done[0] <= time.monotonic():
+            return None
+        _, result, error = done
+        if error is not None:
+            msg = "timeout" if isinstance(error, FutureTimeout) else f"{type(error).__name__}: {error}"
+            return True, None, None, msg
+        return True, result[0], result[1], None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counts, "queued": self._queued, "inflight": len(self._inflight), "jobs": len(self._done),
+                    "workers": len(self._workers)}
+
+    # ---- workers ----
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            while len(jobs) < self.batch_max:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._queue.put(None)  # leave the stop signal for this worker's next get()
+                    break
+                jobs.append(nxt)
+            with self._lock:
+                self._queued -= len(jobs)
+            self._run(jobs)
+
+    def _run(self, jobs: list[Job]):
+        now = time.monotonic()
+        live = []
+        for job in jobs:
+            if job.deadline <= now:
+                self._finish(job, error=FutureTimeout("expired in queue"))
+            else:
+                live.append(job)
+        # Auto jobs of equal size go through one stacked dense solve when there are enough of them
+        # for the stack to beat single solves (backends.select_backend with batch=); the rest run
+        # one at a time with their remaining time as the limit.
+        groups = {}
+        for job in live:
+            if job.backend == AUTO and job.problem.n <= DENSE_MAX_N:
+                groups.setdefault(job.problem.n, []).append(job)
+            else:
+                groups.setdefault(("single", job.key), []).append(job)
+        parts = []
+        for group in groups.values():
+            if len(group) > 1 and select_backend(group[0].problem.n, batch=len(group)) == "dense":
+                parts.append(group)
+            else:
+                parts.extend([j] for j in group)
+        for part in parts:
+            try:
+                with span("service_batch", problems=len(part), wait_ms=round((now - min(j.queued for j in part)) * 1000, 3)):
+                    if len(part) > 1:
+                        solved = solve_problems([j.problem for j in part])
+                    else:
+                        j = part[0]
+                        solved = [solve_problem(j.problem, j.backend, SolveOptions(time_limit=max(j.deadline - time.monotonic(), 1.0)))]
+            except Exception as e:  # a bad model must not take the worker down
+                log.exception("solve failed")
+                for job in part:
+                    self._finish(job, error=e)
+                continue
+            for job, (status, res) in zip(part, solved):
+                self._finish(job, (status, res))
+
+    def _finish(self, job: Job, result=None, error: Exception | None = None):
+        with self._lock:
+            # Stored before the job leaves _inflight, so poll() never sees a finished job as unknown.
+            if job.keep:
+                self._keep(job.key, result, error)
+            self._inflight.pop(job.key, None)
+            if error is None:
+                self.counts["solved"] += 1
+                # Time-limited "Not Solved" may succeed with more time; everything else is final.
+                if result[0] != STATUS_NOT_SOLVED:
+                    self.cache.put(job.key, [result[0], result[1]])
+            elif isinstance(error, FutureTimeout):
+                self.counts["expired"] += 1
+        if error is None:
+            job.future.set_result(result)
+        else:
+            job.future.set_exception(error)
+
+
+# =========================
+# HTTP
+# =========================
+def _payload(key: str, status: str, res: dict | None) -> dict:
+    return {"key": key, "status": status, "result": res}
+
+
+class Handler(BaseHTTPRequestHandler):
+    service: SolveService = None
+    protocol_version = "HTTP/1.1"  # keep-alive: one connection serves many requests
+    server_version = "SoilLP/1"
+
+    def log_message(self, fmt, *args):
+        log.debug("%s - %s", self.address_string(), fmt % args)
+
+    def _send(self, code: int, body, headers: dict | None = None, ctype: str = "application/json"):
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body, default=float).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, code: int, msg: str, **extra):
+        headers = {"Retry-After": str(RETRY_AFTER)} if code == 503 else None
+        self._send(code, {"error": msg, **extra}, headers)
+
+    def _body(self) -> dict:
+        n = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(n) or b"{}")
+        except ValueError:
+            raise ValueError("body is not valid JSON") from None
+        if not isinstance(body, dict):
+            raise ValueError("body must be a JSON object")
+        return body
+
+    @staticmethod
+    def _timeout(body: dict, default: float = DEFAULT_TIMEOUT) -> float:
+        timeout = body.get("timeout", default)
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or math.isnan(timeout):
+            raise ValueError("timeout must be a number of seconds")
+        return min(max(float(timeout), 0.0), MAX_TIMEOUT)
+
+    def do_GET(self):
+        try:
+            if self.path == "/health":
+                self._send(200, {"ok": True, **self.service.stats()})
+            elif self.path == "/metrics":
+                self._send(200, prometheus_text(), ctype="text/plain; version=0.0.4")
+            elif m := re.fullmatch(r"/jobs/([0-9a-f]{64})", self.path):
+                found = self.service.poll(m[1])
+                if found is None:
+                    self._error(404, "unknown job", key=m[1])
+                elif not found[0]:
+                    self._send(202, {"key": m[1], "pending": True})
+                elif found[3] is not None:
+                    self._send(200, {"key": m[1], "error": found[3]})
+                else:
+                    self._send(200, _payload(m[1], found[1], found[2]))
+            else:
+                self._error(404, "not found")
+        except Exception as e:
+            log.exception("request failed")
+            self._error(500, f"{type(e).__name__}: {e}")
+
+    def do_POST(self):
+        svc = self.service
+        try:
+            body = self._body()
+            backend = body.get("backend", AUTO)
+            base = svc.base_problem(body.get("table"))
+            if self.path == "/solve":
+                timeout = self._timeout(body)
+                key, fut = svc.submit(svc.with_params(base, body.get("params")), backend, timeout)
+                status, res = fut.result(timeout=timeout)
+                self._send(200, _payload(key, status, res))
+            elif self.path == "/solve/batch":
+                params = body.get("params")
+                if not isinstance(params, list):
+                    raise ValueError("params must be a list of objects")
+                if len(params) > BATCH_REQUEST_MAX:
+                    raise ValueError(f"at most {BATCH_REQUEST_MAX} problems per batch")
+                timeout = self._timeout(body)
+                end = time.monotonic() + timeout
+                subs = svc.submit_many([svc.with_params(base, p) for p in params], backend, timeout)
+                out = []
+                for key, fut in subs:
+                    try:
+                        status, res = fut.result(timeout=max(end - time.monotonic(), 0.0))
+                        out.append(_payload(key, status, res))
+                    except FutureTimeout:
+                        out.append({"key": key, "error": "timeout"})
+                self._send(200, {"results": out})
+            elif self.path == "/jobs":
+                key, _ = svc.submit(svc.with_params(base, body.get("params")), backend, self._timeout(body, JOB_TTL), keep=True)
+                self._send(202, {"key": key})
+            else:
+                self._error(404, "not found")
+        except Busy as e:
+            self._error(503, str(e))
+        except FutureTimeout:
+            self._error(504, "timeout")
+        except ValueError as e:
+            self._error(400, str(e))
+        except Exception as e:
+            log.exception("request failed")
+            self._error(500, f"{type(e).__name__}: {e}")
+
+
+class SolveServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # listen backlog for bursts of new connections
+
+
+def make_server(service: SolveService, host: str = "127.0.0.1", port: int = 8765) -> SolveServer:
+    # port=0 picks a free port (server.server_address[1]); call serve_forever() in a thread for tests.
+    handler = type("BoundHandler", (Handler,), {"service": service})
+    return SolveServer((host, port), handler)
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local HTTP/JSON service for the soil mix LP.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--queue-max", type=int, default=QUEUE_MAX)
+    ap.add_argument("--batch-max", type=int, default=BATCH_MAX)
+    add_log_arg(ap)
+    args = ap.parse_args(argv)
+    setup_logging(args.log_level)
+
+    service = SolveService(args.workers, args.queue_max, args.batch_max)
+    server = make_server(service, args.host, args.port)
+    print(f"serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# sweep.py
+# What-if scenario sweep over the soil mix LP (headless, uses lp_core).
+#
+# Every scenario is one set of sidebar values (mode, UCS target/cap, PI max, W max,
+# additive cap, base UCS/PI/W). Scenarios come from parameter ranges or from a CSV,
+# are solved across a process pool and streamed to an output CSV as they complete.
+# Re-running the same sweep with the same --out skips scenario ids that are already written.
+#
+# Run:
+#   python sweep.py --grid ucs_limit=200:300:5 --grid pi_max=12,15 --grid mode=cost,cap --out sweep.csv
+#   python sweep.py --scenarios scenarios.csv --table additives.csv --out sweep.csv
+
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from backends import solve_problems
+from catalog import read_table
+from lp_core import DEFAULT_PARAMS, DEFAULT_TABLE, PARAM_NAMES, apply_params, problem_from_df
+from metrics import add_log_arg, setup_logging
+
+RESULT_COLS = ["status", "total_cost", "add_used", "UCS", "PI", "W"]
+
+
+# =========================
+# SCENARIO SOURCES
+# =========================
+def parse_range(spec: str) -> list:
+    # "start:stop:step" (inclusive stop) or "v1,v2,...". Modes stay strings.
+    if ":" in spec:
+        start, stop, step = (float(v) for v in spec.split(":"))
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    values = [v.strip() for v in spec.split(",") if v.strip()]
+    try:
+        return [float(v) for v in values]
+    except ValueError:
+        return values
+
+
+def parse_grid(items: list[str]) -> dict[str, list]:
+    grid = {}
+    for item in items:
+        name, _, spec = item.partition("=")
+        if name not in DEFAULT_PARAMS:
+            raise ValueError(f"Unknown sweep parameter '{name}'. Use one of: {', '.join(PARAM_NAMES)}")
+        grid[name] = parse_range(spec)
+    return grid
+
+
+def iter_grid(grid: dict[str, list]) -> Iterator[tuple[int, dict]]:
+    # Lazy cartesian product; scenario id = position in the product (stable for the same --grid).
+    names = list(grid)
+    for sid, combo in enumerate(itertools.product(*(grid[n] for n in names))):
+        yield sid, {**DEFAULT_PARAMS, **dict(zip(names, combo))}
+
+
+def iter_csv(path: str, chunksize: int = 10_000) -> Iterator[tuple[int, dict]]:
+    # Streams the scenario file; scenario id = data row index. Missing columns/cells use defaults.
+    sid = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        cols = [c for c in PARAM_NAMES if c in chunk.columns]
+        for row in chunk[cols].to_dict("records"):
+            params = dict(DEFAULT_PARAMS)
+            params.update({k: v for k, v in row.items() if not pd.isna(v)})
+            yield sid, params
+            sid += 1
+
+
+def chunked(it: Iterator, size: int) -> Iterator[list]:
+    while True:
+        block = list(itertools.islice(it, size))
+        if not block:
+            return
+        yield block
+
+
+# =========================
+# WORKER
+# =========================
+_BASE = None
+
+
+def _init_worker(table: dict):
+    global _BASE
+    _BASE = problem_from_df(pd.DataFrame(table), **DEFAULT_PARAMS)
+
+
+def _solve_block(block: list[tuple[int, dict]]) -> list[dict]:
+    # Whole block in one batched in-process solve for small catalogs; the backend chosen for
+    # the catalog size otherwise (and for the rare dense iteration-limit case).
+    problems = [apply_params(_BASE, params) for _, params in block]
+    rows = []
+    for (sid, params), (status, res) in zip(block, solve_problems(problems)):
+        row = {"scenario_id": sid, **{k: params[k] for k in PARAM_NAMES}, "status": status}
+        if res is not None:
+            row.update({k: res[k] for k in RESULT_COLS[1:]})
+            row.update({f"x_{m}": v for m, v in res["solution"].items()})
+        rows.append(row)
+    return rows
+
+
+# =========================
+# OUTPUT / RESUME
+# =========================
+def done_ids(out_path: str, id_col: str = "scenario_id", dtype=int) -> set:
+    if not os.path.exists(out_path) or os.path.getsize(out_path) == 0:
+        return set()
+
+    # Drop a half-written last line left by an interrupted run.
+    with open(out_path, "rb+") as f:
+        data = f.read()
+        if not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+    ids = pd.read_csv(out_path, usecols=[id_col], dtype={id_col: str})[id_col]
+    return set(ids.dropna().astype(dtype).tolist())
+
+
+def run_pool(blocks, solve, write, out_path: str, columns: list[str], workers: int | None = None,
+             initializer=None, initargs=()) -> int:
+    # Shared by sweep and bulk: solve(block) runs across a process pool, each result is appended to
+    # out_path as it completes (write(f, result) -> rows written), and the CSV header is written
+    # once for a new or empty file. Returns the number of rows written.
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    new_file = not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+    with open(out_path, "a", newline="") as f, ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as pool:
+        if new_file:
+            csv.writer(f, lineterminator="\n").writerow(columns)
+
+        # Keep only a bounded number of blocks in flight so memory stays flat for any input size.
+        pending = set()
+        for block in blocks:
+            pending.add(pool.submit(solve, block))
+            if len(pending) >= 2 * workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                written += _drain(f, finished, write)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            written += _drain(f, finished, write)
+
+    return written
+
+
+def _drain(f, futures, write) -> int:
+    n = sum(write(f, fut.result()) for fut in futures)
+    f.flush()
+    return n
+
+
+def run_sweep(
+    scenarios: Iterator[tuple[int, dict]],
+    out_path: str,
+    table: dict | None = None,
+    workers: int | None = None,
+    block_size: int = 256,
+) -> int:
+    table = table or DEFAULT_TABLE
+    columns = ["scenario_id"] + PARAM_NAMES + RESULT_COLS + [f"x_{m}" for m in table["material"]]
+
+    skip = done_ids(out_path)
+    todo = ((sid, params) for sid, params in scenarios if sid not in skip)
+
+    def write(f, rows) -> int:
+        csv.DictWriter(f, fieldnames=columns, lineterminator="\n").writerows(rows)
+        return len(rows)
+
+    return run_pool(chunked(todo, block_size), _solve_block, write, out_path, columns, workers, _init_worker, (table,))
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Solve the soil mix LP for a grid or list of scenarios.")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--grid", action="append", metavar="NAME=SPEC",
+                     help="parameter range, e.g. ucs_limit=200:300:5 or mode=cost,cap (repeatable)")
+    src.add_argument("--scenarios", metavar="CSV", help="one scenario per row, columns named as the parameters")
+    ap.add_argument("--table", metavar="FILE", help="additive table, CSV or Parquet (default: built-in table)")
+    ap.add_argument("--out", required=True, help="results CSV (appended to; existing scenario ids are skipped)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--block-size", type=int, default=256)
+    add_log_arg(ap)
+    args = ap.parse_args(argv)
+    setup_logging(args.log_level)
+
+    scenarios = iter_grid(parse_grid(args.grid)) if args.grid else iter_csv(args.scenarios)
+    try:
+        table = read_table(args.table).to_dict("list") if args.table else None
+    except ValueError as e:
+        ap.error(str(e))
+    n = run_sweep(scenarios, args.out, table=table, workers=args.workers, block_size=args.block_size)
+    print(f"{n} scenarios solved -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
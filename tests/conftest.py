@@ -0,0 +1,7 @@
+# conftest.py
+# The modules sit flat next to app3.py; make them importable from tests/.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
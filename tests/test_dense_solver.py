@@ -0,0 +1,166 @@
+# test_dense_solver.py
+# Dense batched simplex against CBC, sensitivity duals against finite differences and against
+# HiGHS / CBC, and the incremental (warm-started) model against cold solves, on
+# benchmark.generate_problems output.
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from backends import available_backends, solve_problem
+from benchmark import generate_problems, generate_table
+from dense_solver import STATUS_INFEASIBLE, STATUS_NOT_SOLVED, STATUS_OPTIMAL, solve_many, solve_standard, stack_problems
+from incremental import IncrementalModel
+from lp_core import MODE_CAP, MODE_COST, solve_lp
+from sensitivity import solve_with_sensitivity
+
+LIMITS = ["additive_cap", "ucs_limit", "pi_max", "w_max"]
+
+
+def make_problems(n, batch, feasible=True, seed=0):
+    rng = np.random.default_rng(seed)
+    return generate_problems(generate_table(n, rng), batch, feasible, rng)
+
+
+def objective(p):
+    status, res = solve_with_sensitivity(p)
+    assert status == STATUS_OPTIMAL
+    return res["total_cost"]
+
+
+# =========================
+# DENSE VS CBC
+# =========================
+@pytest.mark.parametrize("n", [6, 20, 48])
+@pytest.mark.parametrize("mode", [MODE_COST, MODE_CAP])
+def test_dense_matches_cbc_feasible(n, mode):
+    problems = [p for p in make_problems(n, 40, seed=n) if p.mode == mode][:8]
+    assert problems
+    for p, (status, res) in zip(problems, solve_many(problems)):
+        cbc_status, cbc_res = solve_lp(p)
+        assert status == cbc_status == STATUS_OPTIMAL
+        assert res["total_cost"] == pytest.approx(cbc_res["total_cost"], rel=1e-6, abs=1e-6)
+        x = np.array(list(res["solution"].values()))
+        assert np.all(x >= p.lb - 1e-7) and np.all(x <= p.ub + 1e-7)
+        assert x.sum() <= p.additive_cap + 1e-7
+
+
+@pytest.mark.parametrize("n", [6, 20, 48])
+def test_dense_matches_cbc_infeasible(n):
+    problems = make_problems(n, 5, feasible=False, seed=n)
+    for p, (status, res) in zip(problems, solve_many(problems)):
+        assert status == solve_lp(p)[0] == STATUS_INFEASIBLE
+        assert res is None
+
+
+def test_cap_mode_infeasible_rows_match_cbc():
+    # Cap mode with a UCS ceiling below what LB already gives.
+    p = make_problems(12, 1, seed=3)[0]
+    p = replace(p, mode=MODE_CAP, ucs_limit=float(p.base[0] + p.coef[0] @ p.lb - 1.0))
+    assert solve_many([p])[0][0] == solve_lp(p)[0] == STATUS_INFEASIBLE
+
+
+def test_iteration_limit_is_not_solved():
+    # A phase 1 cut off by max_iter must not be mistaken for a proof of infeasibility.
+    for p in make_problems(12, 10, seed=1):
+        assert solve_lp(p)[0] == STATUS_OPTIMAL
+        for max_iter in (1, 2, 3):
+            status = solve_standard(stack_problems([p]), max_iter=max_iter).status[0]
+            assert status in (STATUS_OPTIMAL, STATUS_NOT_SOLVED)
+
+
+# =========================
+# SENSITIVITY
+# =========================
+@pytest.mark.parametrize("seed", range(6))
+def test_duals_match_finite_differences(seed):
+    p = make_problems(10, 1, seed=seed)[0]
+    status, res = solve_with_sensitivity(p)
+    assert status == STATUS_OPTIMAL
+    checked = 0
+    for name, row in zip(LIMITS, res["sensitivity"]["rows"]):
+        limit = row["limit"]
+        h = 1e-4 * max(1.0, abs(limit))
+        # Only where the basis (and so the dual) holds on both sides of the step.
+        if not (row["limit_lo"] < limit - h and limit + h < row["limit_hi"]):
+            continue
+        up = objective(replace(p, **{name: limit + h}))
+        down = objective(replace(p, **{name: limit - h}))
+        assert row["dual"] == pytest.approx((up - down) / (2 * h), rel=1e-4, abs=1e-6)
+        checked += 1
+    assert checked
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_reduced_costs_match_finite_differences(seed):
+    # Moving a material off its bound changes the cost by its reduced cost per unit.
+    p = make_problems(10, 1, seed=seed)[0]
+    _, res = solve_with_sensitivity(p)
+    base_cost = res["total_cost"]
+    checked = 0
+    for j, m in enumerate(res["sensitivity"]["materials"]):
+        h = 1e-4
+        if abs(m["x"] - p.lb[j]) < 1e-9 and p.ub[j] - p.lb[j] > h:
+            lb = p.lb.copy()
+            lb[j] += h
+            status, moved = solve_with_sensitivity(replace(p, lb=lb))
+            if status == STATUS_OPTIMAL:
+                assert (moved["total_cost"] - base_cost) / h == pytest.approx(m["reduced_cost"], rel=1e-4, abs=1e-6)
+                checked += 1
+    assert checked
+
+
+@pytest.mark.parametrize("backend", ["highs", "cbc"])
+@pytest.mark.parametrize("seed", range(4))
+def test_backend_duals_match_dense(backend, seed):
+    # HiGHS marginals and CBC pi/dj give the same duals and reduced costs as the dense basis.
+    if backend not in available_backends():
+        pytest.skip(f"{backend} not installed")
+    p = make_problems(10, 1, seed=seed)[0]
+    _, dense = solve_with_sensitivity(p)
+    status, res = solve_problem(p, backend, sensitivity=True)
+    assert status == STATUS_OPTIMAL
+    for key, col in [("rows", "dual"), ("materials", "reduced_cost")]:
+        got = [r[col] for r in res["sensitivity"][key]]
+        want = [r[col] for r in dense["sensitivity"][key]]
+        assert got == pytest.approx(want, rel=1e-5, abs=1e-4)
+
+
+# =========================
+# INCREMENTAL MODEL
+# =========================
+def edits(p):
+    # A rerun sequence touching every kind of change IncrementalModel patches.
+    rng = np.random.default_rng(7)
+    yield p
+    yield replace(p, ucs_limit=p.ucs_limit * 0.9)
+    yield replace(p, pi_max=p.pi_max + 1.0, w_max=p.w_max + 0.5)
+    cost = p.cost.copy()
+    cost[0] *= 0.5
+    yield replace(p, cost=cost)
+    coef = p.coef.copy()
+    coef[0, 1] += 2.0
+    yield replace(p, cost=cost, coef=coef)
+    lb, ub = p.lb.copy(), p.ub.copy()
+    lb[2] += 0.5
+    ub[3] += 1.0
+    yield replace(p, cost=cost, coef=coef, lb=lb, ub=ub)
+    yield replace(p, cost=cost, coef=coef, lb=lb, ub=ub, mode=MODE_CAP if p.mode == MODE_COST else MODE_COST)
+    yield replace(p, base=p.base + rng.uniform(-1, 1, 3))
+    yield replace(p, ucs_limit=p.ucs_limit + 1e6)  # infeasible in cost mode, loose in cap mode
+    yield p
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_matches_cold_solves(seed):
+    model = IncrementalModel()
+    for q in edits(make_problems(15, 1, seed=seed)[0]):
+        warm_status, warm = model.solve(q)
+        cold_status, cold = solve_with_sensitivity(q)
+        assert warm_status == cold_status == solve_lp(q)[0]
+        if cold_status != STATUS_OPTIMAL:
+            continue
+        assert warm["total_cost"] == pytest.approx(cold["total_cost"], rel=1e-7, abs=1e-7)
+        for a, b in zip(warm["sensitivity"]["rows"], cold["sensitivity"]["rows"]):
+            assert a["dual"] == pytest.approx(b["dual"], rel=1e-6, abs=1e-6)
@@ -0,0 +1,100 @@
+# test_portfolio.py
+# Dantzig-Wolfe decomposition against the joint LP (plan cost and inventory prices), infeasible
+# portfolios and the max_rounds exit.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalog import coerce_numeric
+from dense_solver import STATUS_NOT_SOLVED, STATUS_OPTIMAL
+from lp_core import DEFAULT_PARAMS, DEFAULT_TABLE, problem_from_df
+from portfolio import projects_from_df, solve_decomposed, solve_joint
+
+
+def make_portfolio(P, seed=0):
+    # Default table, projects with their own quantity and UCS target; also returns the stock the
+    # unconstrained plan uses, so tests can scale it below what the projects need.
+    rng = np.random.default_rng(seed)
+    base = problem_from_df(coerce_numeric(pd.DataFrame(DEFAULT_TABLE)), **DEFAULT_PARAMS)
+    df = pd.DataFrame({"quantity": rng.uniform(50, 500, P).round(), "ucs_limit": rng.uniform(150, 300, P).round()})
+    ids, qty, problems = projects_from_df(base, df)
+    free = solve_joint(ids, qty, problems, np.full(base.n, np.inf))
+    assert free["status"] == STATUS_OPTIMAL
+    used = np.array([r["used"] for r in free["inventory"]])
+    return ids, qty, problems, used
+
+
+def scarce(used, j, share):
+    stock = np.full(len(used), np.inf)
+    stock[j] = used[j] * share
+    return stock
+
+
+def prices(res):
+    return np.array([r["price"] for r in res["inventory"]])
+
+
+# =========================
+# DECOMPOSED VS JOINT
+# =========================
+@pytest.mark.parametrize("P", [10, 60])
+@pytest.mark.parametrize("j, share", [(2, 0.9), (3, 0.95), (3, 0.9)])
+def test_decomposed_matches_joint(P, j, share):
+    ids, qty, problems, used = make_portfolio(P, seed=P)
+    stock = scarce(used, j, share)
+    joint = solve_joint(ids, qty, problems, stock)
+    dw = solve_decomposed(ids, qty, problems, stock)
+    assert joint["status"] == dw["status"] == STATUS_OPTIMAL
+    assert dw["converged"]
+    assert dw["total_cost"] == pytest.approx(joint["total_cost"], rel=1e-6)
+    assert prices(dw) == pytest.approx(prices(joint), rel=1e-4, abs=1e-6)
+    assert all(r["used"] <= r["stock"] * (1 + 1e-6) for r in dw["inventory"])
+
+
+def test_unlimited_stock_needs_one_round():
+    ids, qty, problems, used = make_portfolio(20)
+    dw = solve_decomposed(ids, qty, problems, np.full(len(used), np.inf))
+    assert dw["status"] == STATUS_OPTIMAL and dw["converged"]
+    assert dw["rounds"] == 1
+    assert prices(dw) == pytest.approx(0.0)
+
+
+# =========================
+# INFEASIBLE PORTFOLIOS
+# =========================
+@pytest.mark.parametrize("P", [10, 200])
+@pytest.mark.parametrize("j", [0, 1, 4])
+def test_infeasible_portfolio_is_proven_quickly(P, j):
+    # Stock below what the projects need: phase 1 proves it in a few rounds, not max_rounds.
+    ids, qty, problems, used = make_portfolio(P)
+    stock = scarce(used, j, 0.5)
+    assert solve_joint(ids, qty, problems, stock)["status"] == "Infeasible"
+    dw = solve_decomposed(ids, qty, problems, stock, max_rounds=20)
+    assert dw["status"] == "Infeasible"
+    assert dw["converged"]
+    assert dw["rounds"] < 20
+
+
+# =========================
+# MAX_ROUNDS
+# =========================
+def test_max_rounds_returns_a_feasible_unconverged_plan():
+    ids, qty, problems, used = make_portfolio(30)
+    stock = scarce(used, 3, 0.9)
+    full = solve_decomposed(ids, qty, problems, stock)
+    assert full["converged"] and full["rounds"] > 2
+    seen = set()
+    for rounds in range(1, full["rounds"]):
+        dw = solve_decomposed(ids, qty, problems, stock, max_rounds=rounds)
+        assert not dw["converged"]
+        seen.add(dw["status"])
+        if dw["status"] == STATUS_OPTIMAL:
+            # Within the inventory, never cheaper than the optimum, and the gap says how far off.
+            assert all(r["used"] <= r["stock"] * (1 + 1e-6) for r in dw["inventory"])
+            assert dw["total_cost"] >= full["total_cost"] * (1 - 1e-9)
+            assert dw["gap"] > 0
+            assert len(dw["projects"]) == len(problems)
+        else:
+            assert dw["status"] == STATUS_NOT_SOLVED
+    assert STATUS_OPTIMAL in seen
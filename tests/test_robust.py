@@ -0,0 +1,31 @@
+# test_robust.py
+# Where the coefficient standard deviations come from: *_sd columns, lo/hi ranges, or rel·|coef|.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lp_core import DEFAULT_TABLE
+from robust import coef_sd, sd_from_range
+
+
+def test_range_is_the_sd_of_a_uniform():
+    draws = np.random.default_rng(0).uniform(2.0, 5.0, 1_000_000)
+    assert sd_from_range(2.0, 5.0) == pytest.approx(draws.std(), rel=1e-2)
+
+
+def test_sd_columns_then_ranges_then_relative():
+    df = pd.DataFrame(DEFAULT_TABLE)
+    df["UCS_lo"] = [None, 10.0, 20.0, 0.0, 1.0, 7.0]
+    df["UCS_hi"] = [None, 13.0, 20.0, 6.0, 4.0, None]
+    df["UCS_sd"] = [None, None, None, 5.0, None, None]
+    df["PI_sd"] = [0.1] * 6
+    sd = coef_sd(df, rel=0.1)
+    rel = 0.1 * np.abs(df[["UCS_coef", "PI_coef", "W_coef"]].to_numpy(dtype=float).T)
+
+    expect = rel[0].copy()
+    expect[[1, 2, 4]] = sd_from_range([10.0, 20.0, 1.0], [13.0, 20.0, 4.0])
+    expect[3] = 5.0  # *_sd wins over a range in the same row
+    assert sd[0] == pytest.approx(expect)
+    assert sd[1] == pytest.approx(0.1)
+    assert sd[2] == pytest.approx(rel[2])
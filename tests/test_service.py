@@ -0,0 +1,223 @@
+# test_service.py
+# The HTTP service on a free localhost port: results, coalescing, backpressure, timeouts,
+# /jobs polling and input validation.
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import service
+from backends import solve_problem
+from benchmark import generate_table
+from catalog import coerce_numeric
+from dense_solver import DENSE_MAX_N, STATUS_NOT_SOLVED, STATUS_OPTIMAL
+from lp_core import DEFAULT_PARAMS, DEFAULT_TABLE, MODE_CAP, apply_params, problem_from_df
+
+
+@pytest.fixture
+def serve():
+    # serve(**SolveService kwargs) -> (service, base url); everything is shut down afterwards.
+    started = []
+
+    def start(**kwargs):
+        svc = service.SolveService(**kwargs)
+        server = service.make_server(svc, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        started.append((svc, server))
+        return svc, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for svc, server in started:
+        server.shutdown()
+        server.server_close()
+        svc.close()
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    # Holds every single-problem solve until gate.set(); counts the solves that ran.
+    event = threading.Event()
+    event.calls = 0
+
+    def gated(p, backend="auto", options=None):
+        event.calls += 1
+        event.wait(10)
+        return solve_problem(p, backend, options)
+
+    monkeypatch.setattr(service, "solve_problem", gated)
+    yield event
+    event.set()
+
+
+def request(url, body=None, method=None):
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    req = urllib.request.Request(url, data=data, method=method or ("GET" if data is None else "POST"))
+    try:
+        with urllib.request.urlopen(req, timeout=30) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def direct(params):
+    base = problem_from_df(coerce_numeric(pd.DataFrame(DEFAULT_TABLE)), **DEFAULT_PARAMS)
+    return solve_problem(apply_params(base, params))
+
+
+# =========================
+# RESULTS
+# =========================
+def test_solve_matches_direct_solve(serve):
+    _, url = serve(workers=2)
+    for params in [{}, {"ucs_limit": 300}, {"mode": MODE_CAP, "ucs_limit": 300}, {"ucs_limit": 1e6}]:
+        code, body = request(url + "/solve", {"params": params})
+        status, res = direct(params)
+        assert code == 200
+        assert body["status"] == status
+        if status == STATUS_OPTIMAL:
+            assert body["result"]["total_cost"] == pytest.approx(res["total_cost"])
+            assert body["result"]["solution"] == pytest.approx(res["solution"])
+
+
+def test_batch_matches_direct_solves(serve):
+    _, url = serve(workers=2)
+    params = [{"ucs_limit": 200 + 5 * i} for i in range(40)]
+    code, body = request(url + "/solve/batch", {"params": params})
+    assert code == 200
+    for p, out in zip(params, body["results"]):
+        status, res = direct(p)
+        assert out["status"] == status
+        assert out["result"]["total_cost"] == pytest.approx(res["total_cost"])
+
+
+def test_identical_requests_share_one_solve(serve, gate):
+    svc, url = serve(workers=2)
+    body = {"params": {"ucs_limit": 280}, "backend": "cbc"}
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(request(url + "/solve", body))) for _ in range(50)]
+    for t in threads:
+        t.start()
+    while svc.stats()["requests"] < 50:
+        threading.Event().wait(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert gate.calls == 1
+    assert svc.stats()["coalesced"] == 49
+    assert {code for code, _ in results} == {200}
+    assert len({json.dumps(b, sort_keys=True) for _, b in results}) == 1
+
+
+# =========================
+# BACKPRESSURE / TIMEOUTS
+# =========================
+def test_full_queue_is_503(serve, gate):
+    svc, url = serve(workers=1, queue_max=2)
+    # One job occupies the worker, two fill the queue; the next one is refused.
+    for limit in (200, 210, 220):
+        assert request(url + "/jobs", {"params": {"ucs_limit": limit}, "backend": "cbc"})[0] == 202
+        while limit == 200 and svc.stats()["queued"]:
+            threading.Event().wait(0.01)
+    code, body = request(url + "/solve", {"params": {"ucs_limit": 230}, "backend": "cbc"})
+    assert code == 503
+    assert "queue full" in body["error"]
+    assert svc.stats()["rejected"] == 1
+
+
+def test_slow_solve_is_504(serve, gate):
+    _, url = serve(workers=1)
+    code, body = request(url + "/solve", {"params": {"ucs_limit": 240}, "backend": "cbc", "timeout": 0.2})
+    assert code == 504
+    assert body["error"] == "timeout"
+
+
+# =========================
+# JOBS
+# =========================
+def wait_job(url, key):
+    while True:
+        code, body = request(f"{url}/jobs/{key}")
+        if code != 202:
+            return code, body
+        threading.Event().wait(0.01)
+
+
+def test_job_result_is_pollable(serve):
+    _, url = serve(workers=1)
+    code, body = request(url + "/jobs", {"params": {"ucs_limit": 260}})
+    assert code == 202
+    code, body = wait_job(url, body["key"])
+    assert code == 200
+    assert body["status"] == STATUS_OPTIMAL
+
+
+def test_not_solved_and_failed_jobs_stay_pollable(serve, monkeypatch):
+    _, url = serve(workers=1)
+    monkeypatch.setattr(service, "solve_problem", lambda p, backend="auto", options=None: (STATUS_NOT_SOLVED, None))
+    _, body = request(url + "/jobs", {"params": {"ucs_limit": 261}, "backend": "cbc"})
+    assert wait_job(url, body["key"]) == (200, {"key": body["key"], "status": STATUS_NOT_SOLVED, "result": None})
+
+    def boom(p, backend="auto", options=None):
+        raise RuntimeError("solver crashed")
+
+    monkeypatch.setattr(service, "solve_problem", boom)
+    _, body = request(url + "/jobs", {"params": {"ucs_limit": 262}, "backend": "cbc"})
+    code, out = wait_job(url, body["key"])
+    assert code == 200
+    assert "solver crashed" in out["error"]
+
+
+def test_unknown_job_is_404(serve):
+    _, url = serve(workers=1)
+    assert request(f"{url}/jobs/{'0' * 64}")[0] == 404
+
+
+# =========================
+# VALIDATION
+# =========================
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/solve", {"params": [1]}),
+        ("/solve", {"params": {"ucs_limit": "high"}}),
+        ("/solve", {"params": {"nope": 1}}),
+        ("/solve", {"params": {"mode": "fast"}}),
+        ("/solve", {"params": {}, "backend": "nope"}),
+        ("/solve/batch", {"params": [{"ucs_limit": 1}, 2]}),
+        ("/solve/batch", {"params": {"ucs_limit": 1}}),
+        ("/solve", {"table": {"material": ["a"], "cost": [1], "LB": [0], "UB": ["x"]}}),
+    ],
+)
+def test_bad_input_is_400(serve, path, body):
+    _, url = serve(workers=1)
+    assert request(url + path, body)[0] == 400
+
+
+def test_dense_on_a_large_catalog_is_400(serve):
+    svc, url = serve(workers=1)
+    table = generate_table(DENSE_MAX_N + 1, np.random.default_rng(0)).to_dict("list")
+    assert request(url + "/solve", {"table": table, "backend": "dense"})[0] == 400
+    assert request(url + "/jobs", {"table": table, "backend": "dense"})[0] == 400
+    assert svc.stats()["solved"] == 0
+    assert request(url + "/solve", {"table": table})[0] == 200
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b'{"params": {"ucs_limit": 1e400}}',
+        json.dumps({"table": {**DEFAULT_TABLE, "UB": ["INF"] + list(DEFAULT_TABLE["UB"][1:])}}).replace('"INF"', "1e400").encode(),
+    ],
+)
+def test_non_finite_numbers_are_400(serve, raw):
+    svc, url = serve(workers=1)
+    req = urllib.request.Request(url + "/solve", data=raw, method="POST")
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(req, timeout=30)
+    assert e.value.code == 400
+    assert svc.stats()["requests"] == 0